@@ -0,0 +1,111 @@
+# Compares the copy-on-write non-mutating API against the deepcopy-based one it replaced, and against in-place mutation.
+# The old numbers come from running the same workloads on the source tree from before structural sharing, taken from git.
+#
+#   python benchmarks/bench_copy.py            compare with the revision before Chord._clone was added
+#   python benchmarks/bench_copy.py REV        compare with another revision
+import argparse
+import io
+import json
+import os
+import subprocess
+import sys
+import tarfile
+import tempfile
+from copy import copy
+from common import measure, compare
+
+NUMBER = 2000
+REPEAT = 5
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir)
+
+# Workloads that both trees support: name and a call of the non-mutating API
+def workloads() -> list:
+    from pygression import Note, Letter, Roman, RomanChord, Progression, Chord
+    from pygression.quality import seventh
+    from pygression.modifier import alter
+
+    chord = Chord(Note(Letter.E), seventh.Dominant())
+    rchord = RomanChord(Roman(5), seventh.Dominant())
+    prog = Progression([2, 5, 1, 6, 4, 5, 1, 3])
+    other = Progression([2, 5, 1])
+    flat9 = alter.Flat9()
+
+    return [
+        ("Chord.with_mod", lambda: chord.with_mod(flat9)),
+        ("Chord.__rshift__", lambda: chord >> 1),
+        ("RomanChord.with_mod", lambda: rchord.with_mod(flat9)),
+        ("RomanChord.__rshift__", lambda: rchord >> 1),
+        ("Progression.__add__", lambda: prog + other),
+    ]
+
+# In-place counterparts, each call on its own copy so that no call sees another's changes. Copies are made up front,
+# one for every call "measure" makes; taking the next one costs a few tens of nanoseconds.
+def in_place_workloads() -> dict:
+    from pygression import Note, Letter, Roman, RomanChord, Chord
+    from pygression.quality import seventh
+    from pygression.modifier import alter
+
+    chord = Chord(Note(Letter.E), seventh.Dominant())
+    rchord = RomanChord(Roman(5), seventh.Dominant())
+    flat9 = alter.Flat9()
+
+    def fresh(obj):
+        return iter([copy(obj) for _ in range(NUMBER * (REPEAT + 1))]).__next__
+
+    def workload(obj, mutate):
+        copies = fresh(obj)
+        return lambda: mutate(copies())
+
+    return {
+        "Chord.with_mod": lambda: workload(chord, lambda c: c.attach(flat9)),
+        "Chord.__rshift__": lambda: workload(chord, lambda c: c.__irshift__(1)),
+        "RomanChord.with_mod": lambda: workload(rchord, lambda c: c.attach(flat9)),
+        "RomanChord.__rshift__": lambda: workload(rchord, lambda c: c.__irshift__(1)),
+    }
+
+def git(*args) -> bytes:
+    return subprocess.run(["git", *args], capture_output=True, check=True, cwd=ROOT).stdout
+
+# The revision before structural sharing: the parent of the commit that added Chord._clone
+def default_revision() -> str:
+    commits = git("log", "--format=%H", "-S", "def _clone", "--", "pygression/chord.py").split()
+    if not commits:
+        sys.exit("no commit adds Chord._clone; pass the revision to compare with")
+
+    return commits[-1].decode() + "^"
+
+# Measure the workloads on the package of another revision, in a fresh interpreter
+def measure_revision(revision: str) -> dict:
+    with tempfile.TemporaryDirectory() as tree:
+        with tarfile.open(fileobj=io.BytesIO(git("archive", "--format=tar", revision, "pygression"))) as archive:
+            archive.extractall(tree)
+
+        output = subprocess.run([sys.executable, os.path.abspath(__file__), "--tree", tree], capture_output=True, text=True, check=True).stdout
+
+    return json.loads(output)
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare the non-mutating API with the deepcopy-based one it replaced.")
+    parser.add_argument("revision", nargs="?", help="git revision to compare with")
+    parser.add_argument("--tree", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    # Run in the subprocess: measure the package under "tree" and print the results
+    if args.tree:
+        sys.path.insert(0, args.tree)
+        print(json.dumps({name: measure(func, number=NUMBER, repeat=REPEAT) for name, func in workloads()}))
+        return
+
+    revision = args.revision or default_revision()
+    old = measure_revision(revision)
+    print(f"old: {git('rev-parse', '--short', revision).decode().strip()}")
+
+    in_place = in_place_workloads()
+    for name, func in workloads():
+        compare(name, old[name], measure(func, number=NUMBER, repeat=REPEAT))
+        if name in in_place:
+            print(f"  in-place: {measure(in_place[name](), number=NUMBER, repeat=REPEAT)['seconds'] * 1e9:10.1f} ns")
+
+if __name__ == "__main__":
+    main()
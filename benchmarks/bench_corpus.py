@@ -0,0 +1,64 @@
+# Compares loading a corpus file with unpickling the same progressions
+import os
+import pickle
+import random
+import sys
+import tempfile
+import timeit
+from common import measure
+from pygression import Progression, Mode
+from pygression.corpus import write_corpus, Corpus
+
+COUNT = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+
+def corpus(count: int):
+    rng = random.Random(0)
+    modes = (Mode.ION, Mode.AEO, Mode.DOR, Mode.MIX)
+
+    for _ in range(count):
+        degrees = [rng.randint(1, 7) for _ in range(rng.randint(2, 8))]
+        yield Progression(degrees, mode=rng.choice(modes), sevenths=rng.random() < 0.5)
+
+def timed(func) -> float:
+    return min(timeit.repeat(func, number=1, repeat=3))
+
+def main():
+    progressions = list(corpus(COUNT))
+
+    with tempfile.TemporaryDirectory() as directory:
+        corpus_path = os.path.join(directory, "corpus.pgc")
+        pickle_path = os.path.join(directory, "corpus.pickle")
+
+        write_seconds = timed(lambda: write_corpus(corpus_path, progressions))
+        with open(pickle_path, "wb") as file:
+            pickle_seconds = timed(lambda: pickle.dump(progressions, file, protocol=pickle.HIGHEST_PROTOCOL) or file.seek(0))
+
+        print(f"{COUNT} progressions")
+        print(f"  size:  corpus {os.path.getsize(corpus_path):12d} B   pickle {os.path.getsize(pickle_path):12d} B")
+        print(f"  write: corpus {write_seconds:12.3f} s   pickle {pickle_seconds:12.3f} s")
+
+        def load_pickle():
+            with open(pickle_path, "rb") as file:
+                return pickle.load(file)
+
+        def load_corpus():
+            Corpus(corpus_path).close()
+
+        print(f"  open:  corpus {timed(load_corpus) * 1e6:12.1f} us  pickle {timed(load_pickle):12.3f} s")
+
+        def batch():
+            with Corpus(corpus_path) as opened:
+                opened.to_batch().lengths.sum()
+
+        print(f"  open as ProgressionBatch: {timed(batch) * 1e3:.1f} ms")
+
+        with Corpus(corpus_path) as opened:
+            indices = [random.randrange(COUNT) for _ in range(1000)]
+            random_access = measure(lambda: [opened[index] for index in indices], number=10, repeat=3)
+            print(f"  random access: {random_access['seconds'] / len(indices) * 1e6:.2f} us per progression")
+
+            full = timed(lambda: sum(1 for _ in opened))
+            print(f"  decode every progression: {full:.3f} s")
+
+if __name__ == "__main__":
+    main()
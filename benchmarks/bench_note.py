@@ -0,0 +1,52 @@
+# Compares the interned Note against the previous dict-backed implementation
+from common import measure, compare
+from pygression import Note, Letter, Accidental
+from pygression.consts import AS_NOTATION
+
+# The Note class as it was before interning, kept here as the baseline
+class LegacyNote:
+    def __init__(self, letter, accidental=Accidental.NATURAL):
+        self._letter = letter
+        self._accidental = accidental
+
+    def __int__(self):
+        return (self._letter.value + self._accidental.value) % 12
+
+    def __str__(self):
+        return AS_NOTATION[self._letter] + AS_NOTATION[self._accidental]
+
+    def __add__(self, semitones):
+        return LegacyNote(self._letter, Accidental(self._accidental.value + semitones))
+
+    def __rshift__(self, shift):
+        letters = list(Letter)
+        return LegacyNote(letters[(letters.index(self._letter) + shift) % 7], self._accidental)
+
+    @staticmethod
+    def note_relative_to(letter, root, semitones):
+        accidental = (semitones - (letter.value - int(root) + root._accidental.value) % 12)
+        if accidental > 2:
+            accidental -= 12
+
+        return LegacyNote(letter, Accidental(accidental + root._accidental.value))
+
+def workloads(cls):
+    note = cls(Letter.E, Accidental.FLAT)
+
+    return {
+        "construct": lambda: cls(Letter.E, Accidental.FLAT),
+        "add": lambda: note + 1,
+        "rshift": lambda: note >> 2,
+        "int": lambda: int(note),
+        "str": lambda: str(note),
+        "note_relative_to": lambda: cls.note_relative_to(Letter.B, note, 7),
+    }
+
+def main():
+    old, new = workloads(LegacyNote), workloads(Note)
+
+    for name in old:
+        compare(f"Note.{name}", measure(old[name], number=20000), measure(new[name], number=20000))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+# Measures how rendering a corpus in 12 keys scales with the number of worker processes
+import os
+import pickle
+import random
+import sys
+import tempfile
+import time
+from common import measure
+from pygression import Progression, Mode
+from pygression.corpus import write_corpus
+from pygression.pipeline import imap, pack_chunk, Render
+
+COUNT = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+MAX_WORKERS = int(sys.argv[2]) if len(sys.argv) > 2 else os.cpu_count() or 1
+
+def corpus(count: int):
+    rng = random.Random(0)
+    modes = (Mode.ION, Mode.AEO, Mode.DOR, Mode.MIX)
+
+    for _ in range(count):
+        degrees = [rng.randint(1, 7) for _ in range(rng.randint(2, 8))]
+        yield Progression(degrees, mode=rng.choice(modes), sevenths=rng.random() < 0.5)
+
+def worker_counts(most: int) -> list:
+    counts = [1]
+    while counts[-1] * 2 <= most:
+        counts.append(counts[-1] * 2)
+
+    if counts[-1] != most:
+        counts.append(most)
+
+    return counts
+
+def main():
+    render = Render()
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "corpus.pgc")
+        write_corpus(path, corpus(COUNT))
+
+        print(f"{COUNT} progressions in {len(render.keys)} keys, {os.cpu_count()} CPUs")
+
+        baseline = None
+        for workers in worker_counts(MAX_WORKERS):
+            start = time.perf_counter()
+            for _ in imap(render, path, chunk_size=2048, workers=workers):
+                pass
+            seconds = time.perf_counter() - start
+
+            baseline = baseline or seconds
+            print(f"  {workers:3d} workers: {seconds:8.2f} s  {COUNT / seconds:10.0f} progressions/s  speedup {baseline / seconds:5.1f}x  efficiency {baseline / seconds / workers:4.0%}")
+
+        # Chunks of progressions that aren't in a corpus file travel as corpus records rather than pickles
+        sample = list(corpus(2048))
+        print(f"  chunk of {len(sample)}: packed {len(pack_chunk(sample))} B, pickled {len(pickle.dumps(sample, protocol=pickle.HIGHEST_PROTOCOL))} B")
+        print(f"    pack {measure(lambda: pack_chunk(sample), number=10, repeat=3)['seconds'] * 1e3:.2f} ms, pickle {measure(lambda: pickle.dumps(sample, protocol=pickle.HIGHEST_PROTOCOL), number=10, repeat=3)['seconds'] * 1e3:.2f} ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+# Compares table-driven chord core spelling against the previous arithmetic spelling
+from common import measure, compare
+from pygression import Note, Letter, Accidental
+from pygression.quality import triad, seventh, extended
+
+QUALITIES = [
+    triad.Major(), triad.Minor(), triad.Augmented(), triad.Diminished(),
+    seventh.Major(), seventh.Minor(), seventh.Dominant(), seventh.HalfDiminished(),
+    seventh.Diminished(), seventh.MinorMajor(), seventh.Augmented(),
+    extended.Ninth(), extended.Eleventh(), extended.Thirteenth(),
+]
+
+# The spelling path as it was before the lookup tables, kept here as the baseline
+def legacy_build_core(quality, root):
+    notes = []
+    integers = quality._get_integers()
+
+    for i in range(len(integers)):
+        letters = list(Letter)
+        letter = letters[(letters.index(root.letter) + i * 2) % 7]
+
+        accidental = (integers[i] - (letter.value - int(root) + root.accidental.value) % 12)
+        if accidental > 2:
+            accidental -= 12
+
+        notes.append(Note(letter, Accidental(accidental + root.accidental.value)))
+
+    return notes
+
+def spellable(quality, root):
+    try:
+        legacy_build_core(quality, root)
+    except ValueError:
+        return False
+
+    return True
+
+def main():
+    roots = [Note(letter, accidental) for letter in Letter for accidental in (Accidental.FLAT, Accidental.NATURAL, Accidental.SHARP)]
+
+    for quality in QUALITIES:
+        pairs = [root for root in roots if spellable(quality, root)]
+        old = measure(lambda: [legacy_build_core(quality, root) for root in pairs], number=200)
+        new = measure(lambda: [quality._build_core(root) for root in pairs], number=200)
+
+        compare(f"{type(quality).__module__.rsplit('.', 1)[-1]}.{type(quality).__name__} over {len(pairs)} roots", old, new)
+
+if __name__ == "__main__":
+    main()
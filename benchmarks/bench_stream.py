@@ -0,0 +1,36 @@
+# Shows that streaming a progression's chords keeps memory flat as the progression grows
+import tracemalloc
+import timeit
+from common import measure
+from pygression import Note, Letter, Progression
+
+def peak(func) -> int:
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+def consume(iterator):
+    for _ in iterator:
+        pass
+
+def main():
+    key = Note(Letter.E)
+
+    for length in (1000, 10000, 100000):
+        prog = Progression([2, 5, 1, 6] * (length // 4))
+
+        listed = peak(lambda: prog.chords_in(key))
+        streamed = peak(lambda: consume(prog.iter_chords_in(key)))
+        seconds = min(timeit.repeat(lambda: consume(prog.iter_chords_in(key)), number=1, repeat=3))
+
+        print(f"{length:7d} chords  list peak: {listed:11d} B  stream peak: {streamed:7d} B  stream time: {seconds * 1e3:8.1f} ms")
+
+    prog = Progression([2, 5, 1, 6] * 25)
+    first = measure(lambda: next(prog.iter_chords_in(key)), number=2000)
+    print(f"first chord of 100: {first['seconds'] * 1e9:.1f} ns")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+# Shared timing and allocation helpers for the benchmark scripts
+import os
+import sys
+import timeit
+import tracemalloc
+
+# Allow running the scripts from a source checkout without installing the package
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+def measure(func, number: int=1000, repeat: int=5) -> dict:
+    """
+    Time a callable and record its allocations.
+
+    Args:
+        func: Zero-argument callable to measure.
+        number (int): Calls per timing run.
+        repeat (int): Timing runs; the fastest one is reported, along with the median.
+
+    Returns:
+        dict: Seconds per call (fastest and median run), and peak and retained bytes allocated over "number" calls.
+    """
+
+    runs = sorted(timeit.repeat(func, number=number, repeat=repeat))
+    seconds = runs[0] / number
+    median = runs[len(runs) // 2] / number
+
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        results = [func() for _ in range(number)]
+        retained, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del results
+
+    return {"seconds": seconds, "median_seconds": median, "peak_bytes": peak - before, "retained_bytes": retained - before}
+
+def compare(title: str, old: dict, new: dict):
+    """
+    Print an old/new comparison of two measurements.
+
+    Args:
+        title (str): Name of the workload.
+        old (dict): Measurement of the previous implementation.
+        new (dict): Measurement of the current implementation.
+    """
+
+    print(title)
+    print(f"  time:     {old['seconds'] * 1e9:10.1f} ns -> {new['seconds'] * 1e9:10.1f} ns  ({old['seconds'] / new['seconds']:.1f}x)")
+    print(f"  retained: {old['retained_bytes']:10d} B  -> {new['retained_bytes']:10d} B")
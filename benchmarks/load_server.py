@@ -0,0 +1,121 @@
+# Load test of the rendering server on localhost: latency percentiles and throughput at a fixed concurrency.
+# Arguments after "--" are passed to the server, e.g. "-- --max-batch 1" to compare against no batching.
+import argparse
+import asyncio
+import json
+import os
+import random
+import signal
+import subprocess
+import sys
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir)
+
+KEYS = ("C", "G", "D", "A", "E", "B", "F#", "F", "Bb", "Eb", "Ab", "Db")
+PROGRESSIONS = ("I IV V I", "ii7 V7 IM7", "I vi ii V7", "vi IV I V", "iiø6/5 V7 i", "I V/V V7 I", "IM7 IV7 iii7 vi7 ii7 V7 I")
+SYMBOLS = ("Cm7", "G7b9", "F#m7b5", "BbM7", "Eadd9", "D7sus4", "Abo7", "C13#11", "A+", "Ebm/Gb")
+
+def requests(count: int, distinct: int, seed: int=0) -> list:
+    rng = random.Random(seed)
+
+    pool = []
+    for _ in range(distinct):
+        if rng.random() < 0.7:
+            pool.append(("/render", json.dumps({"progression": rng.choice(PROGRESSIONS), "key": rng.choice(KEYS)}).encode()))
+        else:
+            pool.append(("/chord", json.dumps({"symbol": rng.choice(SYMBOLS)}).encode()))
+
+    return [rng.choice(pool) for _ in range(count)]
+
+async def client(host: str, port: int, work: list, latencies: list, errors: list):
+    reader, writer = await asyncio.open_connection(host, port)
+
+    try:
+        for path, body in work:
+            start = time.perf_counter()
+            writer.write(f"POST {path} HTTP/1.1\r\nHost: {host}\r\nContent-Type: application/json\r\nContent-Length: {len(body)}\r\n\r\n".encode() + body)
+            await writer.drain()
+
+            head = await reader.readuntil(b"\r\n\r\n")
+            length = 0
+            for line in head.decode("latin-1").split("\r\n"):
+                name, _, value = line.partition(":")
+                if name.lower() == "content-length":
+                    length = int(value)
+            await reader.readexactly(length)
+
+            latencies.append(time.perf_counter() - start)
+            if not head.startswith(b"HTTP/1.1 200"):
+                errors.append(head.split(b"\r\n", 1)[0])
+    finally:
+        writer.close()
+
+def percentile(values: list, fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+async def run(host: str, port: int, total: int, concurrency: int, distinct: int) -> dict:
+    work = requests(total, distinct)
+    latencies = []
+    errors = []
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client(host, port, work[i::concurrency], latencies, errors) for i in range(concurrency)))
+    seconds = time.perf_counter() - start
+
+    return {
+        "requests": len(latencies),
+        "errors": len(errors),
+        "seconds": seconds,
+        "throughput": len(latencies) / seconds,
+        "p50_ms": percentile(latencies, 0.50) * 1e3,
+        "p99_ms": percentile(latencies, 0.99) * 1e3,
+    }
+
+def main():
+    argv = sys.argv[1:]
+    server_args = []
+    if "--" in argv:
+        split = argv.index("--")
+        argv, server_args = argv[:split], argv[split + 1:]
+
+    parser = argparse.ArgumentParser(description="Load test the rendering server on localhost.")
+    parser.add_argument("--requests", type=int, default=20000)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--distinct", type=int, default=500, help="distinct request bodies; fewer means more cache hits")
+    parser.add_argument("--json", action="store_true", help="print the results as JSON")
+    args = parser.parse_args(argv)
+
+    server = subprocess.Popen(
+        [sys.executable, "-m", "pygression.server", "--port", "0", *server_args],
+        cwd=ROOT, stdout=subprocess.PIPE, text=True,
+    )
+
+    try:
+        line = server.stdout.readline()
+        if not line.startswith("listening on "):
+            raise RuntimeError(f"server didn't start: {line!r}")
+
+        host, port = line.split()[-1].rsplit(":", 1)
+        results = asyncio.run(run(host, int(port), args.requests, args.concurrency, args.distinct))
+    finally:
+        # SIGINT lets the server shut its worker processes down; killing it would leave them running
+        server.send_signal(signal.SIGINT)
+        try:
+            server.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            server.kill()
+            server.wait()
+
+    if args.json:
+        print(json.dumps(results))
+        return
+
+    print(f"{results['requests']} requests, {args.concurrency} connections, {args.distinct} distinct, server args {server_args or 'default'}")
+    print(f"  throughput: {results['throughput']:10.0f} requests/s")
+    print(f"  latency:    p50 {results['p50_ms']:.2f} ms   p99 {results['p99_ms']:.2f} ms")
+    print(f"  errors:     {results['errors']}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,212 @@
+# Benchmark suite over the hot paths of Note, Chord, RomanChord and Progression. Records timings and tracemalloc
+# measurements as JSON and compares them with a stored baseline, exiting with status 1 if anything regressed.
+#
+#   python benchmarks/run.py --save-baseline      record benchmarks/baseline.json on this machine
+#   python benchmarks/run.py                      compare against it
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from common import measure
+from pygression import Note, Letter, Accidental, Chord, RomanChord, Progression
+from pygression.cache import chord_cache
+from pygression.quality.base import _QUALITIES
+from pygression.modifier.base import _MODIFIERS
+
+BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+
+ROOTS = [Note(letter, accidental) for letter in Letter for accidental in (Accidental.FLAT, Accidental.NATURAL, Accidental.SHARP)]
+KEYS = [Note(letter, accidental) for letter, accidental in (
+    (Letter.C, Accidental.NATURAL), (Letter.D, Accidental.FLAT), (Letter.D, Accidental.NATURAL), (Letter.E, Accidental.FLAT),
+    (Letter.E, Accidental.NATURAL), (Letter.F, Accidental.NATURAL), (Letter.F, Accidental.SHARP), (Letter.G, Accidental.NATURAL),
+    (Letter.A, Accidental.FLAT), (Letter.A, Accidental.NATURAL), (Letter.B, Accidental.FLAT), (Letter.B, Accidental.NATURAL),
+)]
+
+ROMAN = "I ii7 V7/V V7 IM7 vi6 IV6/4 iiø6/5 V7b9 i bVIIM7 bVI V7/IV IV ii6/5 V4/2 I6 viio7 iii7 V7#5 Iadd9 IVsus4 bIII+ V13"
+
+def spellable(make):
+    try:
+        make()
+    except ValueError:
+        return False
+
+    return True
+
+# Every quality on every root, alone and with every compatible modifier
+def modified_chords() -> list:
+    chords = []
+    for root in ROOTS:
+        for quality in _QUALITIES:
+            for modifier in [None, *_MODIFIERS]:
+                if modifier is not None and not modifier._compatible_with_quality(quality):
+                    continue
+
+                if spellable(lambda: Chord(root, quality) if modifier is None else Chord(root, quality).attach(modifier)):
+                    chord = Chord(root, quality)
+                    chords.append(chord if modifier is None else chord.attach(modifier))
+
+    return chords
+
+def workloads() -> dict:
+    chords = modified_chords()
+    pairs = [(root, quality) for root in ROOTS for quality in _QUALITIES if spellable(lambda: Chord(root, quality))]
+    bases = [(Chord(root, quality), modifier) for root in ROOTS for quality in _QUALITIES for modifier in _MODIFIERS
+             if modifier._compatible_with_quality(quality) and spellable(lambda: Chord(root, quality).attach(modifier))]
+
+    triads = [chord for chord in chords if len(chord._notes) <= 4 and not chord._modifiers]
+    slashes = []
+    for chord in triads:
+        for bass in (chord._notes[1], chord._notes[-1], chord._root._transpositions[5]):
+            if bass is not None and spellable(lambda: chord / bass):
+                slashes.append((chord, bass))
+
+    romans = [RomanChord.parse(token) for token in ROMAN.split()]
+    long = Progression.parse(" ".join([ROMAN] * 10))
+    short = Progression.parse(ROMAN)
+    keys = [key for key in KEYS if spellable(lambda: short.chords_in(key))]
+
+    def cold():
+        chord_cache.configure(enabled=False)
+        try:
+            for chord in chords:
+                chord._calculate_notes()
+        finally:
+            chord_cache.configure(enabled=True)
+
+    # Every spelling fits in the cache, so after the first call this is all hits; the hit rate is reported to check that
+    def warm():
+        for chord in chords:
+            chord._calculate_notes()
+
+    # Name, workload, calls per timing run and the size of one call, for reading the numbers
+    return {
+        "note.transpose": (lambda: [root + semitones for root in ROOTS for semitones in (-1, 1)], 2000, f"{len(ROOTS) * 2} transpositions"),
+        "chord.init": (lambda: [Chord(root, quality) for root, quality in pairs], 200, f"{len(pairs)} chords"),
+        "chord.calculate_notes.cold": (cold, 5, f"{len(chords)} chords, all qualities x all modifiers, cache off"),
+        "chord.calculate_notes.warm": (warm, 20, f"{len(chords)} chords, cache on"),
+        "chord.attach": (lambda: [chord._clone().attach(modifier) for chord, modifier in bases], 10, f"{len(bases)} attachments"),
+        "chord.truediv": (lambda: [chord / bass for chord, bass in slashes], 20, f"{len(slashes)} slash chords"),
+        "romanchord.str": (lambda: [str(chord) for chord in romans], 2000, f"{len(romans)} Roman chords"),
+        "progression.chords_in.long": (lambda: long.chords_in(KEYS[0]), 200, f"{len(long._chords)} chords in one key"),
+        "progression.chords_in.keys": (lambda: [short.chords_in(key) for key in keys], 200, f"{len(short._chords)} chords in {len(keys)} keys"),
+    }
+
+def run(selected: str=None, quick: bool=False) -> dict:
+    results = {}
+    for name, (workload, number, size) in workloads().items():
+        if selected and selected not in name:
+            continue
+
+        number = max(1, number // 4) if quick else number
+        measured = measure(workload, number=number, repeat=5 if quick else 9)
+
+        # Spelling cache hits and misses of one more call, after the measured ones have warmed it
+        before = chord_cache.info()
+        workload()
+        after = chord_cache.info()
+        lookups = after.hits + after.misses - before.hits - before.misses
+        hit_rate = (after.hits - before.hits) / lookups if lookups else None
+
+        results[name] = {"size": size, "number": number, **measured, "cache_hit_rate": hit_rate}
+
+        hits = "-" if hit_rate is None else f"{hit_rate:.1%}"
+        print(f"  {name:30s} {measured['seconds'] * 1e6:12.1f} us  peak {measured['peak_bytes']:10d} B  retained {measured['retained_bytes']:10d} B  cache hits {hits:>6s}", file=sys.stderr)
+
+    return results
+
+def metadata() -> dict:
+    try:
+        commit = subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True, cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip() or None
+    except OSError:
+        commit = None
+
+    return {
+        "time": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "machine": platform.machine(),
+        "platform": platform.platform(),
+        "commit": commit,
+    }
+
+def compare(baseline: dict, results: dict, threshold: float, memory_threshold: float) -> list:
+    """
+    Compare results with a baseline.
+
+    Args:
+        baseline (dict): Results of a previous run.
+        results (dict): Results of this run.
+        threshold (float): Largest allowed slowdown, as a fraction (0.1 is 10% slower), on top of the run-to-run noise of the
+            workload: how far its median run was from its fastest, in the noisier of the two runs.
+        memory_threshold (float): Largest allowed growth of peak memory, as a fraction.
+
+    Returns:
+        list: Names of the workloads that regressed.
+    """
+
+    regressions = []
+    print(f"{'workload':30s} {'baseline':>12s} {'current':>12s} {'ratio':>7s} {'noise':>6s} {'peak ratio':>11s}  status")
+
+    for name, result in results.items():
+        old = baseline.get(name)
+        if old is None:
+            print(f"{name:30s} {'-':>12s} {result['seconds'] * 1e6:10.1f}us {'-':>7s} {'-':>6s} {'-':>11s}  new")
+            continue
+
+        ratio = result["seconds"] / old["seconds"]
+        peak = result["peak_bytes"] / old["peak_bytes"] if old["peak_bytes"] > 0 else 1.0
+        noise = max(run.get("median_seconds", run["seconds"]) / run["seconds"] - 1 for run in (old, result))
+
+        status = []
+        if ratio > 1 + threshold + noise:
+            status.append("SLOWER")
+        if peak > 1 + memory_threshold:
+            status.append("MORE MEMORY")
+        if status:
+            regressions.append(name)
+
+        print(f"{name:30s} {old['seconds'] * 1e6:10.1f}us {result['seconds'] * 1e6:10.1f}us {ratio:6.2f}x {noise:6.1%} {peak:10.2f}x  {', '.join(status) or 'ok'}")
+
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the pygression benchmark suite.")
+    parser.add_argument("--output", help="write the results to this JSON file")
+    parser.add_argument("--baseline", default=BASELINE, help="baseline JSON file to compare against")
+    parser.add_argument("--save-baseline", action="store_true", help="write the results to the baseline file instead of comparing")
+    parser.add_argument("--threshold", type=float, default=0.10, help="largest allowed slowdown beyond the measured noise, as a fraction")
+    parser.add_argument("--memory-threshold", type=float, default=0.25, help="largest allowed growth of peak memory, as a fraction")
+    parser.add_argument("--filter", help="only run workloads whose name contains this")
+    parser.add_argument("--quick", action="store_true", help="fewer calls, for a smoke test")
+    args = parser.parse_args()
+
+    report = {"metadata": metadata(), "results": run(args.filter, args.quick)}
+
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(report, file, indent=2)
+
+    if args.save_baseline:
+        with open(args.baseline, "w") as file:
+            json.dump(report, file, indent=2)
+
+        print(f"baseline written to {args.baseline}")
+        return
+
+    if not os.path.exists(args.baseline):
+        print(f"no baseline at {args.baseline}; record one with --save-baseline")
+        return
+
+    with open(args.baseline) as file:
+        baseline = json.load(file)
+
+    regressions = compare(baseline["results"], report["results"], args.threshold, args.memory_threshold)
+    if regressions:
+        print(f"{len(regressions)} regression(s): {', '.join(regressions)}")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,318 @@
+# Columnar storage for large numbers of progressions. Requires numpy.
+from array import array
+from typing import List, Iterator
+import numpy as np
+from .progression import Progression
+from .quality.base import _QUALITIES
+from .modifier.base import ModifierSet
+from .encoding import FIELDS, MODES, MODE_CODES, TargetTable, encode, decode, empty_progression
+from .vectorized import PRACTICAL_KEYS, KeyedChords, core_intervals, intervals, spell_roots, spell_tones
+
+# NumPy type of each encoded field, in the order of FIELDS
+_DTYPES = (np.uint8, np.int8, np.uint8, np.uint8, np.uint32, np.uint8, np.int8, np.uint8, np.uint8, np.uint32)
+
+# Array typecodes matching _DTYPES, used while streaming progressions in
+_TYPECODES = ("B", "b", "B", "B", "I", "B", "b", "B", "B", "I")
+
+# Semitones of each scale degree of every mode, indexed by mode code
+_SCALES = np.array([mode.value for mode in MODES], dtype=np.int16)
+
+class ProgressionBatch:
+    """
+    Class that represents many progressions stored column by column, one NumPy array per encoded field.
+    Chords of every progression are laid end to end; progression i owns chords offsets[i] to offsets[i + 1].
+    Quality and modifier codes are the registry ids used by pygression.encoding.
+
+    Args:
+        columns (Dict[str, numpy.ndarray]): Array of each field in FIELDS, one entry per chord.
+        offsets (numpy.ndarray): Start of each progression in the columns, followed by the number of chords.
+        modes (numpy.ndarray): Mode code of each progression.
+        relative_to (numpy.ndarray): Code of the mode each progression is read with respect to.
+        targets (TargetTable): Table that the target_ref column refers to. Defaults to an empty table.
+
+    Raises:
+        ValueError: If the arrays don't have matching lengths.
+    """
+
+    def __init__(self, columns, offsets: np.ndarray, modes: np.ndarray, relative_to: np.ndarray, targets: TargetTable=None):
+        self.targets = TargetTable() if targets is None else targets
+        self.offsets = np.asarray(offsets, dtype=np.int64)
+        self.modes = np.asarray(modes, dtype=np.uint8)
+        self.relative_to = np.asarray(relative_to, dtype=np.uint8)
+
+        for field, dtype in zip(FIELDS, _DTYPES):
+            setattr(self, field, np.asarray(columns[field], dtype=dtype))
+
+        if len(self.offsets) != len(self.modes) + 1 or len(self.modes) != len(self.relative_to):
+            raise ValueError("offsets must have one more entry than modes and relative_to")
+
+        if any(len(getattr(self, field)) != self.offsets[-1] for field in FIELDS):
+            raise ValueError("every column must have one entry per chord")
+
+    @classmethod
+    def from_progressions(cls, progressions) -> "ProgressionBatch":
+        """
+        Build a batch from progressions. The progressions are streamed, so any iterable works.
+
+        Args:
+            progressions (Iterable[Progression]): Progressions to store.
+
+        Returns:
+            ProgressionBatch: The progressions as columns.
+        """
+
+        columns = [array(typecode) for typecode in _TYPECODES]
+        offsets = array("q", [0])
+        modes = array("B")
+        relative_to = array("B")
+        targets = TargetTable()
+
+        for progression in progressions:
+            for chord in progression._chords:
+                for column, value in zip(columns, encode(chord, targets)):
+                    column.append(value)
+
+            offsets.append(len(columns[0]))
+            modes.append(MODE_CODES[progression._mode])
+            relative_to.append(MODE_CODES[progression._relative_to])
+
+        return cls(
+            {field: _from_array(column, dtype) for field, column, dtype in zip(FIELDS, columns, _DTYPES)},
+            _from_array(offsets, np.int64), _from_array(modes, np.uint8), _from_array(relative_to, np.uint8), targets,
+        )
+
+    def __len__(self) -> int:
+        return len(self.modes)
+
+    def __getitem__(self, index: int) -> Progression:
+        """
+        Build the progression at an index.
+
+        Args:
+            index (int): Index of the progression.
+
+        Returns:
+            Progression: A new progression with the stored chords.
+
+        Raises:
+            IndexError: If "index" is out of range.
+        """
+
+        if index < 0:
+            index += len(self)
+
+        if index < 0 or index >= len(self):
+            raise IndexError("progression index out of range")
+
+        progression = empty_progression(self.modes[index], self.relative_to[index])
+        start, end = self.offsets[index], self.offsets[index + 1]
+        columns = [getattr(self, field)[start:end].tolist() for field in FIELDS]
+        progression._chords = [decode(*values, targets=self.targets) for values in zip(*columns)]
+
+        return progression
+
+    def __iter__(self) -> Iterator[Progression]:
+        for index in range(len(self)):
+            yield self[index]
+
+    def to_progressions(self) -> List[Progression]:
+        """
+        Build every progression in the batch.
+
+        Returns:
+            List[Progression]: The stored progressions, in order.
+        """
+
+        return list(self)
+
+    @property
+    def chord_count(self) -> int:
+        """
+        Get the number of chords in the batch.
+
+        Returns:
+            int: Number of chords across every progression.
+        """
+
+        return int(self.offsets[-1])
+
+    @property
+    def lengths(self) -> np.ndarray:
+        """
+        Get the number of chords in each progression.
+
+        Returns:
+            numpy.ndarray: Length of each progression.
+        """
+
+        return np.diff(self.offsets)
+
+    @property
+    def progression_ids(self) -> np.ndarray:
+        """
+        Get the progression that each chord belongs to.
+
+        Returns:
+            numpy.ndarray: Index of the progression of each chord.
+        """
+
+        return np.repeat(np.arange(len(self)), self.lengths)
+
+    def chord_mask(self, degree: int=None, accidental: int=None, quality=None, modifier=None, applied: bool=None) -> np.ndarray:
+        """
+        Find the chords that match every given condition. Conditions that are left out match every chord.
+
+        Args:
+            degree (int): Degree of the numeral.
+            accidental (int): Accidental value of the numeral.
+            quality (Quality): Quality of the chord.
+            modifier (Modifier): Modifier the chord has.
+            applied (bool): Whether the chord is an applied chord.
+
+        Returns:
+            numpy.ndarray: Boolean mask over the chords.
+        """
+
+        mask = np.ones(self.chord_count, dtype=bool)
+
+        if degree is not None:
+            mask &= self.degree == degree
+        if accidental is not None:
+            mask &= self.accidental == accidental
+        if quality is not None:
+            mask &= self.quality == quality._id
+        if modifier is not None:
+            mask &= (self.modifiers & (1 << modifier._id)) != 0
+        if applied is not None:
+            mask &= (self.target_degree != 0) == applied
+
+        return mask
+
+    def any_chord(self, chord_mask: np.ndarray) -> np.ndarray:
+        """
+        Find the progressions that have at least one chord in a mask.
+
+        Args:
+            chord_mask (numpy.ndarray): Boolean mask over the chords, like the one made by "chord_mask".
+
+        Returns:
+            numpy.ndarray: Boolean mask over the progressions.
+        """
+
+        counts = np.add.reduceat(np.append(chord_mask, False).astype(np.int64), self.offsets[:-1]) if len(self) else np.empty(0, dtype=np.int64)
+
+        # reduceat gives the element at the offset for empty progressions, so they're cleared separately
+        return (counts > 0) & (self.lengths > 0)
+
+    def select(self, selection) -> "ProgressionBatch":
+        """
+        Make a batch of some of the progressions.
+
+        Args:
+            selection (numpy.ndarray): Boolean mask over the progressions or indices of progressions.
+
+        Returns:
+            ProgressionBatch: A new batch with the selected progressions, in order.
+        """
+
+        selection = np.asarray(selection)
+        indices = np.flatnonzero(selection) if selection.dtype == bool else selection.astype(np.int64)
+
+        lengths = self.lengths[indices]
+        offsets = np.zeros(len(indices) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=offsets[1:])
+
+        # Position of every kept chord in the old columns
+        chords = np.repeat(self.offsets[indices] - offsets[:-1], lengths) + np.arange(offsets[-1])
+
+        return ProgressionBatch({field: getattr(self, field)[chords] for field in FIELDS}, offsets, self.modes[indices], self.relative_to[indices], self.targets)
+
+    def transpose(self, semitones: int) -> "ProgressionBatch":
+        """
+        Make a batch with every numeral raised or lowered by a number of semitones, like adding to a Roman numeral.
+
+        Args:
+            semitones (int): Number of semitones to transpose by.
+
+        Returns:
+            ProgressionBatch: A new batch with the transposed chords.
+
+        Raises:
+            ValueError: If a numeral would need more than a double accidental.
+        """
+
+        accidental = self.accidental.astype(np.int16) + semitones
+        if np.any((accidental < -2) | (accidental > 2)):
+            raise ValueError("transposing would give a numeral more than a double accidental")
+
+        columns = {field: getattr(self, field) for field in FIELDS}
+        columns["accidental"] = accidental
+
+        return ProgressionBatch(columns, self.offsets, self.modes, self.relative_to, self.targets)
+
+    def realize(self, keys=None, tones: bool=True) -> KeyedChords:
+        """
+        Realize every chord of every progression in several keys with one vectorized pass, the same way as Progression.chords_in.
+        Chords of progression i are at offsets[i] to offsets[i + 1] in the result.
+
+        Args:
+            keys (Iterable[Note]): Keys to realize the chords in. Defaults to the 15 keys with at most seven sharps or flats.
+            tones (bool): Whether chord tones are spelled as well as roots. Tones take several times the memory of roots.
+
+        Returns:
+            KeyedChords: Roots (and chord tones) of every chord in every key.
+
+        Raises:
+            ValueError: If a key has double accidentals, or a chord can't be spelled in a key.
+        """
+
+        keys = PRACTICAL_KEYS if keys is None else tuple(keys)
+
+        degree = self.degree.astype(np.int16)
+        target_degree = self.target_degree.astype(np.int16)
+
+        # Applied chords are built on the scale degree of their target
+        degrees = (degree - 1 + np.where(target_degree != 0, target_degree - 1, 0)) % 7
+        scales = np.repeat(self.relative_to, self.lengths)
+        offsets = _SCALES[scales, degrees] + self.accidental + self.target_accidental.astype(np.int16)
+
+        root_letters, root_accidentals = spell_roots(keys, degrees, offsets)
+        parts = _Parts(self)
+
+        if not tones:
+            return KeyedChords(keys, parts, root_letters, root_accidentals, None, None, None)
+
+        # Chords are spelled on C once for each distinct shape, then spread back out
+        shapes = self.quality.astype(np.int64) << 40 | self.inversion.astype(np.int64) << 32 | self.modifiers
+        unique, inverse = np.unique(shapes, return_inverse=True)
+        letters, semitones, sizes = intervals([
+            (_QUALITIES[shape >> 40], ModifierSet._from_bits(shape & 0xFFFFFFFF), shape >> 32 & 0xFF) for shape in unique.tolist()
+        ])
+
+        # Cores are spelled too, so keys are rejected exactly when Progression.chords_in rejects them
+        core_letters, core_semitones = core_intervals(_QUALITIES)
+        spell_tones(root_letters, root_accidentals, core_letters[self.quality], core_semitones[self.quality])
+
+        inverse = inverse.reshape(-1)
+        tone_letters, tone_accidentals = spell_tones(root_letters, root_accidentals, letters[inverse], semitones[inverse])
+
+        return KeyedChords(keys, parts, root_letters, root_accidentals, tone_letters, tone_accidentals, sizes[inverse])
+
+# View an array.array as a NumPy array without copying it
+def _from_array(values: array, dtype) -> np.ndarray:
+    if not len(values):
+        return np.empty(0, dtype=dtype)
+
+    return np.frombuffer(values, dtype=np.dtype(values.typecode)).astype(dtype, copy=False)
+
+# Quality, modifiers and inversion of each chord in a batch, decoded when asked for
+class _Parts:
+    def __init__(self, batch: ProgressionBatch):
+        self._batch = batch
+
+    def __len__(self) -> int:
+        return self._batch.chord_count
+
+    def __getitem__(self, index: int):
+        batch = self._batch
+        return (_QUALITIES[batch.quality[index]], ModifierSet._from_bits(int(batch.modifiers[index])), int(batch.inversion[index]))
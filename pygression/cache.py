@@ -0,0 +1,147 @@
+from collections import OrderedDict, namedtuple
+
+CacheInfo = namedtuple("CacheInfo", ["hits", "misses", "evictions", "maxsize", "currsize"])
+
+class SpellingCache:
+    """
+    Class that represents a bounded cache of spelled chords, shared by the whole process.
+
+    Cached values must be immutable (tuples of interned notes), so they can be handed to every chord
+    that asks for them without copying.
+
+    Args:
+        maxsize (int): Maximum number of entries. None means unbounded.
+        policy (str): Entry evicted when full, either "lru" (least recently used) or "fifo" (oldest inserted).
+        enabled (bool): Whether lookups and insertions are performed at all.
+    """
+
+    def __init__(self, maxsize: int=4096, policy: str="lru", enabled: bool=True):
+        self._entries = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._maxsize = None
+        self._policy = None
+        self._enabled = enabled
+
+        self.configure(maxsize=maxsize, policy=policy)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key):
+        """
+        Look up a cached value.
+
+        Args:
+            key: Key of the entry.
+
+        Returns:
+            The cached value, or None if there is no entry or the cache is disabled.
+        """
+
+        if not self._enabled:
+            return None
+
+        try:
+            value = self._entries[key]
+        except KeyError:
+            self._misses += 1
+            return None
+
+        if self._policy == "lru":
+            self._entries.move_to_end(key)
+
+        self._hits += 1
+        return value
+
+    def put(self, key, value):
+        """
+        Store a value, evicting entries if the cache is full.
+
+        Args:
+            key: Key of the entry.
+            value: Immutable value to store.
+        """
+
+        if not self._enabled or self._maxsize == 0:
+            return
+
+        self._entries[key] = value
+
+        if self._maxsize is not None:
+            while len(self._entries) > self._maxsize:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+
+    def configure(self, maxsize: int=..., policy: str=None, enabled: bool=None):
+        """
+        Change the size, eviction policy or state of the cache. Arguments that are left out keep their current value.
+
+        Args:
+            maxsize (int): Maximum number of entries. None means unbounded.
+            policy (str): Either "lru" or "fifo".
+            enabled (bool): Whether the cache is used.
+
+        Raises:
+            ValueError: If "maxsize" is negative or "policy" is unknown.
+        """
+
+        if policy is not None:
+            if policy not in ("lru", "fifo"):
+                raise ValueError(f"policy must be \"lru\" or \"fifo\", not {policy!r}")
+
+            self._policy = policy
+
+        if maxsize is not ...:
+            if maxsize is not None and maxsize < 0:
+                raise ValueError("maxsize cannot be negative")
+
+            self._maxsize = maxsize
+
+            if maxsize is not None:
+                while len(self._entries) > maxsize:
+                    self._entries.popitem(last=False)
+                    self._evictions += 1
+
+        if enabled is not None:
+            self._enabled = enabled
+
+            if not enabled:
+                self._entries.clear()
+
+    def clear(self):
+        """
+        Remove every entry and reset the counters.
+        """
+
+        self._entries.clear()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def info(self) -> CacheInfo:
+        """
+        Get the statistics of the cache.
+
+        Returns:
+            CacheInfo: Hits, misses, evictions, maximum size and current size.
+        """
+
+        return CacheInfo(self._hits, self._misses, self._evictions, self._maxsize, len(self._entries))
+
+    @property
+    def enabled(self) -> bool:
+        """
+        Get whether the cache is used.
+
+        Returns:
+            bool: Whether the cache is enabled.
+        """
+
+        return self._enabled
+
+# Spellings of chords keyed on (root, quality, modifiers, inversion, bass), used by Chord. Every quality with every
+# compatible modifier on every root (with up to two accidentals) is about 6,600 spellings, so the default bound leaves
+# room for inversions, slash chords and stacked modifiers before anything is evicted.
+chord_cache = SpellingCache(maxsize=65536)
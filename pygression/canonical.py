@@ -0,0 +1,171 @@
+# Canonical forms and stable fingerprints of progressions and chord sequences, for deduplicating corpora
+import struct
+from hashlib import blake2b
+from typing import List
+from .chord import Chord
+from .progression import Progression
+from .encoding import root_of
+from .utils import rotate_mask
+
+# Letters and semitones of a chord's root above the tonic. Only the numeral of the target matters, like in Progression.chords_in,
+# so the chord doesn't need to be encoded.
+def _root(chord, scale: tuple) -> tuple:
+    target = chord._target
+    if target is None:
+        return root_of((chord._roman._degree, chord._roman._accidental.value, 0, 0, 0, 0, 0), scale)
+
+    return root_of((chord._roman._degree, chord._roman._accidental.value, 0, 0, 0, target._roman._degree, target._roman._accidental.value), scale)
+
+# Smallest rotation of a sequence, re-read from its new start when "restart" is given
+def _min_rotation(items: list, restart=None) -> tuple:
+    rotations = (items[i:] + items[:i] for i in range(len(items)))
+    if restart is not None:
+        rotations = (restart(rotation) for rotation in rotations)
+
+    return min((tuple(rotation) for rotation in rotations), default=())
+
+def progression_form(progression: Progression, rotation: bool=False, enharmonic: bool=False) -> tuple:
+    """
+    Get a canonical form of a progression. Progressions have the same form when they realize to the same chords in every key,
+    whatever their mode and the mode they're read with respect to (e.g. bIII in major and III in minor), and whether a chord
+    is written as an applied chord or not (V/V and II).
+
+    Args:
+        progression (Progression): Progression to get the form of.
+        rotation (bool): Whether progressions that are rotations of each other (I IV V and V I IV) share a form.
+        enharmonic (bool): Whether only pitch classes count, so that differently spelled chords with the same notes
+            and bass (e.g. a minor seventh with a flat five and a half-diminished seventh) share a form.
+
+    Returns:
+        tuple: One tuple of integers per chord.
+    """
+
+    scale = progression._relative_to.value
+    chords = []
+
+    for chord in progression._chords:
+        letters, semitones = _root(chord, scale)
+
+        if enharmonic:
+            shape = chord._shape()
+            chords.append((rotate_mask(shape & 0xFFF, semitones), ((shape >> 12) + semitones) % 12))
+        else:
+            chords.append((letters, semitones, chord._quality._id, chord._inversion, chord._modifiers._bits))
+
+    return _min_rotation(chords) if rotation else tuple(chords)
+
+# Spelled form of each chord relative to a reference root, as (letters, semitones, quality, inversion, modifiers, bass letters, bass semitones)
+def _spelled(chords: List[Chord]) -> list:
+    if not chords:
+        return []
+
+    reference = chords[0]._root
+    forms = []
+
+    for chord in chords:
+        root = chord._root
+        bass = chord._bass
+
+        form = ((root._index // 5 - reference._index // 5) % 7, (root._int - reference._int) % 12, chord._quality._id, chord._inversion, chord._modifiers._bits)
+        if bass is not None:
+            form += ((bass._index // 5 - reference._index // 5) % 7, (bass._int - reference._int) % 12)
+
+        forms.append(form)
+
+    return forms
+
+# Pitch classes and bass of each chord relative to a reference root
+def _pitches(chords: List[Chord]) -> list:
+    if not chords:
+        return []
+
+    reference = chords[0]._root._int
+    return [(rotate_mask(chord._code & 0xFFF, -reference % 12), (chord._notes[0]._int - reference) % 12) for chord in chords]
+
+def chords_form(chords: List[Chord], rotation: bool=False, enharmonic: bool=False) -> tuple:
+    """
+    Get a canonical form of a sequence of chords that doesn't depend on its key: the chords are read relative to the root of the first chord.
+
+    Args:
+        chords (List[Chord]): Chords to get the form of.
+        rotation (bool): Whether sequences that are rotations of each other share a form. Each rotation is read relative to its own first chord.
+        enharmonic (bool): Whether only pitch classes count, so that enharmonic spellings (and different names for the same notes) share a form.
+
+    Returns:
+        tuple: One tuple of integers per chord.
+    """
+
+    chords = list(chords)
+    read = _pitches if enharmonic else _spelled
+
+    if rotation:
+        return _min_rotation(chords, restart=read)
+
+    return tuple(read(chords))
+
+def form(item, rotation: bool=False, enharmonic: bool=False) -> tuple:
+    """
+    Get the canonical form of a progression or a sequence of chords.
+
+    Args:
+        item (Progression, List[Chord]): Progression or chords.
+        rotation (bool): Whether rotations share a form.
+        enharmonic (bool): Whether only pitch classes count.
+
+    Returns:
+        tuple: The canonical form.
+    """
+
+    if isinstance(item, Progression):
+        return progression_form(item, rotation=rotation, enharmonic=enharmonic)
+
+    return chords_form(item, rotation=rotation, enharmonic=enharmonic)
+
+def fingerprint(item, rotation: bool=False, enharmonic: bool=False) -> int:
+    """
+    Get a 64-bit fingerprint of the canonical form of a progression or a sequence of chords.
+    Fingerprints are stable across processes and machines, so they can be stored.
+    Progressions and chord sequences with the same form never share a fingerprint with each other.
+
+    Args:
+        item (Progression, List[Chord]): Progression or chords.
+        rotation (bool): Whether rotations share a fingerprint.
+        enharmonic (bool): Whether only pitch classes count.
+
+    Returns:
+        int: Unsigned 64-bit fingerprint.
+    """
+
+    canonical = form(item, rotation=rotation, enharmonic=enharmonic)
+    kind = isinstance(item, Progression) | rotation << 1 | enharmonic << 2
+
+    digest = blake2b(digest_size=8)
+    digest.update(struct.pack("<BI", kind, len(canonical)))
+    for chord in canonical:
+        digest.update(struct.pack(f"<B{len(chord)}I", len(chord), *chord))
+
+    return int.from_bytes(digest.digest(), "little")
+
+def deduplicate(items, rotation: bool=False, enharmonic: bool=False) -> List:
+    """
+    Keep the first of every group of progressions or chord sequences with the same fingerprint, in one pass.
+
+    Args:
+        items (Iterable): Progressions or chord sequences.
+        rotation (bool): Whether rotations count as duplicates.
+        enharmonic (bool): Whether only pitch classes count.
+
+    Returns:
+        List: The distinct items, in order.
+    """
+
+    seen = set()
+    distinct = []
+
+    for item in items:
+        key = fingerprint(item, rotation=rotation, enharmonic=enharmonic)
+        if key not in seen:
+            seen.add(key)
+            distinct.append(item)
+
+    return distinct
@@ -0,0 +1,399 @@
+# Catalog file of every chord spelling, read through mmap and indexed by root, quality and pitch classes
+import mmap
+import os
+import struct
+import sys
+from array import array
+from heapq import merge
+from typing import List, Tuple
+from .note import Note, _SPELLINGS
+from .chord import Chord
+from .quality.base import Quality, _QUALITIES
+from .modifier.base import _MODIFIERS, ModifierSet, _modifier_sets
+
+# One chord: root spelling (Note._index), quality id, inversion, tone count, modifier bits, code (Chord.code) and symbol offset
+RECORD = struct.Struct("<BBBBIII")
+
+# Magic, version, tones per chord, most modifiers, chord count and symbol bytes
+HEADER = struct.Struct("<4sHBBQQ")
+
+MAGIC = b"PGCT"
+VERSION = 1
+
+# Most modifiers on a catalogued chord, unless asked otherwise
+MAX_MODIFIERS = 2
+
+# File layout, every section 8-byte aligned:
+#   header
+#   chord records, sorted by root, quality, modifiers and inversion
+#   tones: the spelled tones of each chord as Note._index, from the bass up, padded with 255
+#   symbols: every chord symbol in UTF-8, back to back
+#   root index: chords with root spelling n are n_starts[n] to n_starts[n + 1] (36 uint32)
+#   quality index: chord ids grouped by quality, then the group starts (qualities + 1 uint32)
+#   mask index: chord ids grouped by pitch-class mask, then the group starts (4097 uint32)
+
+# Every spelling, indexed by Note._index
+_NOTES = tuple(sorted((note for note in _SPELLINGS if note is not None), key=lambda note: note._index))
+
+_PADDING = 255
+
+# Every chord of the catalog in record order, as (root index, quality id, inversion, modifier bits, chord).
+# Chords that switch to another quality are left out, since they're catalogued under that quality.
+def _chords(max_modifiers: int):
+    allowed = (1 << len(_MODIFIERS)) - 1
+    sets = [(quality, _modifier_sets(quality, allowed, max_modifiers)) for quality in _QUALITIES]
+
+    for root in _NOTES:
+        for quality, bit_sets in sets:
+            for bits in bit_sets:
+                modifiers = ModifierSet._from_bits(bits)
+
+                inversion = 0
+                while True:
+                    try:
+                        chord = Chord._realize(root, quality, modifiers, inversion)
+                    except ValueError:
+                        # Spellings that need more than two accidentals
+                        break
+
+                    if chord._quality is not quality:
+                        break
+
+                    yield root._index, quality._id, inversion, bits, chord
+
+                    inversion += 1
+                    if inversion >= len(chord._notes):
+                        break
+
+def _pad(file):
+    file.write(bytes(-file.tell() % 8))
+
+def _write_ints(file, values):
+    values = array("I", values)
+    if sys.byteorder != "little":
+        values.byteswap()
+
+    file.write(values.tobytes())
+    _pad(file)
+
+# Ids grouped by key, and the start of each of "size" groups; ids stay in order within a group
+def _grouped(keys: list, size: int) -> Tuple[array, array]:
+    starts = array("I", bytes(4 * (size + 1)))
+    for key in keys:
+        starts[key + 1] += 1
+
+    for i in range(size):
+        starts[i + 1] += starts[i]
+
+    ids = array("I", bytes(4 * len(keys)))
+    filled = array("I", starts)
+    for i, key in enumerate(keys):
+        ids[filled[key]] = i
+        filled[key] += 1
+
+    return ids, starts
+
+def build_catalog(path: str, max_modifiers: int=MAX_MODIFIERS) -> int:
+    """
+    Write a catalog file of every chord spelling: every root spelling, quality, set of compatible modifiers
+    (up to "max_modifiers" of them) and inversion that can be spelled. The file is replaced atomically.
+
+    Args:
+        path (str): Path of the file to write.
+        max_modifiers (int): Most modifiers on a chord.
+
+    Returns:
+        int: Number of chords written.
+    """
+
+    chords = list(_chords(max_modifiers))
+    width = max(len(chord._notes) for *_, chord in chords)
+
+    records = bytearray()
+    tones = bytearray()
+    symbols = bytearray()
+
+    for root, quality, inversion, bits, chord in chords:
+        records += RECORD.pack(root, quality, inversion, len(chord._notes), bits, chord._code, len(symbols))
+        tones += bytes(note._index for note in chord._notes) + bytes([_PADDING]) * (width - len(chord._notes))
+        symbols += str(chord).encode()
+
+    temporary = path + ".tmp"
+    with open(temporary, "wb") as file:
+        file.write(HEADER.pack(MAGIC, VERSION, width, max_modifiers, len(chords), len(symbols)))
+        _pad(file)
+
+        for section in (records, tones, symbols):
+            file.write(section)
+            _pad(file)
+
+        root_starts = [0] * 36
+        for root, *_ in chords:
+            root_starts[root + 1] += 1
+        for i in range(35):
+            root_starts[i + 1] += root_starts[i]
+        _write_ints(file, root_starts)
+
+        for ids, starts in (_grouped([quality for _, quality, *_ in chords], len(_QUALITIES)), _grouped([chord._code & 0xFFF for *_, chord in chords], 4096)):
+            _write_ints(file, ids)
+            _write_ints(file, starts)
+
+    os.replace(temporary, path)
+
+    return len(chords)
+
+class Catalog:
+    """
+    Class that represents a catalog file opened with mmap. Only the header is read when it's opened;
+    chords, tones and symbols are read from the mapped file when they're asked for.
+    Chords are referred to by id, their position in the catalog.
+
+    Args:
+        path (str): Path of the catalog file.
+
+    Raises:
+        ValueError: If the file isn't a catalog file of a supported version.
+    """
+
+    def __init__(self, path: str):
+        with open(path, "rb") as file:
+            self._mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        try:
+            magic, version, width, max_modifiers, count, symbol_bytes = HEADER.unpack_from(self._mmap)
+        except struct.error:
+            self._mmap.close()
+            raise ValueError(f"{path} is not a catalog file")
+
+        if magic != MAGIC or version != VERSION:
+            self._mmap.close()
+            raise ValueError(f"{path} is not a catalog file of version {VERSION}")
+
+        self._width = width
+        self._max_modifiers = max_modifiers
+        self._count = count
+        self._view = memoryview(self._mmap)
+
+        position = -(-HEADER.size // 8) * 8
+
+        def section(length: int) -> memoryview:
+            nonlocal position
+            values = self._view[position:position + length]
+            position += -(-length // 8) * 8
+
+            return values
+
+        # Zero-copy views of the uint32 sections; big-endian machines read a swapped copy
+        def ints(length: int):
+            values = section(length * 4).cast("I")
+            if sys.byteorder != "little":
+                values = array("I", values)
+                values.byteswap()
+
+            return values
+
+        self._records = section(count * RECORD.size)
+        self._tones = section(count * width)
+        self._symbols = section(symbol_bytes)
+        self._symbol_end = symbol_bytes
+        self._root_starts = ints(36)
+        self._quality_ids = ints(count)
+        self._quality_starts = ints(len(_QUALITIES) + 1)
+        self._mask_ids = ints(count)
+        self._mask_starts = ints(4097)
+
+    def __enter__(self) -> "Catalog":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self) -> int:
+        return self._count
+
+    @property
+    def max_modifiers(self) -> int:
+        """
+        Get the most modifiers on a catalogued chord.
+
+        Returns:
+            int: Most modifiers the catalog was built with.
+        """
+
+        return self._max_modifiers
+
+    def _check(self, index: int) -> int:
+        if index < 0:
+            index += self._count
+
+        if index < 0 or index >= self._count:
+            raise IndexError("chord id out of range")
+
+        return index
+
+    def record(self, index: int) -> Tuple[int, ...]:
+        """
+        Get the raw record of a chord without building it.
+
+        Args:
+            index (int): Id of the chord.
+
+        Returns:
+            Tuple[int, ...]: Root spelling (Note._index), quality id, inversion, tone count, modifier bits, code (like Chord.code) and symbol offset.
+
+        Raises:
+            IndexError: If "index" is out of range.
+        """
+
+        return RECORD.unpack_from(self._records, self._check(index) * RECORD.size)
+
+    def __getitem__(self, index: int) -> Chord:
+        """
+        Build the chord with an id.
+
+        Args:
+            index (int): Id of the chord.
+
+        Returns:
+            Chord: A new chord.
+
+        Raises:
+            IndexError: If "index" is out of range.
+        """
+
+        root, quality, inversion, _, bits, _, _ = self.record(index)
+        return Chord._realize(_NOTES[root], _QUALITIES[quality], ModifierSet._from_bits(bits), inversion)
+
+    def chords(self, ids) -> List[Chord]:
+        """
+        Build the chords with some ids, e.g. the result of "find".
+
+        Args:
+            ids (Iterable[int]): Ids of the chords.
+
+        Returns:
+            List[Chord]: A new chord for each id, in order.
+        """
+
+        return [self[index] for index in ids]
+
+    def tones(self, index: int) -> Tuple[Note]:
+        """
+        Get the spelled tones of a chord without building it.
+
+        Args:
+            index (int): Id of the chord.
+
+        Returns:
+            Tuple[Note]: Tones from the bass up.
+
+        Raises:
+            IndexError: If "index" is out of range.
+        """
+
+        start = self._check(index) * self._width
+        return tuple(_NOTES[i] for i in self._tones[start:start + self._width] if i != _PADDING)
+
+    def symbol(self, index: int) -> str:
+        """
+        Get the symbol of a chord without building it.
+
+        Args:
+            index (int): Id of the chord.
+
+        Returns:
+            str: Chord symbol, like str(Chord).
+
+        Raises:
+            IndexError: If "index" is out of range.
+        """
+
+        index = self._check(index)
+        start = RECORD.unpack_from(self._records, index * RECORD.size)[6]
+        end = RECORD.unpack_from(self._records, (index + 1) * RECORD.size)[6] if index + 1 < self._count else self._symbol_end
+
+        return bytes(self._symbols[start:end]).decode()
+
+    def find(self, root: Note=None, quality: Quality=None, mask: int=None, contains=None) -> List[int]:
+        """
+        Find the chords that match every given condition. The most selective index is read first,
+        and the other conditions are checked against its chords' records.
+
+        Args:
+            root (Note): Spelled root.
+            quality (Quality): Quality.
+            mask (int): Exact pitch classes, as a 12-bit mask with bit n set for pitch class n (C = 0).
+            contains (int, Iterable[Note]): Pitch classes the chord must have, as a mask or as notes.
+
+        Returns:
+            List[int]: Ids of the matching chords, in order.
+        """
+
+        if contains is not None and not isinstance(contains, int):
+            bits = 0
+            for note in contains:
+                bits |= 1 << note._int
+            contains = bits
+
+        # Ids from one index, as sorted runs
+        if mask is not None:
+            mask &= 0xFFF
+            runs = [self._mask_ids[self._mask_starts[mask]:self._mask_starts[mask + 1]]]
+        elif root is not None:
+            runs = [range(self._root_starts[root._index], self._root_starts[root._index + 1])]
+        elif quality is not None:
+            runs = [self._quality_ids[self._quality_starts[quality._id]:self._quality_starts[quality._id + 1]]]
+        elif contains is not None:
+            runs = [
+                self._mask_ids[self._mask_starts[bucket]:self._mask_starts[bucket + 1]]
+                for bucket in range(4096) if bucket & contains == contains and self._mask_starts[bucket] != self._mask_starts[bucket + 1]
+            ]
+        else:
+            runs = [range(self._count)]
+
+        found = []
+        for index in merge(*runs):
+            record = RECORD.unpack_from(self._records, index * RECORD.size)
+            code = record[5]
+
+            if root is not None and record[0] != root._index:
+                continue
+            if quality is not None and record[1] != quality._id:
+                continue
+            if mask is not None and code & 0xFFF != mask:
+                continue
+            if contains is not None and code & contains != contains:
+                continue
+
+            found.append(index)
+
+        return found
+
+    def close(self):
+        """
+        Unmap the file.
+        """
+
+        for name in ("_records", "_tones", "_symbols", "_root_starts", "_quality_ids", "_quality_starts", "_mask_ids", "_mask_starts", "_view"):
+            view = getattr(self, name)
+            if isinstance(view, memoryview):
+                view.release()
+
+        self._mmap.close()
+
+def open_catalog(path: str, max_modifiers: int=MAX_MODIFIERS) -> Catalog:
+    """
+    Open a catalog file, building it first if it doesn't exist yet.
+
+    Args:
+        path (str): Path of the catalog file.
+        max_modifiers (int): Most modifiers on a chord, if the file has to be built.
+
+    Returns:
+        Catalog: The opened catalog.
+    """
+
+    if not os.path.exists(path):
+        build_catalog(path, max_modifiers=max_modifiers)
+
+    return Catalog(path)
@@ -1,10 +1,14 @@
+from types import MappingProxyType
 from typing import List
-from copy import deepcopy
 from .note import Note
 from .utils import nth_letter_from
 from .quality.base import Quality
 from .quality.triad import Major, Minor
-from .modifier.base import Modifier
+from .modifier.base import Modifier, ModifierSet
+from .cache import chord_cache
+
+_MAJOR = Major()
+_NO_MODIFIERS = ModifierSet()
 
 class Chord:
     """
@@ -15,20 +19,77 @@ class Chord:
         quality (Quality): Quality of the chord.
     """
 
+    __slots__ = ("_root", "_quality", "_inversion", "_modifiers", "_bass", "_notes", "_positions", "_code")
+
     def __init__(self, root: Note, quality: Quality=Major()):
         self._root = root
         self._quality = quality
         self._inversion = 0
-        self._modifiers = []
-        self._notes = []
+        self._modifiers = _NO_MODIFIERS
+        self._bass = None
+        self._notes = ()
+        self._positions = None
+        self._code = 0
 
         self._calculate_notes()
+
+    # Every part of a chord is immutable and shared, so a shallow copy is a complete one
+    def _clone(self) -> "Chord":
+        chord = Chord.__new__(Chord)
+        chord._root = self._root
+        chord._quality = self._quality
+        chord._inversion = self._inversion
+        chord._modifiers = self._modifiers
+        chord._bass = self._bass
+        chord._notes = self._notes
+        chord._positions = self._positions
+        chord._code = self._code
+
+        return chord
+
+    # Build a chord from all of its parts with a single spelling
+    @staticmethod
+    def _realize(root: Note, quality: Quality, modifiers: ModifierSet=None, inversion: int=0) -> "Chord":
+        chord = Chord.__new__(Chord)
+        chord._root = root
+        chord._quality = quality
+        chord._inversion = inversion
+        chord._modifiers = _NO_MODIFIERS if modifiers is None else modifiers
+        chord._bass = None
+        chord._calculate_notes()
+
+        return chord
+
+    @staticmethod
+    def parse(symbol: str) -> "Chord":
+        """
+        Parse a chord symbol like the ones chords are written as (e.g. "Ebm7b5/Gb" or "G13#11").
+
+        Args:
+            symbol (str): Chord symbol to parse.
+
+        Returns:
+            Chord: A new chord.
+
+        Raises:
+            ValueError: If "symbol" isn't a valid chord symbol.
+        """
+
+        from .parse import parse_chord
+
+        return parse_chord(symbol)
+
+    def __copy__(self) -> "Chord":
+        return self._clone()
+
+    def __deepcopy__(self, memo) -> "Chord":
+        return self._clone()
     
     def __repr__(self) -> str:
-        return str(self._root) + str(self._quality) + self._quality._figured_bass(0) + "".join(str(modifier) for modifier in self._modifiers) + ("/" + str(self._notes[0]) if self._inversion != 0 else "")
+        return str(self._root) + str(self._quality) + self._quality._figured_bass(0) + "".join(str(modifier) for modifier in self._modifiers) + ("/" + str(self._notes[0]) if self._inversion != 0 or self._bass is not None else "")
 
     def __str__(self) -> str:
-        return str(self._root) + str(self._quality) + self._quality._figured_bass(0) + "".join(str(modifier) for modifier in self._modifiers) + ("/" + str(self._notes[0]) if self._inversion != 0 else "")
+        return str(self._root) + str(self._quality) + self._quality._figured_bass(0) + "".join(str(modifier) for modifier in self._modifiers) + ("/" + str(self._notes[0]) if self._inversion != 0 or self._bass is not None else "")
     
     def attach(self, new_modifier: Modifier) -> "Chord":
         """
@@ -41,9 +102,7 @@ class Chord:
             Chord: The chord with the modifier added.
         """
 
-        if new_modifier not in self._modifiers:
-            self._modifiers.append(new_modifier)
-        self._modifiers = sorted([modifier for modifier in self._modifiers if new_modifier._compatible_with_mod(modifier)])
+        self._modifiers = self._modifiers.attach(new_modifier)
         self._calculate_notes()
 
         return self
@@ -59,7 +118,9 @@ class Chord:
             Chord: The chord with the modifier removed.
         """
 
-        self._modifiers.remove(modifier)
+        self._modifiers = self._modifiers.detach(modifier)
+        self._calculate_notes()
+
         return self
 
     def with_mod(self, new_modifier: Modifier) -> "Chord":
@@ -73,13 +134,7 @@ class Chord:
             Chord: A new chord with the modifier added.
         """
         
-        new_chord = deepcopy(self)
-        if new_modifier not in new_chord._modifiers:
-            new_chord._modifiers.append(new_modifier)
-        new_chord._modifiers = sorted([modifier for modifier in new_chord._modifiers if new_modifier._compatible_with_mod(modifier)])
-        new_chord._calculate_notes()
-
-        return new_chord            
+        return self._clone().attach(new_modifier)
 
     def without_mod(self, modifier: Modifier) -> "Chord":
         """
@@ -92,10 +147,7 @@ class Chord:
             Chord: The chord with the modifier removed.
         """
 
-        new_chord = deepcopy(self)
-        new_chord._modifiers.remove(modifier)
-
-        return new_chord
+        return self._clone().detach(modifier)
 
     def __irshift__(self, inversions: int) -> "Chord":
         """
@@ -124,11 +176,7 @@ class Chord:
             Chord: A new inverted chord.
         """
 
-        new_chord = deepcopy(self)
-        new_chord._inversion += inversions
-        new_chord._calculate_notes()
-        
-        return new_chord
+        return self._clone().__irshift__(inversions)
     
     def __ilshift__(self, inversions: int) -> "Chord":
         """
@@ -172,7 +220,7 @@ class Chord:
     
     def __eq__(self, other: "Chord") -> bool:
         """
-        Checks for enharmonic equivalence.
+        Checks for enharmonic equivalence: the same pitch classes over the same bass.
 
         Args:
             other (Chord): Chord to compare the current chord to.
@@ -181,7 +229,10 @@ class Chord:
             bool: Whether the two chords are enharmonically equivalent.
         """
 
-        return self._notes == other._notes
+        if not isinstance(other, Chord):
+            return NotImplemented
+
+        return (self._code ^ other._code) & 0xFFFF == 0
     
     def __ne__(self, other: "Chord") -> bool:
         """
@@ -194,11 +245,69 @@ class Chord:
             bool: Whether the two chords are enharmonically inequivalent.
         """
 
-        return self._notes != other._notes
+        if not isinstance(other, Chord):
+            return NotImplemented
+
+        return (self._code ^ other._code) & 0xFFFF != 0
+
+    def __hash__(self) -> int:
+        return self._code & 0xFFFF
+
+    def __contains__(self, note: Note) -> bool:
+        """
+        Checks whether a note is enharmonically in the chord.
+
+        Args:
+            note (Note): Note to look for.
+
+        Returns:
+            bool: Whether the chord has the note's pitch class.
+        """
+
+        return self._code >> int(note) & 1 == 1
+
+    def issubset(self, other: "Chord") -> bool:
+        """
+        Checks whether every pitch class of the chord is in another chord (e.g. Em in Cmaj9).
+
+        Args:
+            other (Chord): Chord that might contain the current chord.
+
+        Returns:
+            bool: Whether the chord's pitch classes are a subset of the other chord's.
+        """
+
+        return self._code & ~other._code & 0xFFF == 0
+
+    def issuperset(self, other: "Chord") -> bool:
+        """
+        Checks whether every pitch class of another chord is in the chord.
+
+        Args:
+            other (Chord): Chord that might be contained in the current chord.
+
+        Returns:
+            bool: Whether the chord's pitch classes are a superset of the other chord's.
+        """
+
+        return other._code & ~self._code & 0xFFF == 0
+
+    def intersection(self, other: "Chord") -> int:
+        """
+        Get the pitch classes shared with another chord.
+
+        Args:
+            other (Chord): Chord to intersect with.
+
+        Returns:
+            int: 12-bit mask of the shared pitch classes, with bit n set for pitch class n (C = 0).
+        """
+
+        return self._code & other._code & 0xFFF
 
     def __idiv__(self, note: Note) -> "Chord":
         """
-        Turns the chord into a slash chord. Does not support adding a nonexistent note for the bass.
+        Turns the chord into a slash chord. Does not support adding a nonexistent note for the bass; use "over" for that.
 
         Args:
             note (Note): Note that will be the bass.
@@ -210,17 +319,19 @@ class Chord:
             ValueError: If "note" doesn't exist in the chord.
         """
 
-        for _ in range(len(self._notes)):
-            if self[0].letter == note.letter and self[0].accidental == note.accidental:
-                return self
-             
-            self >>= 1
-        
-        raise ValueError("note doesn't exist in chord")
+        position = self._positions.get(note._index)
+        if position is None:
+            raise ValueError("note doesn't exist in chord")
+
+        self._bass = None
+        self._inversion = position
+        self._calculate_notes()
+
+        return self
     
     def __truediv__(self, note: Note) -> "Chord":
         """
-        Returns a chord with the specified bass. Does not support adding a nonexistent note for the bass.
+        Returns a chord with the specified bass. Does not support adding a nonexistent note for the bass; use "over" for that.
 
         Args:
             note (Note): Note that will be the bass.
@@ -232,32 +343,79 @@ class Chord:
             ValueError: If "note" doesn't exist in the chord.
         """
         
-        test = deepcopy(self)
+        return self._clone().__idiv__(note)
 
-        for _ in range(len(test._notes)):
-            if test[0].letter == note.letter and test[0].accidental == note.accidental:
-                return test
-             
-            test >>= 1
-        
-        raise ValueError("note doesn't exist in chord")
+    def over(self, note: Note) -> "Chord":
+        """
+        Returns a chord with the specified bass, which doesn't have to be in the chord (e.g. C/F#).
+        A chord tone inverts the chord like "/" does; any other note is added below the chord in root position.
+
+        Args:
+            note (Note): Note that will be the bass.
+
+        Returns:
+            Chord: A chord with the new bass.
+        """
+
+        chord = self._clone()
+
+        position = chord._positions.get(note._index)
+        if position is None:
+            chord._bass = note
+            chord._inversion = 0
+        else:
+            chord._bass = None
+            chord._inversion = position
+
+        chord._calculate_notes()
+
+        return chord
 
     # Calculate the notes for the chord from the root, quality, and modifiers
     def _calculate_notes(self):
-        self._notes = self._quality._build_core(self._root)
+        key = (self._root._index, type(self._quality), self._modifiers._bits, self._inversion, None if self._bass is None else self._bass._index)
+
+        spelling = chord_cache.get(key)
+        if spelling is None:
+            spelling = self._spell()
+            chord_cache.put(key, spelling)
+
+        self._notes, self._inversion, quality, self._positions, mask = spelling
+        if quality is not None:
+            self._quality = quality
+
+        # 12-bit pitch-class mask, then the bass and the root as 4-bit pitch classes
+        self._code = mask | self._notes[0]._int << 12 | self._root._int << 16
+
+    # Spell the chord from scratch, returning the notes, the normalized inversion, the quality to switch to (if any),
+    # the position of each spelled tone in root position (the inversion that puts it in the bass), and the pitch-class mask
+    def _spell(self) -> tuple:
+        notes = self._quality._build_core(self._root)
+        quality = None
 
         # Apply modifiers
-        for i in range(len(self._modifiers)):
-            self._notes = self._modifiers[i]._modify(self._root, self._notes)
+        for modifier in self._modifiers:
+            notes = modifier._modify(self._root, notes)
         
         # Switch back to major if minor with a missing third or if only note (from no3no5 for some reason)
-        if (type(self._quality) == Minor and len(self._notes) >= 2 and nth_letter_from(self._notes[0].letter, 2) != self._notes[1].letter) or (len(self._notes) == 1):
-            self._quality = Major()
+        if (type(self._quality) == Minor and len(notes) >= 2 and nth_letter_from(notes[0].letter, 2) != notes[1].letter) or (len(notes) == 1):
+            quality = _MAJOR
+
+        positions = {}
+        for i, note in enumerate(notes):
+            positions.setdefault(note._index, i)
+
+        # Invert, then put a bass that isn't a chord tone below everything
+        inversion = self._inversion % len(notes)
+        notes = notes[inversion:] + notes[:inversion]
+        if self._bass is not None:
+            notes.insert(0, self._bass)
+
+        mask = 0
+        for note in notes:
+            mask |= 1 << note._int
 
-        # Invert
-        self._inversion %= len(self._notes)
-        for i in range(self._inversion):
-            self._notes.append(self._notes.pop(0))
+        return tuple(notes), inversion, quality, MappingProxyType(positions), mask
     
     @property
     def root(self) -> Note:
@@ -328,6 +486,40 @@ class Chord:
         self._inversion = new_inversion
         self._calculate_notes()
     
+    @property
+    def bass(self) -> Note:
+        """
+        Get the bass of the chord.
+
+        Returns:
+            Note: Lowest note of the chord.
+        """
+
+        return self._notes[0]
+
+    @property
+    def mask(self) -> int:
+        """
+        Get the pitch classes of the chord.
+
+        Returns:
+            int: 12-bit mask with bit n set for pitch class n (C = 0).
+        """
+
+        return self._code & 0xFFF
+
+    @property
+    def code(self) -> int:
+        """
+        Get the chord as an integer that orders and groups chords: the pitch-class mask in bits 0-11,
+        the bass pitch class in bits 12-15 and the root pitch class in bits 16-19.
+
+        Returns:
+            int: Code of the chord.
+        """
+
+        return self._code
+
     @property
     def notes(self) -> str:
         """
@@ -348,7 +540,7 @@ class Chord:
             List[str]: Modifiers on the chord.
         """
 
-        return self._modifiers
+        return list(self._modifiers)
     
     @modifiers.setter
     def modifiers(self, new_modifiers):
@@ -359,5 +551,5 @@ class Chord:
             List[str]: Modifiers on the chord.
         """
 
-        self._modifiers = new_modifiers
+        self._modifiers = ModifierSet(new_modifiers)
         self._calculate_notes()
\ No newline at end of file
@@ -0,0 +1,293 @@
+# Binary corpus files of progressions that are read through mmap without parsing the whole file
+import mmap
+import struct
+import sys
+from array import array
+from typing import Iterator, Tuple
+from .romanchord import RomanChord
+from .progression import Progression
+from .encoding import FIELDS, MODE_CODES, TargetTable, encode, decode, empty_progression
+
+# One Roman chord in the fields of pygression.encoding, little-endian, in 16 bytes
+RECORD = struct.Struct("<BbBBIBbBBI")
+
+# Magic, version, record size, progression count, chord count, position of the index and number of stored targets
+HEADER = struct.Struct("<4sHHQQQQ")
+
+MAGIC = b"PGRC"
+VERSION = 2
+
+# File layout:
+#   header
+#   chord records, starting right after the header
+#   index, 8-byte aligned: offsets (progressions + 1 uint64 chord positions), then modes and relative_to (one byte per progression each)
+#   targets: a record for each entry of the corpus's TargetTable, in order
+
+def pack_chord(chord: RomanChord, targets: TargetTable=None) -> bytes:
+    """
+    Encode a Roman chord as a fixed-width record.
+
+    Args:
+        chord (RomanChord): Roman chord to encode.
+        targets (TargetTable): Table to store targets that don't fit in the record, like in pygression.encoding.encode.
+
+    Returns:
+        bytes: The chord as RECORD.size bytes.
+
+    Raises:
+        ValueError: If the chord's target needs a table and none is given.
+    """
+
+    return RECORD.pack(*encode(chord, targets))
+
+def unpack_chord(data, offset: int=0, targets: TargetTable=None) -> RomanChord:
+    """
+    Decode a Roman chord from a fixed-width record.
+
+    Args:
+        data (bytes-like): Buffer holding the record.
+        offset (int): Position of the record in "data".
+        targets (TargetTable): Table the chord's target was stored in, if it refers to one.
+
+    Returns:
+        RomanChord: The decoded Roman chord.
+
+    Raises:
+        ValueError: If the record doesn't hold a valid chord.
+    """
+
+    return decode(*RECORD.unpack_from(data, offset), targets=targets)
+
+def write_corpus(path: str, progressions) -> int:
+    """
+    Write progressions to a corpus file. The progressions are streamed, so any iterable works.
+
+    Args:
+        path (str): Path of the file to write.
+        progressions (Iterable[Progression]): Progressions to write.
+
+    Returns:
+        int: Number of progressions written.
+    """
+
+    offsets = array("Q", [0])
+    modes = array("B")
+    relative_to = array("B")
+    targets = TargetTable()
+    pack = RECORD.pack
+
+    with open(path, "wb") as file:
+        file.write(bytes(HEADER.size))
+
+        chords = 0
+        for progression in progressions:
+            file.write(b"".join([pack(*encode(chord, targets)) for chord in progression._chords]))
+
+            chords += len(progression._chords)
+            offsets.append(chords)
+            modes.append(MODE_CODES[progression._mode])
+            relative_to.append(MODE_CODES[progression._relative_to])
+
+        end = HEADER.size + chords * RECORD.size
+        index = -(-end // 8) * 8
+        file.write(bytes(index - end))
+
+        if sys.byteorder != "little":
+            offsets.byteswap()
+
+        file.write(offsets.tobytes())
+        file.write(modes.tobytes())
+        file.write(relative_to.tobytes())
+        file.write(b"".join([pack(*fields) for fields in targets]))
+
+        file.seek(0)
+        file.write(HEADER.pack(MAGIC, VERSION, RECORD.size, len(modes), chords, index, len(targets)))
+
+    return len(modes)
+
+class Corpus:
+    """
+    Class that represents a corpus file opened with mmap. Only the header is read when it's opened;
+    progressions are decoded from the mapped records when they're asked for.
+
+    Args:
+        path (str): Path of the corpus file.
+
+    Raises:
+        ValueError: If the file isn't a corpus file of a supported version.
+    """
+
+    def __init__(self, path: str):
+        with open(path, "rb") as file:
+            self._mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        try:
+            magic, version, record_size, count, chords, index, targets = HEADER.unpack_from(self._mmap)
+        except struct.error:
+            self._mmap.close()
+            raise ValueError(f"{path} is not a corpus file")
+
+        if magic != MAGIC or version != VERSION or record_size != RECORD.size:
+            self._mmap.close()
+            raise ValueError(f"{path} is not a corpus file of version {VERSION}")
+
+        self._path = path
+        self._count = count
+        self._chords = chords
+
+        # Zero-copy views of the index sections; big-endian machines read a swapped copy of the offsets
+        view = memoryview(self._mmap)
+        self._offsets = view[index:index + (count + 1) * 8].cast("Q")
+        if sys.byteorder != "little":
+            offsets = array("Q", self._offsets)
+            offsets.byteswap()
+            self._offsets.release()
+            self._offsets = memoryview(offsets)
+
+        self._modes = view[index + (count + 1) * 8:index + (count + 1) * 8 + count]
+        self._relative_to = view[index + (count + 1) * 8 + count:index + (count + 1) * 8 + count * 2]
+        self._view = view
+
+        # Targets are few, so they're read in full
+        start = index + (count + 1) * 8 + count * 2
+        self._targets = TargetTable(RECORD.iter_unpack(self._mmap[start:start + targets * RECORD.size]))
+
+    def __enter__(self) -> "Corpus":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self) -> int:
+        return self._count
+
+    @property
+    def path(self) -> str:
+        """
+        Get the path the corpus was opened from.
+
+        Returns:
+            str: Path of the corpus file.
+        """
+
+        return self._path
+
+    @property
+    def targets(self) -> TargetTable:
+        """
+        Get the targets that the target_ref field of the records refers to.
+
+        Returns:
+            TargetTable: Targets stored in the corpus.
+        """
+
+        return self._targets
+
+    def __getitem__(self, index: int) -> Progression:
+        """
+        Decode the progression at an index. Only that progression's records are read.
+
+        Args:
+            index (int): Index of the progression.
+
+        Returns:
+            Progression: A new progression with the stored chords.
+
+        Raises:
+            IndexError: If "index" is out of range.
+        """
+
+        if index < 0:
+            index += self._count
+
+        if index < 0 or index >= self._count:
+            raise IndexError("progression index out of range")
+
+        progression = empty_progression(self._modes[index], self._relative_to[index])
+        progression._chords = [decode(*record, targets=self._targets) for record in self.records(index)]
+
+        return progression
+
+    def __iter__(self) -> Iterator[Progression]:
+        for index in range(self._count):
+            yield self[index]
+
+    @property
+    def chord_count(self) -> int:
+        """
+        Get the number of chords in the corpus.
+
+        Returns:
+            int: Number of chords across every progression.
+        """
+
+        return self._chords
+
+    def records(self, index: int) -> Iterator[Tuple[int, ...]]:
+        """
+        Get the raw records of a progression without building Roman chords.
+
+        Args:
+            index (int): Index of the progression.
+
+        Returns:
+            Iterator[Tuple[int, ...]]: Fields of each chord, in the order of pygression.encoding.FIELDS. Target references are to "targets".
+        """
+
+        start = HEADER.size + self._offsets[index] * RECORD.size
+        end = HEADER.size + self._offsets[index + 1] * RECORD.size
+
+        return RECORD.iter_unpack(self._view[start:end])
+
+    def arrays(self) -> dict:
+        """
+        Get zero-copy NumPy views of the whole corpus. Requires numpy.
+        The views point into the mapped file, so they must be dropped before the corpus is closed.
+
+        Returns:
+            dict: "records" (structured array of every chord), "offsets", "modes" and "relative_to".
+        """
+
+        import numpy as np
+
+        dtype = np.dtype({
+            "names": list(FIELDS),
+            "formats": ["<u1", "<i1", "<u1", "<u1", "<u4", "<u1", "<i1", "<u1", "<u1", "<u4"],
+            "offsets": [0, 1, 2, 3, 4, 8, 9, 10, 11, 12],
+            "itemsize": RECORD.size,
+        })
+
+        return {
+            "records": np.frombuffer(self._mmap, dtype=dtype, count=self._chords, offset=HEADER.size),
+            "offsets": np.frombuffer(self._offsets, dtype=np.uint64).view(np.int64),
+            "modes": np.frombuffer(self._modes, dtype=np.uint8),
+            "relative_to": np.frombuffer(self._relative_to, dtype=np.uint8),
+        }
+
+    def to_batch(self):
+        """
+        Make a ProgressionBatch whose columns are views of the mapped records. Requires numpy.
+
+        Returns:
+            ProgressionBatch: The corpus as columns.
+        """
+
+        from .batch import ProgressionBatch
+
+        arrays = self.arrays()
+        records = arrays["records"]
+
+        return ProgressionBatch({field: records[field] for field in FIELDS}, arrays["offsets"], arrays["modes"], arrays["relative_to"], self._targets)
+
+    def close(self):
+        """
+        Unmap the file.
+
+        Raises:
+            BufferError: If NumPy views of the corpus are still alive.
+        """
+
+        for view in (self._offsets, self._modes, self._relative_to, self._view):
+            view.release()
+
+        self._mmap.close()
@@ -0,0 +1,184 @@
+# Integer encoding of Roman chords, shared by the columnar, binary and index formats
+from typing import Tuple
+from .roman import Roman
+from .romanchord import RomanChord
+from .progression import Progression
+from .consts import Accidental, Mode
+from .quality.base import _QUALITIES
+from .modifier.base import ModifierSet
+
+# Fields of an encoded Roman chord, in order. A target degree of 0 means the chord isn't an applied chord.
+# A target reference of 0 means the target fields describe the whole target; otherwise it's the target's entry in a TargetTable.
+FIELDS = ("degree", "accidental", "quality", "inversion", "modifiers", "target_degree", "target_accidental", "target_quality", "target_inversion", "target_ref")
+
+# Distinct modes (aliases like MAJ share a code with ION), indexed by code
+MODES = tuple(Mode)
+MODE_CODES = {mode: code for code, mode in enumerate(MODES)}
+
+class TargetTable:
+    """
+    Class that represents the targets of applied chords that the target fields can't hold: targets that are applied chords themselves (V7/V/V)
+    or have modifiers (V7/IVadd9). Each target is stored once, encoded like any chord, and is referred to by its position, starting from 1.
+    Entries only refer to entries before them.
+
+    Args:
+        entries (Iterable[Tuple[int, ...]]): Encoded targets, in order, like the ones of a table that was written out.
+    """
+
+    def __init__(self, entries=()):
+        self._entries = []
+        self._refs = {}
+
+        for fields in entries:
+            self.add(tuple(int(value) for value in fields))
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __iter__(self):
+        return iter(self._entries)
+
+    def __getitem__(self, ref: int) -> Tuple[int, ...]:
+        """
+        Get the encoded target of a reference.
+
+        Args:
+            ref (int): Reference, as stored in the target_ref field.
+
+        Returns:
+            Tuple[int, ...]: Fields of the target.
+
+        Raises:
+            ValueError: If there's no target with that reference.
+        """
+
+        if ref < 1 or ref > len(self._entries):
+            raise ValueError(f"no target with reference {ref}")
+
+        return self._entries[ref - 1]
+
+    def add(self, fields: Tuple[int, ...]) -> int:
+        """
+        Store an encoded target, unless it's stored already.
+
+        Args:
+            fields (Tuple[int, ...]): Fields of the target.
+
+        Returns:
+            int: Reference of the target.
+        """
+
+        ref = self._refs.get(fields)
+        if ref is None:
+            self._entries.append(fields)
+            ref = self._refs[fields] = len(self._entries)
+
+        return ref
+
+    def copy(self) -> "TargetTable":
+        """
+        Copy the table, so that targets can be added to the copy without changing the references of this one.
+
+        Returns:
+            TargetTable: A new table with the same entries.
+        """
+
+        table = TargetTable()
+        table._entries = list(self._entries)
+        table._refs = dict(self._refs)
+
+        return table
+
+def encode(chord: RomanChord, targets: TargetTable=None) -> Tuple[int, ...]:
+    """
+    Encode a Roman chord as a tuple of integers, in the order of FIELDS. The encoding is lossless: decoding gives a chord equal to the original.
+    Applied-chord targets are kept as their numeral, quality and inversion. Targets that are applied chords themselves (V7/V/V)
+    or have modifiers (V7/IVadd9) are stored in a TargetTable as well, and the chord refers to them.
+
+    Args:
+        chord (RomanChord): Roman chord to encode.
+        targets (TargetTable): Table to store targets that don't fit in the target fields.
+
+    Returns:
+        Tuple[int, ...]: Degree, accidental, quality id, inversion, modifier bitmask, then the target's degree, accidental, quality id,
+            inversion and reference.
+
+    Raises:
+        ValueError: If the chord's target has a target or modifiers of its own and no table is given.
+    """
+
+    target = chord._target
+    if target is None:
+        return (chord._roman._degree, chord._roman._accidental.value, chord._quality._id, chord._inversion, chord._modifiers._bits, 0, 0, 0, 0, 0)
+
+    ref = 0
+    if target._target is not None or target._modifiers._bits:
+        if targets is None:
+            raise ValueError(f"cannot encode {chord} without a target table: its target has a target or modifiers of its own")
+
+        ref = targets.add(encode(target, targets))
+
+    return (
+        chord._roman._degree, chord._roman._accidental.value, chord._quality._id, chord._inversion, chord._modifiers._bits,
+        target._roman._degree, target._roman._accidental.value, target._quality._id, target._inversion, ref,
+    )
+
+def decode(degree: int, accidental: int, quality: int, inversion: int, modifiers: int, target_degree: int=0, target_accidental: int=0, target_quality: int=0, target_inversion: int=0, target_ref: int=0, targets: TargetTable=None) -> RomanChord:
+    """
+    Decode a Roman chord from the integers made by "encode".
+
+    Args:
+        targets (TargetTable): Table the chord's target was stored in, if it has a reference.
+
+    Returns:
+        RomanChord: The decoded Roman chord.
+
+    Raises:
+        ValueError: If a field is out of range, or the chord refers to a target without a table.
+    """
+
+    chord = RomanChord(Roman(int(degree), Accidental(int(accidental))), _QUALITIES[quality])
+    chord._inversion = int(inversion)
+    chord._modifiers = ModifierSet._from_bits(int(modifiers))
+
+    if target_ref:
+        if targets is None:
+            raise ValueError(f"cannot decode target reference {target_ref} without a target table")
+
+        chord._target = decode(*targets[int(target_ref)], targets=targets)
+    elif target_degree:
+        chord._target = RomanChord(Roman(int(target_degree), Accidental(int(target_accidental))), _QUALITIES[target_quality])
+        chord._target._inversion = int(target_inversion)
+
+    return chord
+
+def root_of(fields: Tuple[int, ...], scale: Tuple[int, ...]) -> Tuple[int, int]:
+    """
+    Find where the root of an encoded chord lies above the tonic, following its target like Progression.chords_in.
+
+    Args:
+        fields (Tuple[int, ...]): Encoded chord, as made by "encode".
+        scale (Tuple[int, ...]): Semitones of each degree of the mode the chord is read with respect to.
+
+    Returns:
+        Tuple[int, int]: Letters (0-6) and semitones (0-11) of the root above the tonic.
+    """
+
+    degree, accidental, target_degree, target_accidental = fields[0], fields[1], fields[5], fields[6]
+    letters = (degree - 1 + (target_degree - 1 if target_degree else 0)) % 7
+
+    return letters, (scale[letters] + accidental + target_accidental) % 12
+
+def empty_progression(mode_code: int, relative_code: int) -> Progression:
+    """
+    Make an empty progression from encoded modes.
+
+    Args:
+        mode_code (int): Code of the progression's mode in MODES.
+        relative_code (int): Code of the mode the progression is read with respect to.
+
+    Returns:
+        Progression: A progression without chords.
+    """
+
+    return Progression([], mode=MODES[mode_code], relative_to=MODES[relative_code])
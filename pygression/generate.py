@@ -0,0 +1,299 @@
+# Order-k Markov models of Roman chord progressions, trained in one streaming pass and sampled in batches. Requires numpy.
+from typing import List
+import numpy as np
+from .romanchord import RomanChord
+from .consts import Mode
+from .encoding import FIELDS, MODE_CODES, TargetTable, encode, decode
+from .batch import ProgressionBatch, _DTYPES
+
+# Token that pads the context before the first chord, so openings are learned too
+_START = 0
+
+class _Table:
+    # Transitions of one order in CSR form: sorted context keys, the start of each context's entries in "tokens" and "counts",
+    # and the next tokens with how often they followed the context
+    def __init__(self, keys: np.ndarray, starts: np.ndarray, tokens: np.ndarray, counts: np.ndarray):
+        self.keys = keys
+        self.starts = starts
+        self.tokens = tokens
+        self.counts = counts
+        self._cumulative = {}
+
+    # Only the entries whose next token is allowed; contexts left without entries are dropped, so sampling backs off past them
+    def restricted(self, allowed: np.ndarray) -> "_Table":
+        keep = np.isin(self.tokens, allowed)
+        sizes = np.bincount(np.repeat(np.arange(len(self.keys)), np.diff(self.starts))[keep], minlength=len(self.keys))
+        nonempty = sizes > 0
+
+        starts = np.zeros(np.count_nonzero(nonempty) + 1, dtype=np.int64)
+        np.cumsum(sizes[nonempty], out=starts[1:])
+
+        return _Table(self.keys[nonempty], starts, self.tokens[keep], self.counts[keep])
+
+    # Running total of the weights of every entry at a temperature. Counts are scaled by their context's largest count first,
+    # so the weights of every context are between 0 and 1 and the totals stay exact enough to sample from.
+    def cumulative(self, temperature: float) -> np.ndarray:
+        found = self._cumulative.get(temperature)
+        if found is None:
+            largest = np.maximum.reduceat(self.counts, self.starts[:-1]) if len(self.keys) else self.counts
+            weights = (self.counts / np.repeat(largest, np.diff(self.starts))) ** (1 / temperature)
+            found = self._cumulative[temperature] = np.cumsum(weights)
+
+        return found
+
+class MarkovModel:
+    """
+    Class that represents an order-k Markov model of progressions: how often each chord follows each sequence of k chords.
+    Chords are tokens of their pygression.encoding fields. Training only keeps the counts, so memory grows with the number of
+    distinct transitions, not with the corpus. The counts are turned into sorted, sparse tables the first time the model is sampled.
+    Sampling backs off to shorter contexts when a context was never seen.
+
+    Args:
+        order (int): Chords of context.
+
+    Raises:
+        ValueError: If "order" is less than 1.
+    """
+
+    def __init__(self, order: int=2):
+        if order < 1:
+            raise ValueError("order must be at least 1")
+
+        self._order = order
+
+        # Encoded fields of every token, indexed by token id, and the targets they refer to; id 0 is the start of a progression
+        self._fields = [None]
+        self._ids = {}
+        self._targets = TargetTable()
+
+        # How often each token followed each context of every length from 0 to "order", keyed on (*context, token)
+        self._counts = [{} for _ in range(order + 1)]
+        self._tables = None
+        self._restricted = {}
+
+    def __len__(self) -> int:
+        return len(self._fields) - 1
+
+    @property
+    def order(self) -> int:
+        """
+        Get the number of chords of context.
+
+        Returns:
+            int: Order of the model.
+        """
+
+        return self._order
+
+    def _token(self, chord: RomanChord) -> int:
+        fields = encode(chord, self._targets)
+        token = self._ids.get(fields)
+        if token is None:
+            token = self._ids[fields] = len(self._fields)
+            self._fields.append(fields)
+
+        return token
+
+    def train(self, progressions) -> int:
+        """
+        Count the transitions of progressions, one progression at a time. Training again adds to the counts.
+        Progressions should be read with respect to the same mode, since chords are counted by their numerals.
+
+        Args:
+            progressions (Iterable[Progression]): Progressions to learn from, e.g. a Corpus.
+
+        Returns:
+            int: Number of progressions counted.
+        """
+
+        order = self._order
+        counts = self._counts
+        trained = 0
+
+        for progression in progressions:
+            tokens = [_START] * order + [self._token(chord) for chord in progression._chords]
+
+            for i in range(order, len(tokens)):
+                for length in range(order + 1):
+                    key = tuple(tokens[i - length:i + 1])
+                    counts[length][key] = counts[length].get(key, 0) + 1
+
+            trained += 1
+
+        if trained:
+            self._tables = None
+            self._restricted = {}
+
+        return trained
+
+    # Pack contexts shaped (rows, length) into one integer each, in base (tokens + 1)
+    def _keys(self, contexts: np.ndarray) -> np.ndarray:
+        keys = np.zeros(len(contexts), dtype=np.int64)
+        for column in contexts.T:
+            keys = keys * len(self._fields) + column
+
+        return keys
+
+    def _build(self) -> List[_Table]:
+        if len(self._fields) ** self._order >= 1 << 63:
+            raise ValueError("too many distinct chords for contexts of this order")
+
+        tables = []
+        for length, counts in enumerate(self._counts):
+            entries = np.array(list(counts), dtype=np.int64).reshape(-1, length + 1)
+            keys = self._keys(entries[:, :-1])
+            order = np.lexsort((entries[:, -1], keys))
+
+            keys = keys[order]
+            distinct, starts = np.unique(keys, return_index=True)
+
+            tables.append(_Table(
+                distinct, np.append(starts, len(keys)).astype(np.int64),
+                entries[order, -1], np.fromiter(counts.values(), dtype=np.float64, count=len(counts))[order],
+            ))
+
+        return tables
+
+    def _tables_for(self, allowed) -> List[_Table]:
+        if self._tables is None:
+            if not self._counts[0]:
+                raise ValueError("the model hasn't been trained")
+
+            self._tables = self._build()
+
+        if allowed is None:
+            return self._tables
+
+        tables = self._restricted.get(allowed)
+        if tables is None:
+            tables = self._restricted[allowed] = [table.restricted(np.array(allowed)) for table in self._tables]
+
+        return tables
+
+    # Token ids of chords, which must have been seen in training
+    def _known(self, chords) -> tuple:
+        if isinstance(chords, RomanChord):
+            chords = [chords]
+
+        tokens = []
+        for chord in chords:
+            token = self._ids.get(encode(chord, self._targets))
+            if token is None:
+                raise ValueError(f"{chord} never appears in the training progressions")
+
+            tokens.append(token)
+
+        return tuple(tokens)
+
+    # Draw the next token of every row from the longest context seen in training
+    def _draw(self, tables: List[_Table], contexts: np.ndarray, temperature: float, rng: np.random.Generator) -> np.ndarray:
+        tokens = np.empty(len(contexts), dtype=np.int64)
+        pending = np.arange(len(contexts))
+
+        for length in range(self._order, -1, -1):
+            if not len(pending):
+                break
+
+            table = tables[length]
+            keys = self._keys(contexts[pending, self._order - length:])
+            rows = np.minimum(np.searchsorted(table.keys, keys), max(len(table.keys) - 1, 0))
+            found = table.keys[rows] == keys if len(table.keys) else np.zeros(len(keys), dtype=bool)
+
+            rows = rows[found]
+            cumulative = table.cumulative(temperature)
+            low = np.where(table.starts[rows] > 0, cumulative[table.starts[rows] - 1], 0)
+            high = cumulative[table.starts[rows + 1] - 1]
+
+            entries = np.searchsorted(cumulative, low + rng.random(len(rows)) * (high - low), side="right")
+            tokens[pending[found]] = table.tokens[np.minimum(entries, table.starts[rows + 1] - 1)]
+
+            pending = pending[~found]
+
+        if len(pending):
+            raise ValueError("no chord seen in training satisfies the constraints")
+
+        return tokens
+
+    def sample(self, count: int, length: int, seed: int=None, temperature: float=1.0, start=None, end=None) -> np.ndarray:
+        """
+        Sample many progressions at once as token ids. Every step draws the next chord of every progression in one vectorized pass.
+
+        Args:
+            count (int): Number of progressions.
+            length (int): Chords in each progression.
+            seed (int): Seed of the random generator, so that samples can be repeated.
+            temperature (float): Sharpness of the distribution: below 1 favors common transitions, above 1 evens them out.
+            start (Iterable[RomanChord]): Chords every progression opens with.
+            end (RomanChord, Iterable[RomanChord]): Chord, or chords, that every progression must end on (e.g. I).
+
+        Returns:
+            numpy.ndarray: Token ids shaped (count, length); "chord" decodes them.
+
+        Raises:
+            ValueError: If "length" is less than 1, "temperature" isn't positive, the constraints don't fit in "length", a constrained chord never
+                appears in training, or the model hasn't been trained.
+        """
+
+        if length < 1:
+            raise ValueError("length must be at least 1")
+
+        if temperature <= 0:
+            raise ValueError("temperature must be positive")
+
+        start = () if start is None else self._known(start)
+        end = None if end is None else tuple(sorted(set(self._known(end))))
+        if len(start) + (end is not None) > length:
+            raise ValueError("start and end don't fit in the length")
+
+        tables = self._tables_for(None)
+        rng = np.random.default_rng(seed)
+
+        tokens = np.empty((count, self._order + length), dtype=np.int64)
+        tokens[:, :self._order] = _START
+        tokens[:, self._order:self._order + len(start)] = start
+
+        for i in range(self._order + len(start), self._order + length):
+            last = i == self._order + length - 1 and end is not None
+            tokens[:, i] = self._draw(self._tables_for(end) if last else tables, tokens[:, i - self._order:i], temperature, rng)
+
+        return tokens[:, self._order:]
+
+    def chord(self, token: int) -> RomanChord:
+        """
+        Decode a token id.
+
+        Args:
+            token (int): Token id, as returned by "sample".
+
+        Returns:
+            RomanChord: A new Roman chord.
+        """
+
+        return decode(*self._fields[token], targets=self._targets)
+
+    def generate(self, count: int, length: int, seed: int=None, temperature: float=1.0, start=None, end=None, mode: Mode=Mode.ION, relative_to: Mode=Mode.ION) -> ProgressionBatch:
+        """
+        Sample many progressions at once, like "sample", as a ProgressionBatch whose columns are gathered from the token fields.
+
+        Args:
+            count (int): Number of progressions.
+            length (int): Chords in each progression.
+            seed (int): Seed of the random generator.
+            temperature (float): Sharpness of the distribution.
+            start (Iterable[RomanChord]): Chords every progression opens with.
+            end (RomanChord, Iterable[RomanChord]): Chord, or chords, that every progression must end on.
+            mode (Mode): Mode of the progressions.
+            relative_to (Mode): Mode that the numerals are read with respect to, which should be the one the model was trained on.
+
+        Returns:
+            ProgressionBatch: The sampled progressions.
+        """
+
+        tokens = self.sample(count, length, seed=seed, temperature=temperature, start=start, end=end).ravel()
+        fields = np.array([(0,) * len(FIELDS)] + self._fields[1:], dtype=np.int64)
+
+        return ProgressionBatch(
+            {field: fields[tokens, i].astype(dtype) for i, (field, dtype) in enumerate(zip(FIELDS, _DTYPES))},
+            np.arange(0, count * length + 1, length, dtype=np.int64),
+            np.full(count, MODE_CODES[mode], dtype=np.uint8), np.full(count, MODE_CODES[relative_to], dtype=np.uint8), self._targets,
+        )
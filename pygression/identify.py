@@ -0,0 +1,211 @@
+# Reverse lookup from pitch-class sets to the chords that spell them
+from itertools import combinations
+from typing import List
+from .note import Note
+from .chord import Chord
+from .consts import Letter, Accidental
+from .quality.base import _QUALITIES
+from .modifier.base import _MODIFIERS, ModifierSet
+from .utils import rotate_mask
+
+# Most modifiers a candidate chord can have
+MAX_MODIFIERS = 2
+
+# Spellings tried for a root on each pitch class, in order of preference
+_ROOTS = tuple(tuple(Note(letter, accidental) for letter, accidental in spellings) for spellings in (
+    ((Letter.C, Accidental.NATURAL), (Letter.B, Accidental.SHARP)),
+    ((Letter.D, Accidental.FLAT), (Letter.C, Accidental.SHARP)),
+    ((Letter.D, Accidental.NATURAL),),
+    ((Letter.E, Accidental.FLAT), (Letter.D, Accidental.SHARP)),
+    ((Letter.E, Accidental.NATURAL), (Letter.F, Accidental.FLAT)),
+    ((Letter.F, Accidental.NATURAL), (Letter.E, Accidental.SHARP)),
+    ((Letter.F, Accidental.SHARP), (Letter.G, Accidental.FLAT)),
+    ((Letter.G, Accidental.NATURAL),),
+    ((Letter.A, Accidental.FLAT), (Letter.G, Accidental.SHARP)),
+    ((Letter.A, Accidental.NATURAL),),
+    ((Letter.B, Accidental.FLAT), (Letter.A, Accidental.SHARP)),
+    ((Letter.B, Accidental.NATURAL), (Letter.C, Accidental.FLAT)),
+))
+
+# Candidates of every pitch-class mask, as (root, intervals, quality, modifiers), built on first use
+_CANDIDATES = []
+
+# Ranked chords of every pitch-class mask, filled in the first time the mask is looked up: one tuple of chords
+# for each bass pitch class (empty when the bass isn't in the mask), then one for root position
+_TABLE = [None] * 4096
+
+# Spellings that are never the first choice for a pitch class: E#, B#, Fb, Cb and double accidentals
+_AWKWARD = frozenset(
+    Note(letter, accidental)._index for letter in Letter for accidental in Accidental
+    if abs(accidental.value) == 2 or (letter, accidental) in ((Letter.E, Accidental.SHARP), (Letter.B, Accidental.SHARP), (Letter.F, Accidental.FLAT), (Letter.C, Accidental.FLAT))
+)
+
+# Every chord shape on C that the qualities and up to MAX_MODIFIERS compatible modifiers make, as
+# (mask, intervals of the tones in root position, quality, modifiers)
+def _shapes() -> list:
+    shapes = {}
+    c = Note(Letter.C)
+
+    for quality in _QUALITIES:
+        for count in range(MAX_MODIFIERS + 1):
+            for modifiers in combinations(_MODIFIERS, count):
+                if not all(modifier._compatible_with_quality(quality) for modifier in modifiers):
+                    continue
+
+                bits = ModifierSet()
+                for modifier in modifiers:
+                    bits = bits.attach(modifier)
+
+                # Incompatible modifiers drop each other, which would repeat a smaller set
+                if len(bits) != count:
+                    continue
+
+                chord = Chord._realize(c, quality, bits)
+
+                # Shapes that double a pitch class (e.g. a #9 on a minor chord) are never how a set of pitches is named
+                if len({note._int for note in chord._notes}) != len(chord._notes):
+                    continue
+
+                # Some modifiers switch the quality (e.g. a minor chord without its third), so shapes are keyed on the result
+                shapes.setdefault((type(chord._quality), bits._bits), (chord.mask, tuple(note._int for note in chord._notes), chord._quality, bits))
+
+    return list(shapes.values())
+
+def _build():
+    candidates = [[] for _ in range(4096)]
+
+    for mask, intervals, quality, modifiers in _shapes():
+        for root in range(12):
+            candidates[rotate_mask(mask, root)].append((len(modifiers), quality._id, root, intervals, quality, modifiers))
+
+    _CANDIDATES[:] = [tuple(candidate[2:] for candidate in sorted(found, key=lambda candidate: candidate[:3])) for found in candidates]
+
+def candidates(mask: int) -> tuple:
+    """
+    Get every chord that has exactly the pitch classes of a mask, fewest modifiers first, then in registry order of quality.
+    The candidates of all 4096 masks are worked out the first time they're needed.
+
+    Args:
+        mask (int): 12-bit mask with bit n set for pitch class n (C = 0).
+
+    Returns:
+        tuple: Root pitch class, intervals of the tones above the root, quality and modifiers of each candidate.
+    """
+
+    if not _CANDIDATES:
+        _build()
+
+    return _CANDIDATES[mask & 0xFFF]
+
+# Realize a candidate over a bass, trying each spelling of the root
+def _realize(root: int, intervals: tuple, quality, modifiers: ModifierSet, bass: int) -> Chord:
+    inversion = intervals.index((bass - root) % 12)
+
+    for note in _ROOTS[root]:
+        try:
+            return Chord._realize(note, quality, modifiers, inversion)
+        except ValueError:
+            continue
+
+    return None
+
+# Realize and rank every candidate of a mask over each possible bass: fewest awkward spellings, then fewest modifiers,
+# then root in the bass, then simplest quality
+def _rank(mask: int) -> tuple:
+    ranked = [[] for _ in range(13)]
+
+    for root, intervals, quality, modifiers in candidates(mask):
+        for bass in {(root + interval) % 12 for interval in intervals}:
+            chord = _realize(root, intervals, quality, modifiers, bass)
+            if chord is None:
+                continue
+
+            awkward = sum(note._index in _AWKWARD for note in chord._notes)
+            ranked[bass].append(((awkward, len(modifiers), root != bass, quality._id, root), chord))
+
+            if root == bass:
+                ranked[12].append(((awkward, len(modifiers), quality._id, root), chord))
+
+    return tuple(tuple(chord for _, chord in sorted(found, key=lambda item: item[0])) for found in ranked)
+
+# Ranked chords of a mask over a bass (None for root position)
+def _lookup(mask: int, bass: int=None) -> tuple:
+    mask &= 0xFFF
+
+    ranked = _TABLE[mask]
+    if ranked is None:
+        ranked = _TABLE[mask] = _rank(mask)
+
+    return ranked[12 if bass is None else bass % 12]
+
+def identify_mask(mask: int, bass: int=None, limit: int=None) -> List[Chord]:
+    """
+    Name the chords that have exactly the pitch classes of a mask. Each mask's chords are realized and ranked the first time
+    it's looked up, so later lookups only copy them out.
+
+    Args:
+        mask (int): 12-bit mask with bit n set for pitch class n (C = 0).
+        bass (int): Pitch class of the bass. Chords in root position are given when it's left out.
+        limit (int): Most chords to return.
+
+    Returns:
+        List[Chord]: Matching chords, best first: fewest awkward spellings (like B# or Fb), then fewest modifiers,
+            then root in the bass, then simplest quality.
+    """
+
+    return [chord._clone() for chord in _lookup(mask, bass)[:limit]]
+
+def identify(pitches, limit: int=None) -> List[Chord]:
+    """
+    Name the chords made by a set of pitches, e.g. MIDI note numbers. The lowest pitch is the bass.
+
+    Args:
+        pitches (Iterable[int]): Pitches, in semitones with C at multiples of 12.
+        limit (int): Most chords to return.
+
+    Returns:
+        List[Chord]: Matching chords, best first, ranked like "identify_mask".
+
+    Raises:
+        ValueError: If "pitches" is empty.
+    """
+
+    pitches = list(pitches)
+    if not pitches:
+        raise ValueError("pitches must not be empty")
+
+    mask = 0
+    for pitch in pitches:
+        mask |= 1 << pitch % 12
+
+    return identify_mask(mask, bass=min(pitches) % 12, limit=limit)
+
+def identify_many(pitch_sets, limit: int=1) -> List[List[Chord]]:
+    """
+    Name the chords of many sets of pitches. Sets with the same pitch classes share their ranked chords, so each is only realized once.
+
+    Args:
+        pitch_sets (Iterable[Iterable[int]]): Sets of pitches, e.g. MIDI note numbers; the lowest pitch of each is the bass.
+        limit (int): Most chords to return for each set. None returns every candidate.
+
+    Returns:
+        List[List[Chord]]: Matching chords of each set, best first.
+
+    Raises:
+        ValueError: If a set is empty.
+    """
+
+    results = []
+
+    for pitches in pitch_sets:
+        pitches = list(pitches)
+        if not pitches:
+            raise ValueError("pitches must not be empty")
+
+        mask = 0
+        for pitch in pitches:
+            mask |= 1 << pitch % 12
+
+        results.append(identify_mask(mask, bass=min(pitches), limit=limit))
+
+    return results
@@ -0,0 +1,370 @@
+# Inverted index of chord n-grams over a corpus of progressions
+import mmap
+import os
+import struct
+import sys
+from array import array
+from bisect import bisect_left, bisect_right
+from typing import List, Tuple
+from .progression import Progression
+from .consts import Mode
+from .corpus import RECORD
+from .encoding import TargetTable, encode, root_of
+
+# Magic, version, gram length, progression count, chord count, the key count of the exact and transposed postings,
+# then the number of stored targets
+_HEADER = struct.Struct("<4sHHQQQQQ")
+_MAGIC = b"PGIX"
+_VERSION = 2
+
+_MASK = (1 << 64) - 1
+_FNV_OFFSET = 0xCBF29CE484222325
+_FNV_PRIME = 0x100000001B3
+
+# Pack the fields of pygression.encoding into one integer; signed accidentals are offset to stay positive.
+# The shape leaves out the numeral, so it's the same for a chord on any degree. The target reference is kept beside the token.
+def _token(fields: tuple) -> int:
+    degree, accidental, quality, inversion, modifiers, target_degree, target_accidental, target_quality, target_inversion, _ = fields
+    return (_shape(fields) | degree << 40 | (accidental + 2) << 43 | target_degree << 46 | (target_accidental + 2) << 49
+            | target_quality << 52 | target_inversion << 56)
+
+def _shape(fields: tuple) -> int:
+    return fields[2] | fields[3] << 8 | fields[4] << 12
+
+# FNV-1a over the chords of a gram. Transposed grams hash each chord's shape with the root motion into it.
+def _exact_key(tokens, position: int, length: int) -> int:
+    key = _FNV_OFFSET ^ length
+    for token in tokens[position:position + length]:
+        key = ((key ^ token) * _FNV_PRIME) & _MASK
+
+    return key
+
+def _transposed_key(shapes, pitches, position: int, length: int) -> int:
+    key = _FNV_OFFSET ^ length ^ 1 << 63
+    for i in range(position, position + length):
+        motion = 0 if i == position else (pitches[i] - pitches[i - 1]) % 12
+        key = ((key ^ shapes[i] ^ motion << 48) * _FNV_PRIME) & _MASK
+
+    return key
+
+class _Postings:
+    # Positions of every gram, keyed on the gram's hash. Postings loaded from disk stay mapped as sorted
+    # keys, starts and positions; postings added afterwards are kept in a dict on top of them.
+    def __init__(self, keys=None, starts=None, positions=None):
+        self._keys = keys if keys is not None else array("Q")
+        self._starts = starts if starts is not None else array("Q", [0])
+        self._positions = positions if positions is not None else array("Q")
+        self._added = {}
+
+    def add(self, key: int, position: int):
+        positions = self._added.get(key)
+        if positions is None:
+            positions = self._added[key] = array("Q")
+
+        positions.append(position)
+
+    def get(self, key: int):
+        found = ()
+
+        i = bisect_left(self._keys, key)
+        if i < len(self._keys) and self._keys[i] == key:
+            found = self._positions[self._starts[i]:self._starts[i + 1]]
+
+        added = self._added.get(key)
+        if added is None:
+            return found
+
+        return list(found) + list(added)
+
+    def count(self, key: int) -> int:
+        count = len(self._added.get(key, ()))
+
+        i = bisect_left(self._keys, key)
+        if i < len(self._keys) and self._keys[i] == key:
+            count += self._starts[i + 1] - self._starts[i]
+
+        return count
+
+    # Sorted keys, starts and positions of every posting, merging the loaded ones with the added ones
+    def merged(self) -> Tuple[array, array, array]:
+        keys = sorted(set(self._keys) | set(self._added))
+        starts = array("Q", [0])
+        positions = array("Q")
+
+        for key in keys:
+            positions.extend(self.get(key))
+            starts.append(len(positions))
+
+        return array("Q", keys), starts, positions
+
+class ProgressionIndex:
+    """
+    Class that represents an inverted index of the chord n-grams of many progressions, for finding the progressions
+    that contain a sequence of chords. Every gram of 1 to "n" chords is indexed, both exactly and up to transposition
+    (the same chord shapes with the same root motion, starting on any degree). Candidates are checked against the
+    stored chords, so hits are exact. Targets that don't fit in a token are stored in the index's own TargetTable.
+
+    Args:
+        n (int): Longest gram indexed. Longer patterns are looked up by their rarest gram.
+
+    Raises:
+        ValueError: If "n" is less than 1.
+    """
+
+    def __init__(self, n: int=3):
+        if n < 1:
+            raise ValueError("n must be at least 1")
+
+        self._n = n
+
+        # Chords of every progression laid end to end; progression i owns chords offsets[i] to offsets[i + 1]
+        self._offsets = array("Q", [0])
+        self._tokens = array("Q")
+        self._refs = array("Q")
+        self._shapes = array("Q")
+        self._pitches = array("B")
+        self._targets = TargetTable()
+
+        self._exact = _Postings()
+        self._transposed = _Postings()
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    @property
+    def n(self) -> int:
+        """
+        Get the longest gram indexed.
+
+        Returns:
+            int: Gram length.
+        """
+
+        return self._n
+
+    def add(self, progression: Progression) -> int:
+        """
+        Index a progression.
+
+        Args:
+            progression (Progression): Progression to index.
+
+        Returns:
+            int: Id of the progression, which is the number of progressions added before it.
+        """
+
+        scale = progression._relative_to.value
+        start = len(self._tokens)
+
+        for chord in progression._chords:
+            fields = encode(chord, self._targets)
+            self._tokens.append(_token(fields))
+            self._refs.append(fields[9])
+            self._shapes.append(_shape(fields))
+            self._pitches.append(root_of(fields, scale)[1])
+
+        end = len(self._tokens)
+        for position in range(start, end):
+            for length in range(1, min(self._n, end - position) + 1):
+                self._exact.add(_exact_key(self._tokens, position, length), position)
+                self._transposed.add(_transposed_key(self._shapes, self._pitches, position, length), position)
+
+        self._offsets.append(end)
+
+        return len(self._offsets) - 2
+
+    def extend(self, progressions):
+        """
+        Index several progressions, in order.
+
+        Args:
+            progressions (Iterable[Progression]): Progressions to index.
+        """
+
+        for progression in progressions:
+            self.add(progression)
+
+    # Tokens, target references, shapes and root motion of a pattern, encoded the same way as stored chords. Targets that aren't
+    # stored yet go in a copy of the table, so their references match nothing and looking them up doesn't change the index.
+    def _pattern(self, pattern) -> Tuple[list, list, list, list]:
+        if isinstance(pattern, str):
+            from .parse import parse_progression
+            pattern = parse_progression(pattern)
+
+        if isinstance(pattern, Progression):
+            scale = pattern._relative_to.value
+            chords = pattern._chords
+        else:
+            scale = Mode.ION.value
+            chords = list(pattern)
+
+        targets = self._targets.copy()
+        fields = [encode(chord, targets) for chord in chords]
+        return [_token(f) for f in fields], [f[9] for f in fields], [_shape(f) for f in fields], [root_of(f, scale)[1] for f in fields]
+
+    def find(self, pattern, transpose: bool=False) -> List[Tuple[int, int]]:
+        """
+        Find every occurrence of a sequence of chords.
+
+        Args:
+            pattern (Progression, List[RomanChord], str): Chords to look for; a string is parsed like Progression.parse.
+                Lists of Roman chords and strings are read with respect to major.
+            transpose (bool): Whether the sequence may start on any degree, as long as the chord shapes and root motion match.
+
+        Returns:
+            List[Tuple[int, int]]: Progression id and chord position of every occurrence, in order.
+
+        Raises:
+            ValueError: If "pattern" is empty.
+        """
+
+        tokens, refs, shapes, pitches = self._pattern(pattern)
+        if not tokens:
+            raise ValueError("pattern must have at least one chord")
+
+        postings = self._transposed if transpose else self._exact
+        gram = min(len(tokens), self._n)
+        keys = [
+            (_transposed_key(shapes, pitches, j, gram) if transpose else _exact_key(tokens, j, gram), j)
+            for j in range(len(tokens) - gram + 1)
+        ]
+
+        # Look up the rarest gram, then check the rest of the pattern around each of its positions
+        key, shift = min(keys, key=lambda item: postings.count(item[0]))
+
+        hits = []
+        for position in postings.get(key):
+            start = position - shift
+            progression = bisect_right(self._offsets, position) - 1
+
+            if start < self._offsets[progression] or start + len(tokens) > self._offsets[progression + 1]:
+                continue
+
+            if self._matches(start, tokens, refs, shapes, pitches, transpose):
+                hits.append((progression, start - self._offsets[progression]))
+
+        hits.sort()
+        return hits
+
+    def _matches(self, start: int, tokens: list, refs: list, shapes: list, pitches: list, transpose: bool) -> bool:
+        if not transpose:
+            return list(self._tokens[start:start + len(tokens)]) == tokens and list(self._refs[start:start + len(refs)]) == refs
+
+        if list(self._shapes[start:start + len(shapes)]) != shapes:
+            return False
+
+        offset = self._pitches[start] - pitches[0]
+        return all((self._pitches[start + i] - pitch - offset) % 12 == 0 for i, pitch in enumerate(pitches))
+
+    def contains(self, pattern, transpose: bool=False) -> List[int]:
+        """
+        Find the progressions that contain a sequence of chords.
+
+        Args:
+            pattern (Progression, List[RomanChord], str): Chords to look for, like in "find".
+            transpose (bool): Whether the sequence may start on any degree.
+
+        Returns:
+            List[int]: Ids of the progressions with at least one occurrence, in order.
+        """
+
+        return sorted({progression for progression, _ in self.find(pattern, transpose=transpose)})
+
+    def save(self, path: str):
+        """
+        Write the index to a file. The file is replaced atomically, so an index loaded from the same path keeps working.
+
+        Args:
+            path (str): Path of the file to write.
+        """
+
+        exact = self._exact.merged()
+        transposed = self._transposed.merged()
+
+        sections = [self._offsets, self._tokens, self._refs, self._shapes, *exact, *transposed]
+        if sys.byteorder != "little":
+            sections = [array("Q", section) for section in sections]
+            for section in sections:
+                section.byteswap()
+
+        temporary = path + ".tmp"
+        with open(temporary, "wb") as file:
+            file.write(_HEADER.pack(
+                _MAGIC, _VERSION, self._n, len(self), len(self._tokens), len(exact[0]), len(transposed[0]), len(self._targets),
+            ))
+
+            for section in sections:
+                file.write(section.tobytes())
+
+            file.write(self._pitches.tobytes())
+            file.write(b"".join([RECORD.pack(*fields) for fields in self._targets]))
+
+        os.replace(temporary, path)
+
+    @classmethod
+    def load(cls, path: str) -> "ProgressionIndex":
+        """
+        Read an index written by "save". The postings stay in the mapped file and are searched in place;
+        progressions added afterwards are indexed in memory on top of them.
+
+        Args:
+            path (str): Path of the file to read.
+
+        Returns:
+            ProgressionIndex: The loaded index.
+
+        Raises:
+            ValueError: If the file isn't an index file of a supported version.
+        """
+
+        with open(path, "rb") as file:
+            mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, n, count, chords, exact_keys, transposed_keys, targets = _HEADER.unpack_from(mapped)
+        if magic != _MAGIC or version != _VERSION:
+            mapped.close()
+            raise ValueError(f"{path} is not an index file of version {_VERSION}")
+
+        view = memoryview(mapped)
+        position = _HEADER.size
+
+        def section(length: int):
+            nonlocal position
+            values = view[position:position + length * 8]
+            position += length * 8
+
+            if sys.byteorder != "little":
+                values = array("Q", values.tobytes())
+                values.byteswap()
+                return values
+
+            return values.cast("Q")
+
+        # Chords are copied so that more progressions can be added to them
+        def copied(length: int) -> array:
+            values = array("Q")
+            values.frombytes(memoryview(section(length)).cast("B"))
+
+            return values
+
+        index = cls.__new__(cls)
+        index._n = n
+        index._offsets = copied(count + 1)
+        index._tokens = copied(chords)
+        index._refs = copied(chords)
+        index._shapes = copied(chords)
+
+        keys = section(exact_keys)
+        starts = section(exact_keys + 1)
+        index._exact = _Postings(keys, starts, section(starts[-1]))
+
+        keys = section(transposed_keys)
+        starts = section(transposed_keys + 1)
+        index._transposed = _Postings(keys, starts, section(starts[-1]))
+
+        index._pitches = array("B", view[position:position + chords])
+        position += chords
+
+        index._targets = TargetTable(RECORD.iter_unpack(mapped[position:position + targets * RECORD.size]))
+
+        return index
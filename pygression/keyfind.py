@@ -0,0 +1,247 @@
+# Key and mode detection by correlating pitch-class profiles with every key at once. Requires numpy.
+from collections import deque, namedtuple
+from typing import Iterator, List
+import numpy as np
+from .note import Note
+from .chord import Chord
+from .consts import Letter, Accidental
+from .encoding import MODES
+
+KeyGuess = namedtuple("KeyGuess", ["tonic", "mode", "score"])
+
+# Spelling of a tonic on each pitch class when none of the chords has it as a root
+_TONICS = tuple(Note(letter, accidental) for letter, accidental in (
+    (Letter.C, Accidental.NATURAL), (Letter.D, Accidental.FLAT), (Letter.D, Accidental.NATURAL), (Letter.E, Accidental.FLAT),
+    (Letter.E, Accidental.NATURAL), (Letter.F, Accidental.NATURAL), (Letter.F, Accidental.SHARP), (Letter.G, Accidental.NATURAL),
+    (Letter.A, Accidental.FLAT), (Letter.A, Accidental.NATURAL), (Letter.B, Accidental.FLAT), (Letter.B, Accidental.NATURAL),
+))
+
+# Weight of each scale degree in a key's profile: the tonic, then the third and fifth above it, then the other scale tones.
+# Tones outside the scale get a negative weight.
+_TONIC_WEIGHT = 3.0
+_TRIAD_WEIGHT = 2.0
+_SCALE_WEIGHT = 1.0
+_OTHER_WEIGHT = -1.0
+
+# Extra weight of a chord's root, and of every tone of the last chord, which usually resolves to the tonic
+_ROOT_WEIGHT = 1.0
+_FINAL_WEIGHT = 1.0
+
+def _profiles() -> np.ndarray:
+    profiles = np.full((12, len(MODES), 12), _OTHER_WEIGHT)
+
+    for m, mode in enumerate(MODES):
+        base = np.full(12, _OTHER_WEIGHT)
+        base[list(mode.value)] = _SCALE_WEIGHT
+        base[[mode.value[2], mode.value[4]]] = _TRIAD_WEIGHT
+        base[0] = _TONIC_WEIGHT
+
+        for tonic in range(12):
+            profiles[tonic, m] = np.roll(base, tonic)
+
+    # Centered and scaled rows, so a product with a centered histogram is a correlation
+    profiles = profiles.reshape(12 * len(MODES), 12)
+    profiles -= profiles.mean(axis=1, keepdims=True)
+    profiles /= np.linalg.norm(profiles, axis=1, keepdims=True)
+
+    return profiles
+
+# Every key as a row: tonic-major order, so row k is tonic k // len(MODES) in mode k % len(MODES)
+PROFILES = _profiles()
+
+# Tones of every pitch-class mask as a 0/1 vector
+_MASK_TONES = ((np.arange(4096)[:, None] >> np.arange(12)) & 1).astype(np.float64)
+
+def chord_histograms(chords: List[Chord]) -> np.ndarray:
+    """
+    Get the weighted pitch classes of each chord: one for each tone, plus extra weight on the root.
+
+    Args:
+        chords (List[Chord]): Chords to weigh.
+
+    Returns:
+        numpy.ndarray: Weights shaped (chords, 12).
+    """
+
+    codes = np.fromiter((chord._code for chord in chords), dtype=np.int64)
+    histograms = _MASK_TONES[codes & 0xFFF]
+    histograms[np.arange(len(codes)), codes >> 16 & 0xF] += _ROOT_WEIGHT
+
+    return histograms
+
+def histogram(chords: List[Chord]) -> np.ndarray:
+    """
+    Get the pitch-class histogram of a chord sequence, with extra weight on roots and on the last chord.
+
+    Args:
+        chords (List[Chord]): Chords to weigh.
+
+    Returns:
+        numpy.ndarray: Weights shaped (12,).
+    """
+
+    histograms = chord_histograms(chords)
+    if len(histograms):
+        histograms[-1] *= 1 + _FINAL_WEIGHT
+
+    return histograms.sum(axis=0)
+
+# Correlate histograms shaped (..., 12) with every key, giving scores shaped (..., 12, len(MODES))
+def _scores(histograms: np.ndarray) -> np.ndarray:
+    centered = histograms - histograms.mean(axis=-1, keepdims=True)
+    norms = np.linalg.norm(centered, axis=-1, keepdims=True)
+    centered = np.divide(centered, norms, out=np.zeros_like(centered), where=norms > 0)
+
+    return (centered @ PROFILES.T).reshape(histograms.shape[:-1] + (12, len(MODES)))
+
+def score_keys(chords: List[Chord]) -> np.ndarray:
+    """
+    Score a chord sequence against every tonic and mode.
+
+    Args:
+        chords (List[Chord]): Chords to score.
+
+    Returns:
+        numpy.ndarray: Correlation of the sequence with each key, from -1 to 1, shaped (12 tonics, len(MODES)).
+            Tonics are pitch classes (C = 0) and modes are in the order of pygression.encoding.MODES.
+    """
+
+    return _scores(histogram(chords))
+
+# Spell the tonic like the chord roots on its pitch class, if there are any
+def _guess(chords: List[Chord], scores: np.ndarray) -> KeyGuess:
+    best = int(np.argmax(scores))
+    tonic, mode = divmod(best, len(MODES))
+
+    spellings = [chord._root for chord in chords if chord._root._int == tonic]
+    note = max(set(spellings), key=spellings.count) if spellings else _TONICS[tonic]
+
+    return KeyGuess(note, MODES[mode], float(scores.flat[best]))
+
+def find_key(chords: List[Chord]) -> KeyGuess:
+    """
+    Guess the key and mode of a chord sequence.
+
+    Args:
+        chords (List[Chord]): Chords to find the key of.
+
+    Returns:
+        KeyGuess: Tonic, mode and score of the best key.
+
+    Raises:
+        ValueError: If "chords" is empty.
+    """
+
+    chords = list(chords)
+    if not chords:
+        raise ValueError("chords must not be empty")
+
+    return _guess(chords, score_keys(chords))
+
+def find_keys(sequences) -> List[KeyGuess]:
+    """
+    Guess the keys of many chord sequences with a single matrix product.
+
+    Args:
+        sequences (Iterable[List[Chord]]): Chord sequences.
+
+    Returns:
+        List[KeyGuess]: Best key of each sequence, in order.
+
+    Raises:
+        ValueError: If a sequence is empty.
+    """
+
+    sequences = [list(chords) for chords in sequences]
+    if any(not chords for chords in sequences):
+        raise ValueError("sequences must not be empty")
+
+    scores = _scores(np.array([histogram(chords) for chords in sequences]).reshape(len(sequences), 12))
+
+    return [_guess(chords, sequence_scores) for chords, sequence_scores in zip(sequences, scores)]
+
+def windowed_keys(chords: List[Chord], window: int=8, step: int=1) -> List[KeyGuess]:
+    """
+    Guess the key of every window of a chord sequence, for following modulations.
+    Window histograms come from running sums, and every window is scored with a single matrix product.
+    Unlike "find_key", the last chord of a window isn't weighted more, since it's rarely a cadence.
+
+    Args:
+        chords (List[Chord]): Chords to scan.
+        window (int): Chords in each window. Sequences shorter than a window are scored as one window.
+        step (int): Chords between the starts of consecutive windows.
+
+    Returns:
+        List[KeyGuess]: Best key of each window, in order.
+
+    Raises:
+        ValueError: If "window" or "step" is less than 1, or "chords" is empty.
+    """
+
+    if window < 1 or step < 1:
+        raise ValueError("window and step must be at least 1")
+
+    chords = list(chords)
+    if not chords:
+        raise ValueError("chords must not be empty")
+
+    window = min(window, len(chords))
+    histograms = chord_histograms(chords)
+
+    totals = np.zeros((len(chords) + 1, 12))
+    np.cumsum(histograms, axis=0, out=totals[1:])
+
+    starts = np.arange(0, len(chords) - window + 1, step)
+    windows = totals[starts + window] - totals[starts]
+
+    return [_guess(chords[start:start + window], scores) for start, scores in zip(starts, _scores(windows))]
+
+def modulations(chords: List[Chord], window: int=8) -> List[tuple]:
+    """
+    Find where the key of a chord sequence changes, by scanning it with a sliding window.
+
+    Args:
+        chords (List[Chord]): Chords to scan.
+        window (int): Chords in each window.
+
+    Returns:
+        List[tuple]: Index of the first chord of each window where the key changes (0 for the opening key) and the new key.
+    """
+
+    changes = []
+    for start, guess in enumerate(windowed_keys(chords, window=window)):
+        if not changes or (guess.tonic._int, guess.mode) != (changes[-1][1].tonic._int, changes[-1][1].mode):
+            changes.append((start, guess))
+
+    return changes
+
+def iter_keys(chords, window: int=8) -> Iterator[KeyGuess]:
+    """
+    Guess the key after each chord of a stream, from the last "window" chords, in constant memory.
+
+    Args:
+        chords (Iterable[Chord]): Chords to scan, e.g. as they're parsed.
+        window (int): Chords remembered.
+
+    Returns:
+        Iterator[KeyGuess]: Key of the most recent chords after each chord.
+
+    Raises:
+        ValueError: If "window" is less than 1.
+    """
+
+    if window < 1:
+        raise ValueError("window must be at least 1")
+
+    recent = deque()
+    total = np.zeros(12)
+
+    for chord in chords:
+        weights = chord_histograms([chord])[0]
+        recent.append((chord, weights))
+        total += weights
+
+        if len(recent) > window:
+            total -= recent.popleft()[1]
+
+        yield _guess([chord for chord, _ in recent], _scores(total))
@@ -1 +1,15 @@
-from ..modifier import sus, add, no, alter
\ No newline at end of file
+from ..modifier import sus, add, no, alter
+from .base import ModifierSet, _register
+
+# Ids follow priority, so iterating over a modifier set's bits gives the modifiers in order
+_register((
+    alter.Flat5, alter.Sharp5,
+    alter.Flat9, alter.Sharp9,
+    alter.Flat11, alter.Sharp11,
+    alter.Flat13, alter.Sharp13,
+    sus.Sus2, sus.Sus4,
+    add.Add9, add.AddFlat9, add.AddSharp9,
+    add.Add11, add.AddFlat11, add.AddSharp11,
+    add.Add13, add.AddFlat13, add.AddSharp13,
+    no.No3, no.No5,
+))
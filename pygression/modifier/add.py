@@ -1,7 +1,6 @@
 from typing import List
 from .base import Modifier
 from ..note import Note
-from ..utils import Accidental, nth_letter_from
 from ..quality.extended import *
 
 class Add9(Modifier):
@@ -23,8 +22,7 @@ class Add9(Modifier):
     def _modify(self, root: Note, notes: List[Note]) -> List[Note]:
         new_notes = notes.copy()
 
-        letter = nth_letter_from(root.letter, 8)
-        new_notes.append(Note(letter, Accidental((14 + int(root) - letter.value) % 12)))
+        new_notes.append(root._spell(8, 14))
 
         return new_notes
 
@@ -47,8 +45,7 @@ class AddFlat9(Modifier):
     def _modify(self, root: Note, notes: List[Note]) -> List[Note]:
         new_notes = notes.copy()
 
-        letter = nth_letter_from(root.letter, 8)
-        new_notes.append(Note(letter, Accidental((13 + int(root) - letter.value) % 12)))
+        new_notes.append(root._spell(8, 13))
 
         return new_notes
 
@@ -71,8 +68,7 @@ class AddSharp9(Modifier):
     def _modify(self, root: Note, notes: List[Note]) -> List[Note]:
         new_notes = notes.copy()
 
-        letter = nth_letter_from(root.letter, 8)
-        new_notes.append(Note(letter, Accidental((15 + int(root) - letter.value) % 12)))
+        new_notes.append(root._spell(8, 15))
 
         return new_notes
 
@@ -95,8 +91,7 @@ class Add11(Modifier):
     def _modify(self, root: Note, notes: List[Note]) -> List[Note]:
         new_notes = notes.copy()
 
-        letter = nth_letter_from(root.letter, 10)
-        new_notes.append(Note(letter, Accidental((17 + int(root) - letter.value) % 12)))
+        new_notes.append(root._spell(10, 17))
 
         return new_notes
 
@@ -119,8 +114,7 @@ class AddFlat11(Modifier):
     def _modify(self, root: Note, notes: List[Note]) -> List[Note]:
         new_notes = notes.copy()
 
-        letter = nth_letter_from(root.letter, 10)
-        new_notes.append(Note(letter, Accidental((16 + int(root) - letter.value) % 12)))
+        new_notes.append(root._spell(10, 16))
 
         return new_notes
 
@@ -128,7 +122,7 @@ class AddSharp11(Modifier):
     def __str__(self):
         return "add#11"
     
-    def __str__(self):
+    def __repr__(self):
         return "add#11"
     
     def _get_priority(self) -> int:
@@ -143,8 +137,7 @@ class AddSharp11(Modifier):
     def _modify(self, root: Note, notes: List[Note]) -> List[Note]:
         new_notes = notes.copy()
 
-        letter = nth_letter_from(root.letter, 10)
-        new_notes.append(Note(letter, Accidental((18 + int(root) - letter.value) % 12)))
+        new_notes.append(root._spell(10, 18))
 
         return new_notes
 
@@ -167,8 +160,7 @@ class Add13(Modifier):
     def _modify(self, root: Note, notes: List[Note]) -> List[Note]:
         new_notes = notes.copy()
 
-        letter = nth_letter_from(root.letter, 12)
-        new_notes.append(Note(letter, Accidental((21 + int(root) - letter.value) % 12)))
+        new_notes.append(root._spell(12, 21))
 
         return new_notes
 
@@ -191,8 +183,7 @@ class AddFlat13(Modifier):
     def _modify(self, root: Note, notes: List[Note]) -> List[Note]:
         new_notes = notes.copy()
 
-        letter = nth_letter_from(root.letter, 12)
-        new_notes.append(Note(letter, Accidental((20 + int(root) - letter.value) % 12)))
+        new_notes.append(root._spell(12, 20))
 
         return new_notes
 
@@ -215,7 +206,6 @@ class AddSharp13(Modifier):
     def _modify(self, root: Note, notes: List[Note]) -> List[Note]:
         new_notes = notes.copy()
 
-        letter = nth_letter_from(root.letter, 12)
-        new_notes.append(Note(letter, Accidental((21 + int(root) - letter.value) % 12)))
+        new_notes.append(root._spell(12, 22))
 
         return new_notes
\ No newline at end of file
@@ -1,7 +1,6 @@
 from typing import List
 from .base import Modifier
 from ..note import Note
-from ..utils import nth_letter_from
 
 class Flat5(Modifier):
     def __str__(self):
@@ -17,11 +16,11 @@ class Flat5(Modifier):
         return str(modifier) not in ("#5", "no5")
 
     def _compatible_with_quality(self, quality) -> bool:
-        return quality.get_integers()[2] != 6
+        return quality._get_integers()[2] != 6
 
     def _modify(self, root: Note, notes: List[Note]) -> List[Note]:
         new_notes = notes.copy()
-        new_notes[2] = Note.note_relative_to(nth_letter_from(root.letter, 4), root, 6)
+        new_notes[2] = root._spell(4, 6)
 
         return new_notes
 
@@ -39,11 +38,11 @@ class Sharp5(Modifier):
         return str(modifier) not in ("b5", "no5")
     
     def _compatible_with_quality(self, quality) -> bool:
-        return quality.get_integers()[2] != 8
+        return quality._get_integers()[2] != 8
     
     def _modify(self, root: Note, notes: List[Note]) -> List[Note]:
         new_notes = notes.copy()
-        new_notes[2] = Note.note_relative_to(nth_letter_from(root.letter, 4), root, 8)
+        new_notes[2] = root._spell(4, 8)
 
         return new_notes
 
@@ -61,11 +60,11 @@ class Flat9(Modifier):
         return str(modifier) not in ("#9", "add9", "addb9", "add#9")
     
     def _compatible_with_quality(self, quality) -> bool:
-        return len(quality.get_integers()) != 3 and len(quality.get_integers()) != 5
+        return len(quality._get_integers()) != 3 and len(quality._get_integers()) != 5
 
     def _modify(self, root: Note, notes: List[Note]) -> List[Note]:
         new_notes = notes.copy()
-        new_notes.append(Note.note_relative_to(nth_letter_from(root.letter, 8), root, 13))
+        new_notes.append(root._spell(8, 13))
 
         return new_notes
 
@@ -83,11 +82,11 @@ class Sharp9(Modifier):
         return str(modifier) not in ("b9", "add9", "addb9", "add#9")
     
     def _compatible_with_quality(self, quality) -> bool:
-        return len(quality.get_integers()) != 3 and len(quality.get_integers()) != 5
+        return len(quality._get_integers()) != 3 and len(quality._get_integers()) != 5
     
     def _modify(self, root: Note, notes: List[Note]) -> List[Note]:
         new_notes = notes.copy()
-        new_notes.append(Note.note_relative_to(nth_letter_from(root.letter, 8), root, 15))
+        new_notes.append(root._spell(8, 15))
 
         return new_notes
 
@@ -105,16 +104,16 @@ class Flat11(Modifier):
         return str(modifier) not in ("#11", "add9", "addb9", "add#9", "add11", "addb11", "add#11")
     
     def _compatible_with_quality(self, quality) -> bool:
-        return len(quality.get_integers()) != 3 and len(quality.get_integers()) != 6
+        return len(quality._get_integers()) != 3 and len(quality._get_integers()) != 6
 
     def _modify(self, root: Note, notes: List[Note]) -> List[Note]:
         new_notes = notes.copy()
 
         # Add ninth if some kind of ninth doesn't exist
         if not ((int(notes[-1]) - int(root)) % 12 >= 1 and (int(notes[-1]) - int(root)) % 12 <= 3):
-            new_notes.append(Note.note_relative_to(nth_letter_from(root.letter, 8), root, 14))
+            new_notes.append(root._spell(8, 14))
 
-        new_notes.append(Note.note_relative_to(nth_letter_from(root.letter, 10), root, 16))
+        new_notes.append(root._spell(10, 16))
 
         return new_notes
 
@@ -132,16 +131,16 @@ class Sharp11(Modifier):
         return str(modifier) not in ("b11", "add9", "addb9", "add#9", "add11", "addb11", "add#11")
     
     def _compatible_with_quality(self, quality) -> bool:
-        return len(quality.get_integers()) != 3 and len(quality.get_integers()) != 6
+        return len(quality._get_integers()) != 3 and len(quality._get_integers()) != 6
 
     def _modify(self, root: Note, notes: List[Note]) -> List[Note]:
         new_notes = notes.copy()
 
         # Add ninth if some kind of ninth doesn't exist
         if not ((int(notes[-1]) - int(root)) % 12 >= 1 and (int(notes[-1]) - int(root)) % 12 <= 3):
-            new_notes.append(Note.note_relative_to(nth_letter_from(root.letter, 8), root, 14))
+            new_notes.append(root._spell(8, 14))
 
-        new_notes.append(Note.note_relative_to(nth_letter_from(root.letter, 10), root, 18))
+        new_notes.append(root._spell(10, 18))
 
         return new_notes
 
@@ -159,19 +158,19 @@ class Flat13(Modifier):
         return str(modifier) not in ("#13", "add9", "addb9", "add#9", "add11", "addb11", "add#11", "add13", "addb13", "add#13")
     
     def _compatible_with_quality(self, quality) -> bool:
-        return len(quality.get_integers()) != 3 and len(quality.get_integers()) != 7
+        return len(quality._get_integers()) != 3 and len(quality._get_integers()) != 7
     
     def _modify(self, root: Note, notes: List[Note]) -> List[Note]:
         new_notes = notes.copy()
 
         # Add ninth if some kind of ninth doesn't exist
         if not ((int(notes[-1]) - int(root)) % 12 >= 1 and (int(notes[-1]) - int(root)) % 12 <= 3):
-            new_notes.append(Note.note_relative_to(nth_letter_from(root.letter, 8), root, 14))
+            new_notes.append(root._spell(8, 14))
         # Add eleventh if some kind of eleventh doesn't exist
         if not ((int(notes[-1]) - int(root)) % 12 >= 4 and (int(notes[-1]) - int(root)) % 12 <= 6):
-            new_notes.append(Note.note_relative_to(nth_letter_from(root.letter, 10), root, 17))
+            new_notes.append(root._spell(10, 17))
 
-        new_notes.append(Note.note_relative_to(nth_letter_from(root.letter, 12), root, 20))
+        new_notes.append(root._spell(12, 20))
 
         return new_notes
 
@@ -189,18 +188,18 @@ class Sharp13(Modifier):
         return str(modifier) not in ("b13", "add9", "addb9", "add#9", "add11", "addb11", "add#11", "add13", "addb13", "add#13")
     
     def _compatible_with_quality(self, quality) -> bool:
-        return len(quality.get_integers()) != 3 and len(quality.get_integers()) != 7
+        return len(quality._get_integers()) != 3 and len(quality._get_integers()) != 7
 
     def _modify(self, root: Note, notes: List[Note]) -> List[Note]:
         new_notes = notes.copy()
 
         # Add ninth if some kind of ninth doesn't exist
         if not ((int(notes[-1]) - int(root)) % 12 >= 1 and (int(notes[-1]) - int(root)) % 12 <= 3):
-            new_notes.append(Note.note_relative_to(nth_letter_from(root.letter, 8), root, 14))
+            new_notes.append(root._spell(8, 14))
         # Add eleventh if some kind of eleventh doesn't exist
         if not ((int(notes[-1]) - int(root)) % 12 >= 4 and (int(notes[-1]) - int(root)) % 12 <= 6):
-            new_notes.append(Note.note_relative_to(nth_letter_from(root.letter, 10), root, 17))
+            new_notes.append(root._spell(10, 17))
 
-        new_notes.append(Note.note_relative_to(nth_letter_from(root.letter, 12), root, 22))
+        new_notes.append(root._spell(12, 22))
 
         return new_notes
\ No newline at end of file
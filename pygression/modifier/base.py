@@ -4,6 +4,9 @@ from ..note import Note
 from ..quality import *
 
 class Modifier(ABC):
+    # Position of the modifier in the registry, assigned by pygression.modifier once every modifier is defined
+    _id = None
+
     @abstractmethod
     def __str__(self):
         pass
@@ -12,6 +15,13 @@ class Modifier(ABC):
     def __repr__(self):
         pass
 
+    # Modifiers are stateless, so every instance of a class is the same modifier
+    def __eq__(self, other):
+        return type(self) is type(other)
+
+    def __hash__(self):
+        return hash(type(self))
+
     def __gt__(self, other):
         return self._get_priority() > other._get_priority()
 
@@ -33,3 +43,171 @@ class Modifier(ABC):
     @abstractmethod
     def _modify(self, root: Note, notes: List[Note]) -> List[Note]:
         pass
+
+# Shared instance of every registered modifier, indexed by id
+_MODIFIERS = []
+
+# Bitmask of the modifiers each modifier keeps when it's attached, indexed by id
+_COMPATIBLE = []
+
+# Modifiers in each bitmask, in order, filled in as sets are iterated
+_MEMBERS = {0: ()}
+
+# Results of _modifier_sets, keyed on (quality id, bitmask of the modifiers allowed, most modifiers)
+_SETS = {}
+
+def _register(classes):
+    modifiers = tuple(cls() for cls in classes)
+    if list(modifiers) != sorted(modifiers):
+        raise ValueError("modifiers must be registered in order of priority")
+
+    for i, modifier in enumerate(modifiers):
+        type(modifier)._id = i
+
+    _MODIFIERS[:] = modifiers
+    _COMPATIBLE[:] = (sum(1 << j for j, other in enumerate(modifiers) if modifier._compatible_with_mod(other)) for modifier in modifiers)
+    _MEMBERS.clear()
+    _MEMBERS[0] = ()
+    _SETS.clear()
+
+# Bitmasks of every set of modifiers that can go on a quality together, from the allowed ones and without any modifier
+# dropping another. Used to enumerate chords, e.g. by the reharmonization search and the catalog.
+def _modifier_sets(quality, allowed: int, most: int) -> tuple:
+    key = (quality._id, allowed, most)
+    sets = _SETS.get(key)
+    if sets is not None:
+        return sets
+
+    found = []
+
+    # Depth-first in registry order, so each set is reached once. Only the modifiers compatible with everything
+    # chosen so far are passed down, which prunes every branch that would hold an incompatible pair.
+    def extend(bits: int, count: int, remaining: list):
+        found.append(bits)
+        if count == most:
+            return
+
+        for i, modifier in enumerate(remaining):
+            kept = [other for other in remaining[i + 1:] if _COMPATIBLE[modifier] >> other & 1 and _COMPATIBLE[other] >> modifier & 1]
+            extend(bits | 1 << modifier, count + 1, kept)
+
+    extend(0, 0, [modifier._id for modifier in _MODIFIERS if allowed >> modifier._id & 1 and modifier._compatible_with_quality(quality)])
+
+    sets = _SETS[key] = tuple(found)
+    return sets
+
+class ModifierSet:
+    """
+    Class that represents the modifiers on a chord as an immutable bitmask, one bit per modifier.
+    Iterating over the set gives the modifiers in the order they're applied and written.
+
+    Args:
+        modifiers (Iterable[Modifier]): Modifiers in the set. Compatibility isn't checked.
+    """
+
+    __slots__ = ("_bits",)
+
+    def __init__(self, modifiers=()):
+        if isinstance(modifiers, ModifierSet):
+            self._bits = modifiers._bits
+            return
+
+        bits = 0
+        for modifier in modifiers:
+            bits |= 1 << modifier._id
+
+        self._bits = bits
+
+    @staticmethod
+    def _from_bits(bits: int) -> "ModifierSet":
+        modifiers = ModifierSet.__new__(ModifierSet)
+        modifiers._bits = bits
+
+        return modifiers
+
+    def __iter__(self):
+        members = _MEMBERS.get(self._bits)
+        if members is None:
+            members = _MEMBERS[self._bits] = tuple(modifier for modifier in _MODIFIERS if self._bits >> modifier._id & 1)
+
+        return iter(members)
+
+    def __len__(self) -> int:
+        return bin(self._bits).count("1")
+
+    def __bool__(self) -> bool:
+        return self._bits != 0
+
+    def __contains__(self, modifier: Modifier) -> bool:
+        return self._bits >> modifier._id & 1 == 1
+
+    def __eq__(self, other: "ModifierSet") -> bool:
+        if not isinstance(other, ModifierSet):
+            return NotImplemented
+
+        return self._bits == other._bits
+
+    def __hash__(self) -> int:
+        return hash(self._bits)
+
+    def __repr__(self) -> str:
+        return f"ModifierSet({list(self)})"
+
+    def __str__(self) -> str:
+        return "".join(str(modifier) for modifier in self)
+
+    def attach(self, modifier: Modifier) -> "ModifierSet":
+        """
+        Returns a set with the modifier added, dropping the modifiers that are incompatible with it.
+
+        Args:
+            modifier (Modifier): Modifier to add.
+
+        Returns:
+            ModifierSet: A new set with the modifier added.
+        """
+
+        return ModifierSet._from_bits((self._bits | 1 << modifier._id) & _COMPATIBLE[modifier._id])
+
+    def detach(self, modifier: Modifier) -> "ModifierSet":
+        """
+        Returns a set with the modifier removed.
+
+        Args:
+            modifier (Modifier): Modifier to remove.
+
+        Returns:
+            ModifierSet: A new set without the modifier.
+
+        Raises:
+            ValueError: If "modifier" isn't in the set.
+        """
+
+        if not self._bits >> modifier._id & 1:
+            raise ValueError(f"{modifier} isn't in the set")
+
+        return ModifierSet._from_bits(self._bits & ~(1 << modifier._id))
+
+    def compatible_with(self, modifier: Modifier) -> bool:
+        """
+        Checks whether a modifier can be attached without dropping any modifier in the set.
+
+        Args:
+            modifier (Modifier): Modifier to check.
+
+        Returns:
+            bool: Whether every modifier in the set is compatible with "modifier".
+        """
+
+        return self._bits & ~_COMPATIBLE[modifier._id] == 0
+
+    @property
+    def bits(self) -> int:
+        """
+        Get the bitmask of the set.
+
+        Returns:
+            int: Bitmask with bit n set if the modifier with id n is in the set.
+        """
+
+        return self._bits
@@ -36,7 +36,7 @@ class No5(Modifier):
         return "no5"
     
     def __repr__(self):
-        return "no3"
+        return "no5"
     
     def _get_priority(self) -> int:
         return 10
@@ -1,7 +1,6 @@
 from typing import List
 from .base import Modifier
 from ..note import Note
-from ..utils import nth_letter_from, Accidental
 
 class Sus2(Modifier):
     def __str__(self):
@@ -21,7 +20,7 @@ class Sus2(Modifier):
 
     def _modify(self, root: Note, notes: List[Note]) -> List[Note]:
         new_notes = notes.copy()
-        new_notes[1] = Note.note_relative_to(nth_letter_from(root.letter, 1), root, 2)
+        new_notes[1] = root._spell(1, 2)
         
         return new_notes
 
@@ -43,6 +42,6 @@ class Sus4(Modifier):
     
     def _modify(self, root: Note, notes: List[Note]) -> List[Note]:
         new_notes = notes.copy()
-        new_notes[1] = Note.note_relative_to(nth_letter_from(root.letter, 3), root, 5)
+        new_notes[1] = root._spell(3, 5)
 
         return new_notes
\ No newline at end of file
@@ -1,31 +1,69 @@
-from .utils import nth_letter_from
+from .utils import LETTERS, LETTER_INDEX
 from .consts import Letter, Accidental, AS_NOTATION
 
+# Spellings are ordered by letter, then by accidental from double flat to double sharp
+_ACCIDENTALS = (Accidental.DFLAT, Accidental.FLAT, Accidental.NATURAL, Accidental.SHARP, Accidental.DSHARP)
+
 class Note:
     """
     A class representing a musical note.
 
+    Notes are immutable and interned: there is exactly one object for each of the 35 spellings
+    (7 letters × 5 accidentals), so constructing a note is a table lookup and notes can be
+    shared freely between chords.
+
     Args:
         letter (Letter): The letter of the note.
         accidental (Accidental, optional): The accidental of the note. Defaults to natural.
+
+    Raises:
+        ValueError: If "letter" and "accidental" don't spell a note.
     """
 
-    def __init__(self, letter: Letter, accidental: Accidental = Accidental.NATURAL):
-        self._letter = letter
-        self._accidental = accidental
+    __slots__ = ("_letter", "_accidental", "_index", "_int", "_str", "_hash", "_transpositions", "_shifts", "_relatives")
+
+    def __new__(cls, letter: Letter, accidental: Accidental = Accidental.NATURAL) -> "Note":
+        # Indexed by value rather than hashed, since hashing an enum member is slow
+        try:
+            note = _SPELLINGS[letter._value_ * 5 + accidental._value_ + 2]
+        except (AttributeError, IndexError, TypeError):
+            note = None
+
+        if note is None or note._letter is not letter or note._accidental is not accidental:
+            raise ValueError(f"{letter!r} and {accidental!r} don't spell a note")
+
+        return note
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Note objects are immutable")
+
+    def __delattr__(self, name):
+        raise AttributeError("Note objects are immutable")
+
+    def __reduce__(self):
+        return (Note, (self._letter, self._accidental))
+
+    def __copy__(self) -> "Note":
+        return self
+
+    def __deepcopy__(self, memo) -> "Note":
+        return self
 
     def __int__(self) -> int:
-        return (self._letter.value + self._accidental.value) % 12
+        return self._int
+
+    def __hash__(self) -> int:
+        return self._hash
 
     def __repr__(self) -> str:
-        return AS_NOTATION[self._letter] + AS_NOTATION[self._accidental]
+        return self._str
 
     def __str__(self) -> str:
-        return AS_NOTATION[self._letter] + AS_NOTATION[self._accidental]
+        return self._str
 
     def __iadd__(self, semitones: int) -> "Note":
         """
-        Transpose the note up by modifying its accidental in-place.
+        Transpose the note up by changing its accidental. Notes are immutable, so the name is rebound to the transposed note.
 
         Args:
             semitones (int): The number of semitones to transpose up by.
@@ -34,8 +72,7 @@ class Note:
             Note: The transposed note.
         """
 
-        self._accidental = Accidental(self._accidental.value + semitones)
-        return self
+        return self.__add__(semitones)
 
     def __add__(self, semitones: int) -> "Note":
         """
@@ -46,13 +83,21 @@ class Note:
 
         Returns:
             Note: The transposed note.
+
+        Raises:
+            ValueError: If the transposed note would need more than a double accidental.
         """
 
-        return Note(self._letter, Accidental(self._accidental.value + semitones))
+        if -4 <= semitones <= 4:
+            note = self._transpositions[semitones + 4]
+            if note is not None:
+                return note
+
+        raise ValueError(f"{self._accidental.value + semitones} is not a valid Accidental")
 
     def __isub__(self, semitones: int) -> "Note":
         """
-        Transpose the note down by modifying its accidental in-place.
+        Transpose the note down by changing its accidental. Notes are immutable, so the name is rebound to the transposed note.
 
         Args:
             semitones (int): The number of semitones to transpose down by.
@@ -61,7 +106,7 @@ class Note:
             Note: The transposed note.
         """
 
-        return self.__iadd__(-semitones)
+        return self.__add__(-semitones)
 
     def __sub__(self, semitones: int) -> "Note":
         """
@@ -72,6 +117,9 @@ class Note:
 
         Returns:
             Note: The transposed note.
+
+        Raises:
+            ValueError: If the transposed note would need more than a double accidental.
         """
 
         return self.__add__(-semitones)
@@ -86,12 +134,12 @@ class Note:
         Returns:
             Note: The transposed note.
         """
-        
-        return Note(nth_letter_from(self._letter, shift), self._accidental)
+
+        return self._shifts[shift % 7]
 
     def __irshift__(self, shift: int) -> "Note":
         """
-        Transpose the note up by shifting its letter in-place.
+        Shift the letter of the note up. Notes are immutable, so the name is rebound to the shifted note.
 
         Args:
             shift (int): The number of letters to shift right by.
@@ -100,8 +148,7 @@ class Note:
             Note: The transposed note.
         """
 
-        self._letter = nth_letter_from(self._letter, shift)
-        return self
+        return self._shifts[shift % 7]
 
     def __lshift__(self, shift: int) -> "Note":
         """
@@ -114,11 +161,11 @@ class Note:
             Note: The transposed note.
         """
 
-        return self.__rshift__(-shift)
+        return self._shifts[-shift % 7]
 
     def __ilshift__(self, shift: int) -> "Note":
         """
-        Transpose the note down by shifting its letter in-place.
+        Shift the letter of the note down. Notes are immutable, so the name is rebound to the shifted note.
 
         Args:
             shift (int): The number of letters to shift left by.
@@ -127,7 +174,7 @@ class Note:
             Note: The transposed note.
         """
 
-        return self.__irshift__(-shift)
+        return self._shifts[-shift % 7]
 
     def __eq__(self, other: "Note") -> bool:
         """
@@ -140,7 +187,7 @@ class Note:
             bool: True if the notes are enharmonically equivalent, False otherwise.
         """
 
-        return int(self) == int(other)
+        return self._int == int(other)
 
     def __ne__(self, other: "Note") -> bool:
         """
@@ -153,7 +200,7 @@ class Note:
             bool: True if the notes are enharmonically different, False otherwise.
         """
 
-        return int(self) != int(other)
+        return self._int != int(other)
 
     @property
     def letter(self) -> Letter:
@@ -166,17 +213,6 @@ class Note:
 
         return self._letter
 
-    @letter.setter
-    def letter(self, new_letter: Letter):
-        """
-        Set the letter of the note.
-
-        Args:
-            new_letter (Letter): The new letter to set.
-        """
-
-        self._letter = new_letter
-
     @property
     def accidental(self) -> Accidental:
         """
@@ -188,17 +224,6 @@ class Note:
 
         return self._accidental
 
-    @accidental.setter
-    def accidental(self, new_accidental: Accidental):
-        """
-        Set the accidental of the note.
-
-        Args:
-            new_accidental (Accidental): The new accidental to set.
-        """
-
-        self._accidental = new_accidental
-
     @staticmethod
     def note_relative_to(letter: Letter, root: "Note", semitones: int) -> "Note":
         """
@@ -215,9 +240,56 @@ class Note:
         Raises:
             ValueError: If the resulting note cannot be expressed with the given letter.
         """
-        
-        accidental = (semitones - (letter.value - int(root) + root.accidental.value) % 12)
-        if accidental > 2:
-            accidental -= 12
 
-        return Note(letter, Accidental(accidental + root.accidental.value))
+        return root._spell(LETTER_INDEX[letter._value_] - root._index // 5, semitones)
+
+    # Spell the note a number of letters and semitones above this one
+    def _spell(self, letters: int, semitones: int) -> "Note":
+        note = self._relatives[letters % 7 * 12 + semitones % 12]
+        if note is None:
+            raise ValueError(f"cannot spell a note {semitones} semitones above {self} with the letter {LETTERS[(self._index // 5 + letters) % 7].name}")
+
+        return note
+
+# Build every spelling once, then link the transposition and letter shift tables
+def _build_spellings() -> tuple:
+    notes = []
+    for letter in LETTERS:
+        for accidental in _ACCIDENTALS:
+            note = object.__new__(Note)
+            object.__setattr__(note, "_letter", letter)
+            object.__setattr__(note, "_accidental", accidental)
+            object.__setattr__(note, "_index", len(notes))
+            object.__setattr__(note, "_int", (letter.value + accidental.value) % 12)
+            object.__setattr__(note, "_str", AS_NOTATION[letter] + AS_NOTATION[accidental])
+            object.__setattr__(note, "_hash", hash(note._int))
+            notes.append(note)
+
+    for note in notes:
+        letter_index, accidental_index = divmod(note._index, 5)
+
+        transpositions = []
+        for semitones in range(-4, 5):
+            shifted = accidental_index + semitones
+            transpositions.append(notes[letter_index * 5 + shifted] if 0 <= shifted < 5 else None)
+
+        object.__setattr__(note, "_transpositions", tuple(transpositions))
+        object.__setattr__(note, "_shifts", tuple(notes[(letter_index + shift) % 7 * 5 + accidental_index] for shift in range(7)))
+
+        # Spelling of every interval above the note, indexed by letters * 12 + semitones
+        relatives = []
+        for letters in range(7):
+            target = LETTERS[(letter_index + letters) % 7]
+            for semitones in range(12):
+                accidental = (note._int + semitones - target.value + 6) % 12 - 6
+                relatives.append(notes[(letter_index + letters) % 7 * 5 + accidental + 2] if -2 <= accidental <= 2 else None)
+
+        object.__setattr__(note, "_relatives", tuple(relatives))
+
+    spellings = [None] * 60
+    for note in notes:
+        spellings[note._letter.value * 5 + note._accidental.value + 2] = note
+
+    return tuple(spellings)
+
+_SPELLINGS = _build_spellings()
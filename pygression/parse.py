@@ -0,0 +1,283 @@
+# Parsers that turn chord symbols and Roman numeral analysis back into chords and progressions
+import re
+from typing import List, Iterator
+from .note import Note
+from .chord import Chord
+from .roman import Roman
+from .romanchord import RomanChord
+from .progression import Progression
+from .consts import Letter, Accidental, Mode, ROMAN
+from .quality.base import _QUALITIES
+from .modifier.base import _MODIFIERS, ModifierSet
+from .cache import SpellingCache
+
+_ACCIDENTALS = {"": Accidental.NATURAL, "#": Accidental.SHARP, "b": Accidental.FLAT, "x": Accidental.DSHARP, "##": Accidental.DSHARP, "bb": Accidental.DFLAT}
+
+# Other common spellings of quality symbols, on top of the ones chords are written with
+_QUALITY_ALIASES = {
+    "maj7": "M7", "Δ7": "M7", "Δ": "M7",
+    "min": "m", "-": "m", "min7": "m7", "-7": "m7",
+    "dim": "o", "°": "o", "dim7": "o7", "°7": "o7",
+    "aug": "+",
+}
+
+# Quality of every symbol, keyed on what Chord.__str__ writes after the root (e.g. "m7")
+_QUALITY_SYMBOLS = {str(quality) + quality._figured_bass(0): quality for quality in _QUALITIES}
+_QUALITY_SYMBOLS.update({alias: _QUALITY_SYMBOLS[symbol] for alias, symbol in _QUALITY_ALIASES.items()})
+
+_MODIFIER_SYMBOLS = {str(modifier): modifier for modifier in _MODIFIERS}
+
+# Longest alternatives first, so "mM7" isn't read as "m" followed by junk
+def _alternation(symbols) -> str:
+    return "|".join(re.escape(symbol) for symbol in sorted(symbols, key=len, reverse=True))
+
+_NOTE = r"([A-G])(bb|##|b|#|x)?"
+_MODIFIER = _alternation(_MODIFIER_SYMBOLS)
+
+_SYMBOL = rf"({_alternation(_QUALITY_SYMBOLS)})(?:\(((?:{_MODIFIER})+)\)|((?:{_MODIFIER})*))(?:/{_NOTE})?"
+
+# Flat and sharp modifiers can be read as part of the root (e.g. "Cbb9"), so the root's accidental is read
+# greedily first, then as short as possible if that doesn't give a chord. Parentheses avoid the ambiguity.
+_CHORD_PATTERNS = (re.compile(_NOTE + _SYMBOL), re.compile(r"([A-G])(b|#|x|bb|##)??" + _SYMBOL))
+_MODIFIER_PATTERN = re.compile(_MODIFIER)
+
+# Quality and inversion of every way a Roman chord can be written after its numeral, keyed on
+# (lowercase numeral, quality symbol, figured bass), e.g. (True, "ø", "6/5") for a first-inversion half-diminished seventh.
+# Extended chords don't show their inversion, so they're read in root position.
+def _roman_qualities() -> dict:
+    qualities = {}
+    for quality in _QUALITIES:
+        lower = str(quality) in ("m", "o", "ø")
+        symbol = "" if str(quality) == "m" else str(quality)
+
+        for inversion in range(len(quality._get_integers())):
+            qualities.setdefault((lower, symbol, quality._figured_bass(inversion)), (quality, inversion))
+
+    return qualities
+
+_ROMAN_QUALITIES = _roman_qualities()
+
+_ROMAN_SYMBOLS = {symbol for _, symbol, _ in _ROMAN_QUALITIES} | {"°"}
+_FIGURES = {figure for _, _, figure in _ROMAN_QUALITIES}
+
+_NUMERALS = {numeral: degree for degree, upper in enumerate(ROMAN, 1) for numeral in (upper, upper.lower())}
+
+# One Roman chord without its target; a "/" after it starts the target
+_ROMAN_PATTERN = re.compile(
+    rf"(bb|##|b|#|x)?({_alternation(_NUMERALS)})({_alternation(_ROMAN_SYMBOLS)})({_alternation(_FIGURES)})"
+    rf"(?:\(((?:{_MODIFIER})+)\)|((?:{_MODIFIER})*))"
+)
+
+# Parsed chords keyed on their symbol. Chords are mutable, so callers get clones.
+symbol_cache = SpellingCache(maxsize=65536)
+
+# Parsed Roman chords keyed on their text, used the same way
+roman_cache = SpellingCache(maxsize=65536)
+
+def _note(letter: str, accidental: str) -> Note:
+    return Note(Letter[letter], _ACCIDENTALS[accidental or ""])
+
+def _modifiers(symbols: str, text: str) -> ModifierSet:
+    modifiers = ModifierSet()
+    count = 0
+
+    for symbol in _MODIFIER_PATTERN.findall(symbols):
+        modifiers = modifiers.attach(_MODIFIER_SYMBOLS[symbol])
+        count += 1
+
+    # Attaching drops incompatible modifiers, which would silently change the chord
+    if len(modifiers) != count:
+        raise ValueError(f"{text!r} has repeated or incompatible modifiers")
+
+    return modifiers
+
+def _parse_chord(symbol: str) -> Chord:
+    error = ValueError(f"{symbol!r} is not a chord symbol")
+
+    for pattern in _CHORD_PATTERNS:
+        match = pattern.fullmatch(symbol)
+        if match is None:
+            continue
+
+        letter, accidental, quality, bracketed, modifiers, bass_letter, bass_accidental = match.groups()
+
+        try:
+            chord = Chord._realize(_note(letter, accidental), _QUALITY_SYMBOLS[quality], _modifiers(bracketed or modifiers, symbol))
+        except ValueError as e:
+            error = e
+            continue
+
+        if bass_letter is not None:
+            chord = chord.over(_note(bass_letter, bass_accidental))
+
+        return chord
+
+    raise error
+
+def parse_chord(symbol: str) -> Chord:
+    """
+    Parse a chord symbol like the ones chords are written as (e.g. "Ebm7b5/Gb" or "G13#11").
+    Modifiers may be wrapped in parentheses (e.g. "C7(b9)"). A slash bass that is a chord tone inverts the chord; any other note is added below it, like Chord.over.
+
+    Args:
+        symbol (str): Chord symbol to parse.
+
+    Returns:
+        Chord: A new chord.
+
+    Raises:
+        ValueError: If "symbol" isn't a valid chord symbol.
+    """
+
+    chord = symbol_cache.get(symbol)
+    if chord is None:
+        chord = _parse_chord(symbol.strip())
+        symbol_cache.put(symbol, chord)
+
+    return chord._clone()
+
+def parse_many(symbols, errors: str="raise") -> List[Chord]:
+    """
+    Parse many chord symbols, e.g. every symbol of a lead sheet. Repeated symbols are only parsed once.
+
+    Args:
+        symbols (Iterable[str]): Chord symbols to parse.
+        errors (str): Either "raise" to raise on an invalid symbol, or "ignore" to put None in its place.
+
+    Returns:
+        List[Chord]: A new chord for each symbol, in order.
+
+    Raises:
+        ValueError: If a symbol isn't valid and "errors" is "raise", or "errors" is unknown.
+    """
+
+    if errors not in ("raise", "ignore"):
+        raise ValueError(f"errors must be \"raise\" or \"ignore\", not {errors!r}")
+
+    # Local memo on top of the shared cache, since lead sheets repeat a handful of symbols many times
+    parsed = {}
+    chords = []
+
+    for symbol in symbols:
+        chord = parsed.get(symbol)
+        if chord is None:
+            try:
+                chord = parse_chord(symbol)
+            except ValueError:
+                if errors == "raise":
+                    raise
+
+                chords.append(None)
+                continue
+
+            parsed[symbol] = chord
+
+        chords.append(chord._clone())
+
+    return chords
+
+def _parse_roman(text: str) -> RomanChord:
+    chords = []
+    position = 0
+
+    while True:
+        match = _ROMAN_PATTERN.match(text, position)
+        if match is None:
+            raise ValueError(f"{text!r} is not a Roman chord")
+
+        accidental, numeral, symbol, figure, bracketed, modifiers = match.groups()
+
+        found = _ROMAN_QUALITIES.get((numeral.islower(), "o" if symbol == "°" else symbol, figure))
+        if found is None:
+            raise ValueError(f"{text!r} has no quality written as {numeral}{symbol}{figure}")
+
+        chord = RomanChord(Roman(_NUMERALS[numeral], _ACCIDENTALS[accidental or ""]), found[0])
+        chord._inversion = found[1]
+        chord._modifiers = _modifiers(bracketed or modifiers, text)
+        chords.append(chord)
+
+        position = match.end()
+        if position == len(text):
+            break
+
+        if text[position] != "/":
+            raise ValueError(f"{text!r} is not a Roman chord")
+
+        position += 1
+
+    # Each chord is applied to the one written after it
+    for chord, target in zip(chords, chords[1:]):
+        chord._target = target
+
+    return chords[0]
+
+def parse_roman(text: str) -> RomanChord:
+    """
+    Parse a Roman chord like the ones Roman chords are written as (e.g. "bVIIM7", "ii6/5" or "V7b9/V").
+    Lowercase numerals are minor, diminished ("o" or "°") or half-diminished ("ø"). Inversions are written in figured bass:
+    "6" and "6/4" for triads, "6/5", "4/3" and "4/2" for seventh chords. Modifiers may be wrapped in parentheses.
+
+    Args:
+        text (str): Roman chord to parse.
+
+    Returns:
+        RomanChord: A new Roman chord.
+
+    Raises:
+        ValueError: If "text" isn't a valid Roman chord.
+    """
+
+    chord = roman_cache.get(text)
+    if chord is None:
+        chord = _parse_roman(text.strip())
+        roman_cache.put(text, chord)
+
+    return chord._clone()
+
+def parse_progression(text: str, mode: Mode=Mode.ION, relative_to: Mode=Mode.ION) -> Progression:
+    """
+    Parse a progression of Roman chords separated by whitespace (e.g. "ii7 V7 IM7"). Bar lines ("|") are skipped.
+
+    Args:
+        text (str): Progression to parse.
+        mode (Mode): Mode of the progression.
+        relative_to (Mode): Mode that the numerals are read with respect to.
+
+    Returns:
+        Progression: A new progression.
+
+    Raises:
+        ValueError: If a chord isn't a valid Roman chord.
+    """
+
+    progression = Progression(mode=mode, relative_to=relative_to)
+    progression._chords = [parse_roman(token) for token in text.split() if token != "|"]
+
+    return progression
+
+def iter_progressions(lines, mode: Mode=Mode.ION, relative_to: Mode=Mode.ION) -> Iterator[Progression]:
+    """
+    Parse one progression per line, one line at a time, e.g. from an open analysis file.
+    Blank lines and lines starting with "#" are skipped.
+
+    Args:
+        lines (Iterable[str]): Lines to parse.
+        mode (Mode): Mode of the progressions.
+        relative_to (Mode): Mode that the numerals are read with respect to.
+
+    Returns:
+        Iterator[Progression]: Iterator over the parsed progressions.
+
+    Raises:
+        ValueError: If a line has an invalid Roman chord; the message gives the line number.
+    """
+
+    for number, line in enumerate(lines, 1):
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+
+        try:
+            yield parse_progression(line, mode=mode, relative_to=relative_to)
+        except ValueError as e:
+            raise ValueError(f"line {number}: {e}") from None
@@ -0,0 +1,297 @@
+# Process-pool pipeline that maps over corpora of progressions, shipping chunks in the corpus record format
+import os
+import struct
+import sys
+from array import array
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from functools import reduce
+from itertools import islice
+from typing import Callable, Iterator, List
+from .note import Note
+from .progression import Progression
+from .consts import Letter, Accidental
+from .corpus import RECORD, Corpus
+from .encoding import MODE_CODES, TargetTable, encode, decode, empty_progression
+
+# Progressions and stored targets in a chunk, followed by the progressions' modes, the modes they're read with respect to,
+# the chord offsets (progressions + 1 little-endian uint32), the target records and the chord records
+_COUNTS = struct.Struct("<II")
+
+# Tonic of every pitch class, spelled with at most one accidental
+KEYS = tuple(Note(letter, accidental) for letter, accidental in (
+    (Letter.C, Accidental.NATURAL), (Letter.D, Accidental.FLAT), (Letter.D, Accidental.NATURAL), (Letter.E, Accidental.FLAT),
+    (Letter.E, Accidental.NATURAL), (Letter.F, Accidental.NATURAL), (Letter.F, Accidental.SHARP), (Letter.G, Accidental.NATURAL),
+    (Letter.A, Accidental.FLAT), (Letter.A, Accidental.NATURAL), (Letter.B, Accidental.FLAT), (Letter.B, Accidental.NATURAL),
+))
+
+def pack_chunk(progressions) -> bytes:
+    """
+    Encode progressions as one compact payload, with every chord as a corpus record.
+
+    Args:
+        progressions (Iterable[Progression]): Progressions to encode.
+
+    Returns:
+        bytes: The encoded chunk.
+    """
+
+    modes = bytearray()
+    relative_to = bytearray()
+    offsets = array("I", [0])
+    records = []
+    targets = TargetTable()
+
+    for progression in progressions:
+        modes.append(MODE_CODES[progression._mode])
+        relative_to.append(MODE_CODES[progression._relative_to])
+        records.extend(RECORD.pack(*encode(chord, targets)) for chord in progression._chords)
+        offsets.append(len(records))
+
+    if sys.byteorder != "little":
+        offsets.byteswap()
+
+    return b"".join((
+        _COUNTS.pack(len(modes), len(targets)), modes, relative_to, offsets.tobytes(), *(RECORD.pack(*fields) for fields in targets), *records,
+    ))
+
+def unpack_chunk(data) -> List[Progression]:
+    """
+    Decode the progressions of a payload made by "pack_chunk".
+
+    Args:
+        data (bytes-like): The encoded chunk.
+
+    Returns:
+        List[Progression]: New progressions, in order.
+    """
+
+    count, stored = _COUNTS.unpack_from(data)
+    position = _COUNTS.size
+
+    modes = data[position:position + count]
+    relative_to = data[position + count:position + count * 2]
+    position += count * 2
+
+    offsets = array("I", bytes(data[position:position + (count + 1) * 4]))
+    if sys.byteorder != "little":
+        offsets.byteswap()
+    position += (count + 1) * 4
+
+    targets = TargetTable(RECORD.iter_unpack(data[position:position + stored * RECORD.size]))
+    position += stored * RECORD.size
+
+    chords = [decode(*fields, targets=targets) for fields in RECORD.iter_unpack(data[position:])]
+
+    progressions = []
+    for i in range(count):
+        progression = empty_progression(modes[i], relative_to[i])
+        progression._chords = chords[offsets[i]:offsets[i + 1]]
+        progressions.append(progression)
+
+    return progressions
+
+# Corpora opened by a worker process, keyed on path, with the identity (inode, size and modification time) of the file
+# they were opened from. Workers map each file once, and map it again if it's been rewritten since.
+_CORPORA = {}
+
+def _open(path: str) -> Corpus:
+    stat = os.stat(path)
+    identity = (stat.st_ino, stat.st_size, stat.st_mtime_ns)
+
+    cached = _CORPORA.get(path)
+    if cached is not None:
+        if cached[0] == identity:
+            return cached[1]
+
+        del _CORPORA[path]
+        cached[1].close()
+
+    corpus = Corpus(path)
+    _CORPORA[path] = (identity, corpus)
+
+    return corpus
+
+# Progressions of a task's payload: either a range of a corpus (open in this process, or a path for a worker to open), or a packed chunk
+def _load(payload) -> List[Progression]:
+    if isinstance(payload, tuple):
+        corpus, start, stop = payload
+        if isinstance(corpus, str):
+            corpus = _open(corpus)
+
+        return [corpus[i] for i in range(start, stop)]
+
+    return unpack_chunk(payload)
+
+def _map_chunk(task: tuple) -> list:
+    func, payload = task
+    return [func(progression) for progression in _load(payload)]
+
+def _reduce_chunk(task: tuple):
+    func, combine, initial, payload = task
+    return reduce(combine, map(func, _load(payload)), initial)
+
+# Payload of every chunk of a source. Corpus files are split into ranges that workers read themselves, or that are read
+# here from a corpus opened for this call when everything runs in this process; anything else is read here and packed,
+# one chunk at a time.
+def _payloads(source, chunk_size: int, local: bool) -> Iterator:
+    if isinstance(source, str) and local:
+        with Corpus(source) as corpus:
+            yield from _ranges(corpus, len(corpus), chunk_size)
+    elif isinstance(source, str):
+        with Corpus(source) as corpus:
+            count = len(corpus)
+
+        yield from _ranges(source, count, chunk_size)
+    elif isinstance(source, Corpus):
+        yield from _ranges(source if local else source.path, len(source), chunk_size)
+    else:
+        progressions = iter(source)
+        while True:
+            chunk = list(islice(progressions, chunk_size))
+            if not chunk:
+                return
+
+            yield pack_chunk(chunk)
+
+def _ranges(corpus, count: int, chunk_size: int) -> Iterator:
+    for start in range(0, count, chunk_size):
+        yield (corpus, start, min(start + chunk_size, count))
+
+# Run tasks in order over a process pool, with at most "in_flight" of them submitted and not yet collected
+def _ordered(worker: Callable, tasks, workers: int, in_flight: int) -> Iterator:
+    if workers == 1:
+        yield from map(worker, tasks)
+        return
+
+    workers = workers or os.cpu_count() or 1
+    in_flight = in_flight or 2 * workers
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+        try:
+            for task in tasks:
+                if len(pending) >= in_flight:
+                    yield pending.popleft().result()
+
+                pending.append(executor.submit(worker, task))
+
+            while pending:
+                yield pending.popleft().result()
+        finally:
+            # Stopping early drops the work that hasn't started
+            for future in pending:
+                future.cancel()
+
+def imap(func: Callable, source, chunk_size: int=1024, workers: int=None, in_flight: int=None) -> Iterator:
+    """
+    Apply a function to every progression of a corpus over a process pool, yielding the results in order as they arrive.
+    Progressions travel to the workers as chunks of corpus records (or as ranges of the file, for corpus files) rather than
+    pickled objects, and at most "in_flight" chunks are out at once, so memory stays bounded however big the corpus is.
+
+    Args:
+        func (Callable[[Progression], Any]): Stage to apply, e.g. Render. It must be picklable, e.g. a module-level function.
+            Its results are pickled back, so compact results (strings, integers) are cheapest.
+        source (Iterable[Progression], Corpus, str): Progressions, an open corpus, or the path of a corpus file.
+        chunk_size (int): Progressions in each task.
+        workers (int): Processes to run. None uses every CPU, and 1 runs in this process.
+        in_flight (int): Most chunks submitted and not yet yielded. Defaults to twice the number of workers.
+
+    Returns:
+        Iterator: The result for each progression, in order.
+    """
+
+    tasks = ((func, payload) for payload in _payloads(source, chunk_size, workers == 1))
+    for results in _ordered(_map_chunk, tasks, workers, in_flight):
+        yield from results
+
+def map_reduce(func: Callable, combine: Callable, source, initial, chunk_size: int=1024, workers: int=None, in_flight: int=None):
+    """
+    Apply a function to every progression of a corpus over a process pool and combine the results, like functools.reduce.
+    Each worker combines the results of its chunk, and the chunk results are combined in order, so only one value per chunk comes back.
+
+    Args:
+        func (Callable[[Progression], Any]): Stage to apply. It must be picklable.
+        combine (Callable[[Any, Any], Any]): Combines two results without modifying them, e.g. operator.add. It must be associative
+            and picklable.
+        source (Iterable[Progression], Corpus, str): Progressions, an open corpus, or the path of a corpus file.
+        initial: Result of combining nothing, e.g. collections.Counter() with operator.add.
+        chunk_size (int): Progressions in each task.
+        workers (int): Processes to run. None uses every CPU, and 1 runs in this process.
+        in_flight (int): Most chunks submitted and not yet combined.
+
+    Returns:
+        The combined result.
+    """
+
+    tasks = ((func, combine, initial, payload) for payload in _payloads(source, chunk_size, workers == 1))
+    return reduce(combine, _ordered(_reduce_chunk, tasks, workers, in_flight), initial)
+
+class Render:
+    """
+    Stage that realizes a progression in several keys, like Progression.chords_in, as chord symbols or codes.
+
+    Args:
+        keys (Iterable[Note]): Keys to realize in. Defaults to the tonic of every pitch class.
+        symbols (bool): Whether to give chord symbols (like str(Chord)) rather than codes (like Chord.code).
+    """
+
+    def __init__(self, keys=None, symbols: bool=True):
+        self.keys = KEYS if keys is None else tuple(keys)
+        self.symbols = symbols
+
+    def __call__(self, progression: Progression) -> list:
+        """
+        Realize a progression in every key.
+
+        Args:
+            progression (Progression): Progression to realize.
+
+        Returns:
+            list: A tuple of chord symbols or codes for each key, or None for a key the progression can't be spelled in.
+        """
+
+        rendered = []
+        for key in self.keys:
+            try:
+                chords = progression.chords_in(key)
+            except ValueError:
+                rendered.append(None)
+                continue
+
+            rendered.append(tuple(str(chord) for chord in chords) if self.symbols else tuple(chord._code for chord in chords))
+
+        return rendered
+
+class Contains:
+    """
+    Stage that checks whether a progression has a run of chords, compared by their encoded fields. Targets that don't fit in the
+    fields are stored in the stage's own table, so equal targets get equal references.
+
+    Args:
+        pattern (Progression, List[RomanChord], str): Chords to look for; a string is parsed like Progression.parse.
+    """
+
+    def __init__(self, pattern):
+        if isinstance(pattern, str):
+            pattern = Progression.parse(pattern)
+
+        chords = pattern._chords if isinstance(pattern, Progression) else list(pattern)
+        self.targets = TargetTable()
+        self.pattern = tuple(encode(chord, self.targets) for chord in chords)
+
+    def __call__(self, progression: Progression) -> bool:
+        """
+        Check a progression.
+
+        Args:
+            progression (Progression): Progression to check.
+
+        Returns:
+            bool: Whether the chords appear in order, one after another.
+        """
+
+        tokens = [encode(chord, self.targets) for chord in progression._chords]
+        length = len(self.pattern)
+
+        return any(tuple(tokens[i:i + length]) == self.pattern for i in range(len(tokens) - length + 1))
@@ -1,12 +1,37 @@
 # Basically a list specifically tailored to chord progressions
-from typing import List
-from copy import deepcopy
+from typing import List, Iterator
 from .chord import Chord
 from .roman import Roman
 from .romanchord import RomanChord
 from .note import Note
 from .consts import Accidental, Mode
-from .quality.triad import *
+from .quality import triad, seventh
+
+_TRIADS = (triad.Major(), triad.Minor(), triad.Diminished(), triad.Augmented())
+_SEVENTHS = (seventh.Major(), seventh.Minor(), seventh.Dominant(), seventh.HalfDiminished(), seventh.Diminished(), seventh.MinorMajor(), seventh.Augmented())
+
+# Numeral, triad quality and seventh quality of each degree of a mode, read with respect to another mode.
+# Modes without a seventh chord quality on a degree (e.g. III+ in harmonic minor) fall back to the triad.
+def _diatonic(mode: Mode, relative_to: Mode) -> tuple:
+    degrees = []
+    scale = mode.value
+
+    for degree in range(7):
+        integers = [(scale[(degree + i) % 7] - scale[degree]) % 12 for i in (0, 2, 4, 6)]
+
+        triad_quality = next((quality for quality in _TRIADS if quality._get_integers() == integers[:3]), None)
+        seventh_quality = next((quality for quality in _SEVENTHS if quality._get_integers() == integers), triad_quality)
+
+        try:
+            roman = Roman(degree + 1, accidental=Accidental(scale[degree] - relative_to.value[degree]))
+        except ValueError:
+            roman = None
+
+        degrees.append((roman, triad_quality, seventh_quality))
+
+    return tuple(degrees)
+
+_DIATONIC = {(mode, relative_to): _diatonic(mode, relative_to) for mode in Mode for relative_to in Mode}
 
 class Progression:
     """
@@ -16,15 +41,37 @@ class Progression:
         items (List): List of chords represented as either Roman chords or degrees.
         mode (Mode): Mode that the degrees are based off of.
         relative_to (Mode): Mode that the progression is read with respect to.
+        sevenths (bool): Whether degrees become diatonic seventh chords instead of triads.
     """
 
-    def __init__(self, items=None, mode: Mode=Mode.ION, relative_to: Mode=Mode.ION):
+    def __init__(self, items=None, mode: Mode=Mode.ION, relative_to: Mode=Mode.ION, sevenths: bool=False):
         self._mode = mode
         self._relative_to = relative_to
         self._chords = []
 
-        for item in items:
-            self.append(item)
+        for item in items or ():
+            self.append(item, seventh=sevenths)
+
+    @staticmethod
+    def parse(text: str, mode: Mode=Mode.ION, relative_to: Mode=Mode.ION) -> "Progression":
+        """
+        Parse a progression of Roman chords separated by whitespace (e.g. "ii7 V7 IM7").
+
+        Args:
+            text (str): Progression to parse.
+            mode (Mode): Mode of the progression.
+            relative_to (Mode): Mode that the numerals are read with respect to.
+
+        Returns:
+            Progression: A new progression.
+
+        Raises:
+            ValueError: If a chord isn't a valid Roman chord.
+        """
+
+        from .parse import parse_progression
+
+        return parse_progression(text, mode=mode, relative_to=relative_to)
 
     def _calculate_scale(self, mode: Mode) -> List[Note]:
         scale = []
@@ -57,8 +104,8 @@ class Progression:
             Progression: A new progression with chords appended to it.
         """
 
-        new_prog = deepcopy(self)
-        new_prog._chords += prog._chords
+        new_prog = Progression([], mode=self._mode, relative_to=self._relative_to)
+        new_prog._chords = [chord._clone() for chord in self._chords] + prog._chords
 
         return new_prog
     
@@ -79,6 +126,46 @@ class Progression:
         self._chords += prog._chords
         return self
 
+    def __eq__(self, other: "Progression") -> bool:
+        """
+        Checks whether two progressions realize to the same chords in every key, whatever modes they're written in.
+
+        Args:
+            other (Progression): Progression to compare the current progression to.
+
+        Returns:
+            bool: Whether the two progressions are equivalent.
+        """
+
+        if not isinstance(other, Progression):
+            return NotImplemented
+
+        from .canonical import progression_form
+
+        return progression_form(self) == progression_form(other)
+
+    def __ne__(self, other: "Progression") -> bool:
+        """
+        Checks whether two progressions realize to different chords in some key.
+
+        Args:
+            other (Progression): Progression to compare the current progression to.
+
+        Returns:
+            bool: Whether the two progressions are different.
+        """
+
+        if not isinstance(other, Progression):
+            return NotImplemented
+
+        return not self == other
+
+    # Hashed on the canonical fingerprint, so a progression must not be changed while it's in a set or used as a key
+    def __hash__(self) -> int:
+        from .canonical import fingerprint
+
+        return fingerprint(self)
+
     def __getitem__(self, index: int) -> RomanChord:
         """
         Get Roman chord in the progression at a specific index.
@@ -111,8 +198,7 @@ class Progression:
         new_chord = None
 
         if type(new_item) == int:
-            self._append_degree(new_item)
-            new_chord = self._chords.pop()
+            new_chord = self._diatonic_chord(new_item)
         elif type(new_item) == RomanChord:
             new_chord = new_item
 
@@ -162,10 +248,12 @@ class Progression:
         """
 
         for chord in self._chords:
-            chord.roman += new_mode - self._relative_to
+            chord.roman += self._relative_to.value[chord.roman.degree - 1] - new_mode.value[chord.roman.degree - 1]
 
+            # Targets may be shared with other chords, so they're copied before being changed
             if chord._target != None:
-                chord._target.roman += new_mode - self._relative_to
+                chord._target = chord._target._clone()
+                chord._target.roman += self._relative_to.value[chord._target.roman.degree - 1] - new_mode.value[chord._target.roman.degree - 1]
 
         self._relative_to = new_mode
     
@@ -180,87 +268,56 @@ class Progression:
 
         return self._chords
     
-    def _append_degree(self, degree: int):
+    # Diatonic chord built on a degree of the progression's mode, looked up in the precomputed table
+    def _diatonic_chord(self, degree: int, seventh: bool=False) -> RomanChord:
         if degree < 1 or degree > 7:
             raise ValueError("degree must be between 1 and 7")
 
-        scale = self._mode.value
-        integers = [int(scale[degree - 1]), int(scale[(degree + 1) % 7]), int(scale[(degree + 3) % 7])]
-        integers[1] -= integers[0]
-        integers[1] %= 12
-        integers[2] -= integers[0]
-        integers[2] %= 12
-        integers[0] = 0
+        roman, triad_quality, seventh_quality = _DIATONIC[self._mode, self._relative_to][degree - 1]
+        if roman is None:
+            raise ValueError(f"degree {degree} of {self._mode.name} can't be written with respect to {self._relative_to.name}")
 
-        quality = None
+        return RomanChord(roman, quality=seventh_quality if seventh else triad_quality)
 
-        if integers == Major._get_integers():
-            quality = Major()
-        elif integers == Minor._get_integers():
-            quality = Minor()
-        elif integers == Diminished._get_integers():
-            quality = Diminished()
-        elif integers == Augmented._get_integers():
-            quality = Augmented()
-
-        self._chords.append(RomanChord(Roman(degree, accidental=Accidental(self._mode.value[degree - 1] - self._relative_to.value[degree - 1])), quality=quality))
+    def _append_degree(self, degree: int, seventh: bool=False):
+        self._chords.append(self._diatonic_chord(degree, seventh))
 
     def _append_chord(self, chord: Chord):
         self._chords.append(chord)
     
-    def _insert_degree(self, degree: int, index: int):
-        if degree < 1 or degree > 7:
-            raise ValueError("degree must be between 1 and 7")
-
-        scale = self._mode.value
-        integers = [int(scale[degree - 1]), int(scale[(degree + 1) % 7]), int(scale[(degree + 3) % 7])]
-        integers[1] -= integers[0]
-        integers[1] %= 12
-        integers[2] -= integers[0]
-        integers[2] %= 12
-        integers[0] = 0
-
-        quality = None
-
-        if integers == Major._get_integers():
-            quality = Major()
-        elif integers == Minor._get_integers():
-            quality = Minor()
-        elif integers == Diminished._get_integers():
-            quality = Diminished()
-        elif integers == Augmented._get_integers():
-            quality = Augmented()
-        
-        self._chords.insert(index, RomanChord(Roman(degree, accidental=Accidental(self._mode.value[degree - 1] - self._relative_to.value[degree - 1])), quality=quality))
+    def _insert_degree(self, degree: int, index: int, seventh: bool=False):
+        self._chords.insert(index, self._diatonic_chord(degree, seventh))
     
     def _insert_chord(self, chord: RomanChord, index: int):
         self._chords.insert(index, chord)
 
-    def append(self, item):
+    def append(self, item, seventh: bool=False):
         """
         Appends a Roman chord to the progression.
 
         Args:
             item (int, RomanChord): Roman chord to append to the progression.
+            seventh (bool): Whether a degree becomes the diatonic seventh chord instead of the triad.
         
         Raises:
             ValueError: If "new_item" is a degree and is not between 1 and 7.
         """
 
         if type(item) == int:
-            self._append_degree(item)
+            self._append_degree(item, seventh)
         elif type(item) == RomanChord:
             self._append_chord(item)
         else:
             raise TypeError(f"item must be integer or RomanChord, not {type(item).__name__}")
     
-    def insert(self, index: int, item):
+    def insert(self, index: int, item, seventh: bool=False):
         """
         Inserts a Roman chord into the progression.
 
         Args:
             index (int): Index to insert at.
             item (int, RomanChord): Roman chord to append to the progression.
+            seventh (bool): Whether a degree becomes the diatonic seventh chord instead of the triad.
         
         Raises:
             IndexError: If "index" is not in the range of the list of Roman chords.
@@ -268,7 +325,7 @@ class Progression:
         """
 
         if type(item) == int:
-            self._insert_degree(item, index)
+            self._insert_degree(item, index, seventh)
         elif type(item) == RomanChord:
             self._insert_chord(item, index)
     
@@ -299,24 +356,60 @@ class Progression:
             ValueError: If "key" has double accidentals.
         """
 
+        return list(self.iter_chords_in(key))
+
+    def iter_chords_in(self, key: Note) -> Iterator[Chord]:
+        """
+        Get the chords of the chord progression in a specific key one at a time, in constant memory.
+        Chords are only realized when they're reached, so stopping early skips the rest.
+
+        Args:
+            key (Note): Key of chord progression.
+
+        Returns:
+            Iterator[Chord]: Iterator over the chords in a specific key.
+
+        Raises:
+            ValueError: If "key" has double accidentals.
+        """
+
         if key.accidental.value < -1 or key.accidental.value > 1:
             raise ValueError("cannot have double accidentals as key")
 
-        chords = []
+        return self._iter_chords_in(key)
+
+    def _iter_chords_in(self, key: Note) -> Iterator[Chord]:
         scale = self._relative_to.value
 
+        # Natural root of each scale degree and the accidental that puts it in the scale, worked out once for the key
+        naturals = [Note(key.letter) >> degree for degree in range(7)]
+        offsets = [scale[degree] - (int(naturals[degree]) - int(key)) for degree in range(7)]
+
         for chord in self._chords:
-            degree = (chord.roman.degree + (0 if chord._target == None else chord._target.roman.degree - 1)) % 7
+            target = chord._target
+            degree = (chord._roman._degree + (0 if target is None else target._roman._degree - 1) - 1) % 7
 
-            root = Note(key.letter) >> (degree - 1)
-            accidental = scale[degree - 1] + chord.roman.accidental.value + (chord._target.roman.accidental.value if chord._target != None else 0) - (int(root) - int(key))
+            accidental = offsets[degree] + chord._roman._accidental.value + (0 if target is None else target._roman._accidental.value)
             if accidental > 2:
                 accidental -= 12
-            root.accidental = Accidental(accidental)
-            
-            new_chord = Chord(root, quality=chord.quality) >> chord._inversion
-            new_chord.modifiers = deepcopy(chord._modifiers)
 
-            chords.append(new_chord)
+            yield Chord._realize(Note(naturals[degree].letter, Accidental(accidental)), chord._quality, chord._modifiers, chord._inversion)
+
+    def chords_in_keys(self, keys=None):
+        """
+        Get the chords of the chord progression in several keys at once, computed as NumPy arrays in one vectorized pass.
+        Requires numpy.
+
+        Args:
+            keys (Iterable[Note]): Keys of chord progression. Defaults to the 15 keys with at most seven sharps or flats.
+
+        Returns:
+            KeyedChords: Roots and chord tones of every chord in every key; Chord objects are built with its "chords" method.
+
+        Raises:
+            ValueError: If a key has double accidentals.
+        """
+
+        from .vectorized import realize_keys, PRACTICAL_KEYS
 
-        return chords
\ No newline at end of file
+        return realize_keys(self._chords, self._relative_to, PRACTICAL_KEYS if keys is None else keys)
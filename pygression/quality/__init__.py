@@ -1 +1,9 @@
-from ..quality import triad, seventh, extended
\ No newline at end of file
+from ..quality import triad, seventh, extended
+from .base import _register
+
+# Ids are stored in encoded progressions, so new qualities must be added at the end
+_register((
+    triad.Major, triad.Minor, triad.Augmented, triad.Diminished,
+    seventh.Major, seventh.Minor, seventh.Dominant, seventh.HalfDiminished, seventh.Diminished, seventh.MinorMajor, seventh.Augmented,
+    extended.Ninth, extended.Eleventh, extended.Thirteenth,
+))
@@ -2,12 +2,21 @@
 from typing import List
 from abc import ABC, abstractmethod
 from ..note import Note
-from ..utils import nth_letter_from
 
 class Quality(ABC):
+    # Position of the quality in the registry, assigned by pygression.quality once every quality is defined
+    _id = None
+
     @abstractmethod
     def __str__(self):
         pass
+
+    # Qualities are stateless, so every instance of a class is the same quality
+    def __eq__(self, other):
+        return type(self) is type(other)
+
+    def __hash__(self):
+        return hash(type(self))
     
     # Notes of the chord as integers
     @staticmethod
@@ -21,10 +30,13 @@ class Quality(ABC):
         pass
 
     def _build_core(self, root: Note) -> List[Note]:
-        notes = []
-        integers = self._get_integers()
+        # Chord tones are stacked thirds, so the nth tone is spelled 2n letters above the root
+        return [root._spell(i * 2, semitones) for i, semitones in enumerate(self._get_integers())]
 
-        for i in range(len(integers)):
-            notes.append(Note.note_relative_to(nth_letter_from(root.letter, i * 2), root, integers[i]))
+# Shared instance of every registered quality, indexed by id
+_QUALITIES = []
 
-        return notes
\ No newline at end of file
+def _register(classes):
+    _QUALITIES[:] = [cls() for cls in classes]
+    for i, quality in enumerate(_QUALITIES):
+        type(quality)._id = i
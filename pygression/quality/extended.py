@@ -9,7 +9,7 @@ class Ninth(Quality):
         return "9"
 
     @staticmethod
-    def _get_integers(self) -> List[int]:
+    def _get_integers() -> List[int]:
         return [0, 4, 7, 10, 14]
     
 class Eleventh(Quality):
@@ -20,7 +20,7 @@ class Eleventh(Quality):
         return "11"
     
     @staticmethod
-    def _get_integers(self) -> List[int]:
+    def _get_integers() -> List[int]:
         return [0, 4, 7, 10, 14, 17]
 
 class Thirteenth(Quality):
@@ -31,5 +31,5 @@ class Thirteenth(Quality):
         return "13"
     
     @staticmethod
-    def _get_integers(self) -> List[int]:
+    def _get_integers() -> List[int]:
         return [0, 4, 7, 10, 14, 17, 21]
\ No newline at end of file
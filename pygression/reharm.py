@@ -0,0 +1,192 @@
+# Reharmonization search over every quality and compatible set of modifiers of Roman chords, spread over a process pool
+import heapq
+import os
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from typing import List
+from .note import Note
+from .chord import Chord
+from .romanchord import RomanChord, _NO3_OR_NO5
+from .consts import Letter
+from .progression import Progression
+from .quality.base import Quality, _QUALITIES
+from .modifier.base import _MODIFIERS, ModifierSet, _modifier_sets
+
+Suggestion = namedtuple("Suggestion", ["chord", "score"])
+
+_C = Note(Letter.C)
+
+def modifier_sets(quality: Quality, modifiers=None, max_modifiers: int=None) -> List[ModifierSet]:
+    """
+    Get every set of modifiers that can go on a quality together, without any modifier dropping another.
+
+    Args:
+        quality (Quality): Quality of the chord.
+        modifiers (Iterable[Modifier]): Modifiers to choose from. Defaults to every modifier.
+        max_modifiers (int): Most modifiers in a set.
+
+    Returns:
+        List[ModifierSet]: Every valid set, including the empty one, in the order they're searched.
+    """
+
+    allowed = (1 << len(_MODIFIERS)) - 1 if modifiers is None else ModifierSet(modifiers)._bits
+    return [ModifierSet._from_bits(bits) for bits in _modifier_sets(quality, allowed, len(_MODIFIERS) if max_modifiers is None else max_modifiers)]
+
+def common_tones(candidate: RomanChord, original: RomanChord) -> float:
+    """
+    Objective that scores a candidate by the pitch classes it shares with the original chord.
+
+    Args:
+        candidate (RomanChord): Chord to score.
+        original (RomanChord): Chord being reharmonized.
+
+    Returns:
+        float: Number of shared pitch classes.
+    """
+
+    return bin(candidate.mask & original.mask).count("1")
+
+def fewest_changes(candidate: RomanChord, original: RomanChord) -> float:
+    """
+    Objective that scores a candidate by how few pitch classes it adds to or takes from the original chord.
+
+    Args:
+        candidate (RomanChord): Chord to score.
+        original (RomanChord): Chord being reharmonized.
+
+    Returns:
+        float: Negated number of pitch classes in only one of the chords.
+    """
+
+    return -bin(candidate.mask ^ original.mask).count("1")
+
+# Inversion of the original chord carried over to a candidate, wrapped around its tones the way RomanChord inverts
+def _inversion(quality: Quality, bits: int, inversion: int) -> int:
+    return inversion % (len(quality._get_integers()) - bin(bits & _NO3_OR_NO5._bits).count("1"))
+
+# Candidate with the same numeral, inversion and target as the original. The target is shared until the candidate is returned.
+def _candidate(chord: RomanChord, quality: Quality, bits: int) -> RomanChord:
+    candidate = RomanChord.__new__(RomanChord)
+    candidate._roman = chord._roman
+    candidate._quality = quality
+    candidate._inversion = _inversion(quality, bits, chord._inversion)
+    candidate._modifiers = ModifierSet._from_bits(bits)
+    candidate._target = chord._target
+
+    return candidate
+
+# Realized shapes keyed on (quality id, bitmask of the modifiers allowed, most modifiers, inversion)
+_SHAPES = {}
+
+# Modifier sets of a search that give a usable chord, with the shape of the chord realized on C. Shapes that need more
+# than two accidentals, that switch to another quality (they're found under that quality instead) or that double a pitch
+# class are left out. None of this depends on the numeral, so it's worked out once for every chord.
+def _shapes(quality: Quality, allowed: int, most: int, inversion: int) -> tuple:
+    key = (quality._id, allowed, most, inversion)
+    shapes = _SHAPES.get(key)
+    if shapes is not None:
+        return shapes
+
+    found = []
+    for bits in _modifier_sets(quality, allowed, most):
+        try:
+            chord = Chord._realize(_C, quality, ModifierSet._from_bits(bits), _inversion(quality, bits, inversion))
+        except ValueError:
+            continue
+
+        if chord._quality is quality and len({note._int for note in chord._notes}) == len(chord._notes):
+            found.append((bits, chord._code & 0xFFFF))
+
+    shapes = _SHAPES[key] = tuple(found)
+    return shapes
+
+# Score every candidate of one chord and quality, best first as (-score, quality id, modifier bits).
+# Runs in the worker processes, so it only takes and returns picklable values.
+def _search(task: tuple) -> list:
+    chord, quality_id, allowed, most, objective, limit = task
+    quality = _QUALITIES[quality_id]
+    original = chord._shape()
+
+    scored = []
+    for bits, shape in _shapes(quality, allowed, most, chord._inversion):
+        # Candidates with the same pitch classes and bass as the original (including itself) aren't reharmonizations
+        if shape == original:
+            continue
+
+        score = objective(_candidate(chord, quality, bits), chord)
+        if score is not None:
+            scored.append((-score, quality_id, bits))
+
+    return sorted(scored) if limit is None else heapq.nsmallest(limit, scored)
+
+def reharmonize_progression(progression: Progression, objective=common_tones, qualities=None, modifiers=None, max_modifiers: int=None, limit: int=None, workers: int=None) -> List[List[Suggestion]]:
+    """
+    Suggest other qualities and modifiers for every chord of a progression. The search for each chord and quality is a task,
+    and tasks are spread over a process pool. Results are merged in a fixed order, so they don't depend on the pool.
+
+    Args:
+        progression (Progression): Progression to reharmonize.
+        objective (Callable[[RomanChord, RomanChord], float]): Scores a candidate against the original chord; higher is better,
+            and None drops the candidate. It must be picklable, e.g. a module-level function.
+        qualities (Iterable[Quality]): Qualities to try. Defaults to every quality.
+        modifiers (Iterable[Modifier]): Modifiers to try. Defaults to every modifier.
+        max_modifiers (int): Most modifiers on a candidate.
+        limit (int): Most suggestions for each chord.
+        workers (int): Processes to search with. None uses every CPU (or this process, for a single chord), and 1 searches in this process.
+
+    Returns:
+        List[List[Suggestion]]: Suggestions for each chord, best first, then in registry order of quality and modifiers.
+            Candidates with the same pitch classes and bass as the original chord are left out.
+    """
+
+    chords = progression._chords
+    qualities = _QUALITIES if qualities is None else list(qualities)
+    allowed = (1 << len(_MODIFIERS)) - 1 if modifiers is None else ModifierSet(modifiers)._bits
+    most = len(_MODIFIERS) if max_modifiers is None else max_modifiers
+
+    tasks = [(chord, quality._id, allowed, most, objective, limit) for chord in chords for quality in qualities]
+
+    if workers == 1 or (workers is None and len(chords) <= 1):
+        results = list(map(_search, tasks))
+    else:
+        workers = workers or os.cpu_count() or 1
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(_search, tasks, chunksize=max(1, len(tasks) // (4 * workers))))
+
+    suggestions = []
+    for i, chord in enumerate(chords):
+        merged = heapq.merge(*results[i * len(qualities):(i + 1) * len(qualities)])
+        if limit is not None:
+            merged = list(merged)[:limit]
+
+        chord_suggestions = []
+        for score, quality_id, bits in merged:
+            candidate = _candidate(chord, _QUALITIES[quality_id], bits)
+            candidate._target = chord._target._clone() if chord._target is not None else None
+            chord_suggestions.append(Suggestion(candidate, -score))
+
+        suggestions.append(chord_suggestions)
+
+    return suggestions
+
+def reharmonize(chord: RomanChord, objective=common_tones, qualities=None, modifiers=None, max_modifiers: int=None, limit: int=None, workers: int=None) -> List[Suggestion]:
+    """
+    Suggest other qualities and modifiers for a chord, like reharmonize_progression.
+
+    Args:
+        chord (RomanChord): Chord to reharmonize.
+        objective (Callable[[RomanChord, RomanChord], float]): Scores a candidate against the original chord; higher is better.
+        qualities (Iterable[Quality]): Qualities to try. Defaults to every quality.
+        modifiers (Iterable[Modifier]): Modifiers to try. Defaults to every modifier.
+        max_modifiers (int): Most modifiers on a candidate.
+        limit (int): Most suggestions.
+        workers (int): Processes to search with. None and 1 search in this process.
+
+    Returns:
+        List[Suggestion]: Suggestions, best first.
+    """
+
+    progression = Progression()
+    progression._chords = [chord]
+
+    return reharmonize_progression(progression, objective=objective, qualities=qualities, modifiers=modifiers, max_modifiers=max_modifiers, limit=limit, workers=workers)[0]
@@ -1,31 +1,65 @@
 from .consts import Accidental, AS_NOTATION, ROMAN
 
+_ACCIDENTALS = (Accidental.DFLAT, Accidental.FLAT, Accidental.NATURAL, Accidental.SHARP, Accidental.DSHARP)
+
 class Roman:
     """
     Class that represents a Roman numeral with accidentals (nonexistent in music theory).
 
+    Numerals are immutable and interned like notes, so they can be shared between Roman chords.
+
     Args:
         degree (int): Degree of the numeral.
         accidental (Accidental): Accidental of the numeral. If left blank, the note defaults to natural.
+
+    Raises:
+        ValueError: If "degree" is not between 1 and 7.
     """
 
-    def __init__(self, degree: int, accidental: Accidental=Accidental.NATURAL):
-        self._degree = degree
-        self._accidental = accidental
+    __slots__ = ("_degree", "_accidental", "_index", "_int", "_str", "_hash", "_transpositions", "_shifts")
+
+    def __new__(cls, degree: int, accidental: Accidental=Accidental.NATURAL) -> "Roman":
+        try:
+            numeral = _NUMERALS[(degree - 1) * 5 + accidental._value_ + 2] if 1 <= degree <= 7 else None
+        except (AttributeError, TypeError):
+            numeral = None
+
+        if numeral is None or numeral._accidental is not accidental:
+            raise ValueError(f"{degree!r} and {accidental!r} don't make a numeral; degree must be between 1 and 7")
+
+        return numeral
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Roman objects are immutable")
+
+    def __delattr__(self, name):
+        raise AttributeError("Roman objects are immutable")
+
+    def __reduce__(self):
+        return (Roman, (self._degree, self._accidental))
+
+    def __copy__(self) -> "Roman":
+        return self
+
+    def __deepcopy__(self, memo) -> "Roman":
+        return self
 
     def __int__(self) -> int:
-        return (self._degree + self._accidental.value) % 12
+        return self._int
+
+    def __hash__(self) -> int:
+        return self._hash
 
     def __repr__(self) -> str:
-        return AS_NOTATION[self._accidental] + ROMAN[self._degree - 1]
+        return self._str
 
     def __str__(self) -> str:
-        return AS_NOTATION[self._accidental] + ROMAN[self._degree - 1]
+        return self._str
     
     # Accidental change
     def __iadd__(self, semitones: int) -> "Roman":
         """
-        Transposes the numeral up by changing the accidental.
+        Transposes the numeral up by changing the accidental. Numerals are immutable, so the name is rebound to the transposed numeral.
 
         Args:
             semitones (int): Amount of semitones to move up by.
@@ -34,9 +68,7 @@ class Roman:
             Roman: The transposed numeral.
         """
 
-        self._accidental = Accidental(self._accidental.value + semitones)
-
-        return self
+        return self.__add__(semitones)
     
     def __add__(self, semitones: int) -> "Roman":
         """
@@ -47,13 +79,21 @@ class Roman:
         
         Returns:
             Roman: The transposed numeral.
+
+        Raises:
+            ValueError: If the transposed numeral would need more than a double accidental.
         """
 
-        return Roman(self._degree, Accidental(self._accidental.value + semitones))
+        if -4 <= semitones <= 4:
+            numeral = self._transpositions[semitones + 4]
+            if numeral is not None:
+                return numeral
+
+        raise ValueError(f"{self._accidental.value + semitones} is not a valid Accidental")
 
     def __isub__(self, semitones: int) -> "Roman":
         """
-        Transposes the numeral down by changing the accidental.
+        Transposes the numeral down by changing the accidental. Numerals are immutable, so the name is rebound to the transposed numeral.
 
         Args:
             semitones (int): Amount of semitones to move up by.
@@ -62,7 +102,7 @@ class Roman:
             Roman: The transposed numeral.
         """
 
-        return self.__iadd__(-semitones)
+        return self.__add__(-semitones)
     
     def __sub__(self, semitones: int) -> "Roman":
         """
@@ -88,11 +128,11 @@ class Roman:
             Roman: The transposed numeral.
         """
 
-        return Roman((self._degree + shift) % 7 + 1, self._accidental)
+        return self._shifts[shift % 7]
     
     def __irshift__(self, shift: int) -> "Roman":
         """
-        Transposes the numeral up by shifting the degree of the note to the right a specified amount of times.
+        Transposes the numeral up by shifting the degree. Numerals are immutable, so the name is rebound to the shifted numeral.
 
         Args:
             shift (int): Amount of degrees to shift right by.
@@ -101,8 +141,7 @@ class Roman:
             Roman: The transposed numeral.
         """
 
-        self._degree = (self._degree + shift) % 7 + 1
-        return self
+        return self._shifts[shift % 7]
     
     def __lshift__(self, shift: int) -> "Roman":
         """
@@ -115,11 +154,11 @@ class Roman:
             Roman: The transposed numeral.
         """
 
-        return self.__rshift__(-shift)
+        return self._shifts[-shift % 7]
 
     def __ilshift__(self, shift: int) -> "Roman":
         """
-        Transposes the numeral down by shifting the degree of the numeral to the left a specified amount of times.
+        Transposes the numeral down by shifting the degree. Numerals are immutable, so the name is rebound to the shifted numeral.
 
         Args:
             shift (int): Amount of degrees to shift left by.
@@ -128,7 +167,7 @@ class Roman:
             Roman: The transposed numeral.
         """
 
-        return self.__irshift__(-shift)
+        return self._shifts[-shift % 7]
 
     def __eq__(self, other: "Roman") -> bool:
         """
@@ -167,17 +206,6 @@ class Roman:
 
         return self._degree
 
-    @degree.setter
-    def degree(self, new_degree: int):
-        """
-        Set the degree of the numeral.
-
-        Args:
-            new_degree (int): Integer to set to.
-        """
-        
-        self._letter = new_degree
-    
     @property
     def accidental(self) -> Accidental:
         """
@@ -189,13 +217,31 @@ class Roman:
 
         return self._accidental
 
-    @accidental.setter
-    def accidental(self, new_accidental: Accidental):
-        """
-        Set the accidental of the note.
-
-        Args:
-            new_accidental (Accidental): Accidental to set to.
-        """
-        
-        self._accidental = new_accidental
\ No newline at end of file
+# Build every numeral once, then link the transposition and degree shift tables
+def _build_numerals() -> tuple:
+    numerals = []
+    for degree in range(1, 8):
+        for accidental in _ACCIDENTALS:
+            numeral = object.__new__(Roman)
+            object.__setattr__(numeral, "_degree", degree)
+            object.__setattr__(numeral, "_accidental", accidental)
+            object.__setattr__(numeral, "_index", len(numerals))
+            object.__setattr__(numeral, "_int", (degree + accidental.value) % 12)
+            object.__setattr__(numeral, "_str", AS_NOTATION[accidental] + ROMAN[degree - 1])
+            object.__setattr__(numeral, "_hash", hash(numeral._int))
+            numerals.append(numeral)
+
+    for numeral in numerals:
+        accidental_index = numeral._index % 5
+
+        transpositions = []
+        for semitones in range(-4, 5):
+            shifted = accidental_index + semitones
+            transpositions.append(numerals[(numeral._degree - 1) * 5 + shifted] if 0 <= shifted < 5 else None)
+
+        object.__setattr__(numeral, "_transpositions", tuple(transpositions))
+        object.__setattr__(numeral, "_shifts", tuple(numerals[(numeral._degree + shift) % 7 * 5 + accidental_index] for shift in range(7)))
+
+    return tuple(numerals)
+
+_NUMERALS = _build_numerals()
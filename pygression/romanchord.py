@@ -1,8 +1,15 @@
-from copy import deepcopy
 from .roman import Roman
+from .note import Note
+from .chord import Chord
+from .consts import Letter
 from .quality.base import Quality
 from .quality.triad import Major
-from .modifier.base import Modifier
+from .modifier.base import Modifier, ModifierSet
+from .modifier.no import No3, No5
+
+_C = Note(Letter.C)
+_NO_MODIFIERS = ModifierSet()
+_NO3_OR_NO5 = ModifierSet([No3(), No5()])
 
 class RomanChord:
     """
@@ -13,13 +20,51 @@ class RomanChord:
         quality (Quality): Quality of the chord.
     """
 
+    __slots__ = ("_roman", "_quality", "_inversion", "_modifiers", "_target")
+
     def __init__(self, roman: Roman, quality: Quality=Major()):
         self._roman = roman
         self._quality = quality
         self._inversion = 0
-        self._modifiers = []
+        self._modifiers = _NO_MODIFIERS
         
         self._target = None
+
+    # The numeral, quality and modifiers are immutable and shared; only the target is mutable, so it's copied too
+    def _clone(self) -> "RomanChord":
+        chord = RomanChord.__new__(RomanChord)
+        chord._roman = self._roman
+        chord._quality = self._quality
+        chord._inversion = self._inversion
+        chord._modifiers = self._modifiers
+        chord._target = self._target._clone() if self._target is not None else None
+
+        return chord
+
+    @staticmethod
+    def parse(text: str) -> "RomanChord":
+        """
+        Parse a Roman chord like the ones Roman chords are written as (e.g. "bVIIM7", "ii6/5" or "V7/V").
+
+        Args:
+            text (str): Roman chord to parse.
+
+        Returns:
+            RomanChord: A new Roman chord.
+
+        Raises:
+            ValueError: If "text" isn't a valid Roman chord.
+        """
+
+        from .parse import parse_roman
+
+        return parse_roman(text)
+
+    def __copy__(self) -> "RomanChord":
+        return self._clone()
+
+    def __deepcopy__(self, memo) -> "RomanChord":
+        return self._clone()
     
     def __repr__(self) -> str:
         s = str(self._roman)
@@ -41,6 +86,48 @@ class RomanChord:
 
         return s + self._quality._figured_bass(self._inversion) + "".join(str(modifier) for modifier in self._modifiers) + ("/" + str(self._target) if self._target != None else "")
     
+    def __eq__(self, other: "RomanChord") -> bool:
+        """
+        Checks for enharmonic equivalence: the same numeral and target, with the same intervals over the same bass.
+
+        Args:
+            other (RomanChord): Roman chord to compare the current Roman chord to.
+
+        Returns:
+            bool: Whether the two Roman chords are enharmonically equivalent.
+        """
+
+        if not isinstance(other, RomanChord):
+            return NotImplemented
+
+        return self._key() == other._key()
+
+    def __ne__(self, other: "RomanChord") -> bool:
+        """
+        Checks for enharmonic inequivalence.
+
+        Args:
+            other (RomanChord): Roman chord to compare the current Roman chord to.
+
+        Returns:
+            bool: Whether the two Roman chords are enharmonically inequivalent.
+        """
+
+        if not isinstance(other, RomanChord):
+            return NotImplemented
+
+        return self._key() != other._key()
+
+    def __hash__(self) -> int:
+        return hash(self._key())
+
+    # Shape of the chord above its root, realized on C: interval mask in bits 0-11 and bass interval in bits 12-15
+    def _shape(self) -> int:
+        return Chord._realize(_C, self._quality, self._modifiers, self._inversion)._code & 0xFFFF
+
+    def _key(self) -> tuple:
+        return (self._roman._index, self._shape(), None if self._target is None else self._target._key())
+
     def __idiv__(self, target: "RomanChord") -> "RomanChord":
         """
         Turns the chord into a secondary chord of the specified chord.
@@ -70,14 +157,7 @@ class RomanChord:
             RomanChord: Secondary chord to target chord.
         """
 
-        chord = deepcopy(self)
-
-        if target._roman != Roman(1):
-            chord._target = target
-        else:
-            chord._target = None
-        
-        return chord
+        return self._clone().__idiv__(target)
     
     def __irshift__(self, inversions: int) -> "RomanChord":
         """
@@ -91,10 +171,7 @@ class RomanChord:
         """
 
         highest_inversion = len(self.quality._get_integers())
-        if len(self._modifiers) > 0 and str(self._modifiers[-1]) in ("no3", "no5"):
-            highest_inversion -= 1
-        if len(self._modifiers) > 1 and str(self._modifiers[-2]) in ("no3", "no5"):
-            highest_inversion -= 1
+        highest_inversion -= bin(self._modifiers._bits & _NO3_OR_NO5._bits).count("1")
 
         self._inversion += inversions
         self._inversion %= highest_inversion
@@ -112,18 +189,7 @@ class RomanChord:
             RomanChord: A new inverted chord.
         """
 
-        new_chord = deepcopy(self)
-        
-        highest_inversion = len(new_chord.quality._get_integers())
-        if len(new_chord._modifiers) > 0 and str(new_chord._modifiers[-1]) in ("no3", "no5"):
-            highest_inversion -= 1
-        if len(new_chord._modifiers) > 1 and str(new_chord._modifiers[-2]) in ("no3", "no5"):
-            highest_inversion -= 1
-
-        new_chord._inversion += inversions
-        new_chord._inversion %= highest_inversion
-        
-        return new_chord
+        return self._clone().__irshift__(inversions)
     
     def __ilshift__(self, inversions: int) -> "RomanChord":
         """
@@ -162,9 +228,7 @@ class RomanChord:
             RomanChord: The Roman chord with the modifier added.
         """
 
-        if new_modifier not in self._modifiers:
-            self._modifiers.append(new_modifier)
-        self._modifiers = [modifier for modifier in self._modifiers if new_modifier._compatible_with_mod(modifier)]
+        self._modifiers = self._modifiers.attach(new_modifier)
 
         return self
 
@@ -179,7 +243,8 @@ class RomanChord:
             RomanChord: The Roman chord with the modifier removed.
         """
 
-        self._modifiers.remove(modifier)
+        self._modifiers = self._modifiers.detach(modifier)
+
         return self
 
     def with_mod(self, new_modifier: Modifier) -> "RomanChord":
@@ -193,12 +258,7 @@ class RomanChord:
             RomanChord: A new Roman chord with the modifier added.
         """
         
-        new_chord = deepcopy(self)
-        if new_modifier not in new_chord._modifiers:
-            new_chord._modifiers.append(new_modifier)
-        new_chord._modifiers = sorted([modifier for modifier in new_chord._modifiers if new_modifier._compatible_with_mod(modifier)])
-
-        return new_chord            
+        return self._clone().attach(new_modifier)
 
     def without_mod(self, modifier: Modifier) -> "RomanChord":
         """
@@ -211,11 +271,19 @@ class RomanChord:
             RomanChord: The Roman chord with the modifier removed.
         """
 
-        new_chord = deepcopy(self)
-        new_chord._modifiers.remove(modifier)
-
-        return new_chord
+        return self._clone().detach(modifier)
     
+    @property
+    def mask(self) -> int:
+        """
+        Get the intervals of the chord above its root.
+
+        Returns:
+            int: 12-bit mask with bit n set if the chord has a tone n semitones above the root.
+        """
+
+        return self._shape() & 0xFFF
+
     @property
     def roman(self) -> Roman:
         """
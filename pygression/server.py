@@ -0,0 +1,328 @@
+# Asyncio HTTP server that renders progressions and chord symbols, batching concurrent requests
+import argparse
+import asyncio
+import json
+import multiprocessing
+import re
+import signal
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Tuple
+from .consts import Mode
+from .cache import SpellingCache
+from .parse import _NOTE, _note, parse_chord, parse_progression
+
+# Request paths and the kind of work they ask for
+_ROUTES = {"/render": "render", "/chord": "chord"}
+
+_REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed", 413: "Payload Too Large", 500: "Internal Server Error"}
+
+# Largest request body read
+_MAX_BODY = 1 << 16
+
+_KEY_PATTERN = re.compile(_NOTE)
+
+def _render(request: dict) -> dict:
+    match = _KEY_PATTERN.fullmatch(request.get("key", "C"))
+    if match is None:
+        raise ValueError(f"{request['key']!r} is not a key")
+
+    progression = parse_progression(request["progression"], mode=Mode[request.get("mode", "ION")], relative_to=Mode[request.get("relative_to", "ION")])
+    return {"chords": [str(chord) for chord in progression.chords_in(_note(*match.groups()))]}
+
+def _chord(request: dict) -> dict:
+    chord = parse_chord(request["symbol"])
+    return {"chord": str(chord), "notes": [str(note) for note in chord._notes]}
+
+_HANDLERS = {"render": _render, "chord": _chord}
+
+def process(requests: List[Tuple[str, bytes]]) -> List[Tuple[int, bytes]]:
+    """
+    Handle a batch of requests. Runs in the server's process for small batches and in a worker process for large ones;
+    either way, every request of the batch shares that process's spelling and parse caches.
+
+    Args:
+        requests (List[Tuple[str, bytes]]): Kind ("render" or "chord") and JSON body of each request.
+
+    Returns:
+        List[Tuple[int, bytes]]: HTTP status and JSON body of each response, in order.
+    """
+
+    responses = []
+    for kind, body in requests:
+        try:
+            request = json.loads(body)
+        except (ValueError, RecursionError):
+            responses.append((400, b'{"error": "body is not valid JSON"}'))
+            continue
+
+        try:
+            result = _HANDLERS[kind](request)
+        except KeyError as e:
+            responses.append((400, json.dumps({"error": f"missing or unknown value {e}"}).encode()))
+            continue
+        except (ValueError, TypeError, AttributeError) as e:
+            responses.append((400, json.dumps({"error": str(e) or type(e).__name__}).encode()))
+            continue
+        except Exception as e:
+            # One bad request mustn't take the rest of its batch down with it
+            responses.append((500, json.dumps({"error": f"failed: {e!r}"}).encode()))
+            continue
+
+        responses.append((200, json.dumps(result).encode()))
+
+    return responses
+
+class RenderServer:
+    """
+    Class that represents an HTTP server that renders progressions (POST /render with {"progression", "key", "mode", "relative_to"})
+    and chord symbols (POST /chord with {"symbol"}). Requests that arrive together are coalesced into micro-batches:
+    a batch is handled once it holds "max_batch" requests or "max_delay" seconds after its first one, repeated requests
+    are handled once, and successful responses are kept in a cache shared by every connection. Batches of at least
+    "offload" distinct requests go to a process pool, so a burst doesn't stall the event loop.
+
+    Args:
+        host (str): Address to listen on.
+        port (int): Port to listen on; 0 picks a free one.
+        max_batch (int): Most requests in a batch. 1 handles every request on its own.
+        max_delay (float): Longest a request waits for its batch to fill, in seconds.
+        workers (int): Worker processes for large batches. 0 handles every batch in the server's process.
+        offload (int): Fewest distinct requests in a batch sent to the workers. No larger than "max_batch", since batches never hold more.
+        cache_size (int): Most responses cached.
+
+    Raises:
+        ValueError: If "offload" is larger than "max_batch" while there are workers.
+    """
+
+    def __init__(self, host: str="127.0.0.1", port: int=8000, max_batch: int=64, max_delay: float=0.002, workers: int=0, offload: int=32, cache_size: int=65536):
+        if workers and offload > max_batch:
+            raise ValueError(f"offload ({offload}) can't be larger than max_batch ({max_batch}), or no batch would reach the workers")
+
+        self.host = host
+        self.port = port
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self.workers = workers
+        self.offload = offload
+
+        self.responses = SpellingCache(maxsize=cache_size)
+
+        self._pending = []
+        self._timer = None
+        self._server = None
+        self._executor = None
+
+    async def start(self):
+        """
+        Start listening. "port" is updated with the bound port.
+        """
+
+        # Workers are started from a fork server rather than forked from this process, so they don't inherit client
+        # sockets (a worker holding a copy would keep a closed connection from ever reaching EOF at the client)
+        if self.workers:
+            methods = multiprocessing.get_all_start_methods()
+            context = multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+            self._executor = ProcessPoolExecutor(max_workers=self.workers, mp_context=context)
+
+            # Start every worker now, so a worker that can't start fails here rather than in the middle of a batch
+            loop = asyncio.get_running_loop()
+            await asyncio.gather(*(loop.run_in_executor(self._executor, int) for _ in range(self.workers)))
+
+        self._server = await asyncio.start_server(self._connection, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def serve_forever(self):
+        """
+        Start listening if needed, then handle connections until cancelled.
+        """
+
+        if self._server is None:
+            await self.start()
+
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def close(self):
+        """
+        Stop listening and shut the worker processes down.
+        """
+
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    # Queue a request for the next batch, answering from the cache when possible
+    def _submit(self, kind: str, body: bytes) -> asyncio.Future:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+
+        cached = self.responses.get((kind, body))
+        if cached is not None:
+            future.set_result((200, cached))
+            return future
+
+        self._pending.append(((kind, body), future))
+
+        if len(self._pending) >= self.max_batch:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_delay, self._flush)
+
+        return future
+
+    def _flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        batch = self._pending
+        self._pending = []
+        if not batch:
+            return
+
+        requests = list(dict.fromkeys(request for request, _ in batch))
+
+        if self._executor is not None and len(requests) >= self.offload:
+            try:
+                task = asyncio.get_running_loop().run_in_executor(self._executor, process, requests)
+            except RuntimeError:
+                # The pool is broken or shut down; the batch is handled here instead
+                pass
+            else:
+                task.add_done_callback(lambda done: self._answer_offloaded(batch, requests, done))
+                return
+
+        try:
+            responses = process(requests)
+        except Exception as e:
+            responses = [(500, json.dumps({"error": f"failed: {e!r}"}).encode())] * len(requests)
+
+        self._answer(batch, requests, responses)
+
+    def _answer(self, batch: list, requests: list, responses: list):
+        found = dict(zip(requests, responses))
+
+        for request, (status, body) in found.items():
+            if status == 200:
+                self.responses.put(request, body)
+
+        for request, future in batch:
+            if not future.done():
+                future.set_result(found[request])
+
+    def _answer_offloaded(self, batch: list, requests: list, done: asyncio.Future):
+        if done.cancelled() or done.exception() is not None:
+            error = json.dumps({"error": "worker cancelled" if done.cancelled() else f"worker failed: {done.exception()!r}"}).encode()
+            self._answer(batch, requests, [(500, error)] * len(requests))
+        else:
+            self._answer(batch, requests, done.result())
+
+    async def _connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b"\r\n\r\n")
+                except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+                    break
+
+                lines = head.decode("latin-1").split("\r\n")
+                method, path, version = (lines[0].split(" ") + ["", "", ""])[:3]
+                headers = {}
+                for line in lines[1:]:
+                    name, _, value = line.partition(":")
+                    headers[name.strip().lower()] = value.strip()
+
+                try:
+                    length = int(headers.get("content-length", 0) or 0)
+                except ValueError:
+                    length = -1
+
+                # The body can't be found or skipped without a valid length, so the connection is closed after these
+                if length < 0:
+                    status, body = 400, b'{"error": "invalid Content-Length"}'
+                    keep_alive = False
+                elif length > _MAX_BODY:
+                    status, body = 413, b'{"error": "request body too large"}'
+                    keep_alive = False
+                else:
+                    body = await reader.readexactly(length) if length else b""
+                    keep_alive = headers.get("connection", "").lower() != "close" and version == "HTTP/1.1"
+
+                    if path == "/health":
+                        status, body = 200, b'{"status": "ok"}'
+                    elif path not in _ROUTES:
+                        status, body = 404, b'{"error": "not found"}'
+                    elif method != "POST":
+                        status, body = 405, b'{"error": "use POST"}'
+                    else:
+                        status, body = await self._submit(_ROUTES[path], body)
+
+                writer.write(
+                    f"HTTP/1.1 {status} {_REASONS[status]}\r\nContent-Type: application/json\r\nContent-Length: {len(body)}\r\n"
+                    f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode() + body
+                )
+                await writer.drain()
+
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+def main(argv=None):
+    """
+    Run the server from the command line (python -m pygression.server). The bound address is printed once it's listening.
+    SIGINT and SIGTERM stop it cleanly, shutting the worker processes down.
+
+    Args:
+        argv (List[str]): Command-line arguments. Defaults to sys.argv.
+    """
+
+    parser = argparse.ArgumentParser(description="Render progressions and chord symbols over HTTP.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--max-batch", type=int, default=64)
+    parser.add_argument("--max-delay", type=float, default=0.002)
+    parser.add_argument("--workers", type=int, default=0)
+    parser.add_argument("--offload", type=int, default=32)
+    args = parser.parse_args(argv)
+
+    try:
+        server = RenderServer(args.host, args.port, max_batch=args.max_batch, max_delay=args.max_delay, workers=args.workers, offload=args.offload)
+    except ValueError as e:
+        parser.error(str(e))
+
+    async def run():
+        await server.start()
+
+        # Cancelling serve_forever runs the cleanup below; a signal that kills the process outright would orphan the workers
+        loop = asyncio.get_running_loop()
+        serving = asyncio.ensure_future(server.serve_forever())
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            try:
+                loop.add_signal_handler(signum, serving.cancel)
+            except (NotImplementedError, RuntimeError):
+                # No signal handlers on this platform's event loop; Ctrl-C still raises KeyboardInterrupt
+                pass
+
+        print(f"listening on {server.host}:{server.port}", flush=True)
+
+        try:
+            await serving
+        except asyncio.CancelledError:
+            pass
+        finally:
+            await server.close()
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
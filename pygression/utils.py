@@ -1,5 +1,13 @@
 from .consts import Letter, Accidental
 
+LETTERS = tuple(Letter)
+
+# Position of each letter in LETTERS, indexed by the letter's value
+LETTER_INDEX = tuple(LETTERS.index(Letter(value)) if value in Letter._value2member_map_ else None for value in range(12))
+
+# Rotate a 12-bit pitch-class mask up by some semitones
+def rotate_mask(mask: int, semitones: int) -> int:
+    return (mask << semitones | mask >> (12 - semitones)) & 0xFFF
+
 def nth_letter_from(letter: Letter, nth: int) -> Letter:
-    letters = list(Letter)
-    return letters[(letters.index(letter) + nth) % 7]
+    return LETTERS[(LETTER_INDEX[letter._value_] + nth) % 7]
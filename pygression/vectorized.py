@@ -0,0 +1,259 @@
+# NumPy kernels for realizing Roman chords in many keys at once. Requires numpy.
+from typing import List
+import numpy as np
+from .note import Note
+from .chord import Chord
+from .romanchord import RomanChord
+from .consts import Letter, Accidental, Mode
+from .utils import LETTERS, LETTER_INDEX
+
+# Keys with at most seven sharps or flats
+PRACTICAL_KEYS = tuple(Note(letter, accidental) for letter, accidental in (
+    (Letter.C, Accidental.NATURAL), (Letter.G, Accidental.NATURAL), (Letter.D, Accidental.NATURAL),
+    (Letter.A, Accidental.NATURAL), (Letter.E, Accidental.NATURAL), (Letter.B, Accidental.NATURAL),
+    (Letter.F, Accidental.SHARP), (Letter.C, Accidental.SHARP), (Letter.F, Accidental.NATURAL),
+    (Letter.B, Accidental.FLAT), (Letter.E, Accidental.FLAT), (Letter.A, Accidental.FLAT),
+    (Letter.D, Accidental.FLAT), (Letter.G, Accidental.FLAT), (Letter.C, Accidental.FLAT),
+))
+
+# Pitch class of each natural letter, indexed by letter position
+LETTER_PITCHES = np.array([letter.value for letter in LETTERS], dtype=np.int16)
+
+_C = Note(Letter.C)
+
+class KeyedChords:
+    """
+    Class that represents the chords of a progression realized in several keys, stored as integer arrays.
+    Letters are positions in Letter (C = 0 ... B = 6) and accidentals are Accidental values.
+    Chord objects are only built when asked for.
+
+    Attributes:
+        keys (Tuple[Note]): Keys the progression is realized in.
+        root_letters (numpy.ndarray): Root letters, shaped (keys, chords).
+        root_accidentals (numpy.ndarray): Root accidentals, shaped (keys, chords).
+        tone_letters (numpy.ndarray): Letters of the chord tones from the bass up, shaped (keys, chords, tones) and padded with -1. None if tones weren't spelled.
+        tone_accidentals (numpy.ndarray): Accidentals of the chord tones, shaped like "tone_letters" and padded with 0.
+        sizes (numpy.ndarray): Number of tones in each chord, shaped (chords,).
+    """
+
+    def __init__(self, keys, parts, root_letters, root_accidentals, tone_letters, tone_accidentals, sizes):
+        self.keys = tuple(keys)
+        self.root_letters = root_letters
+        self.root_accidentals = root_accidentals
+        self.tone_letters = tone_letters
+        self.tone_accidentals = tone_accidentals
+        self.sizes = sizes
+
+        # (quality, modifiers, inversion) of each chord, needed to build Chord objects
+        self._parts = parts
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    @property
+    def root_pitches(self) -> np.ndarray:
+        """
+        Get the pitch classes of the roots.
+
+        Returns:
+            numpy.ndarray: Root pitch classes, shaped (keys, chords).
+        """
+
+        return (LETTER_PITCHES[self.root_letters] + self.root_accidentals) % 12
+
+    @property
+    def tone_pitches(self) -> np.ndarray:
+        """
+        Get the pitch classes of the chord tones.
+
+        Returns:
+            numpy.ndarray: Tone pitch classes, shaped (keys, chords, tones) and padded with -1.
+        """
+
+        return np.where(self.tone_letters >= 0, (LETTER_PITCHES[self.tone_letters] + self.tone_accidentals) % 12, -1)
+
+    def chord(self, key: int, index: int) -> Chord:
+        """
+        Build one chord.
+
+        Args:
+            key (int): Position of the key in "keys".
+            index (int): Position of the chord in the progression.
+
+        Returns:
+            Chord: The chord in that key.
+        """
+
+        quality, modifiers, inversion = self._parts[index]
+        root = Note(LETTERS[self.root_letters[key, index]], Accidental(int(self.root_accidentals[key, index])))
+
+        return Chord._realize(root, quality, modifiers, inversion)
+
+    def chords(self, key: int) -> List[Chord]:
+        """
+        Build every chord of the progression in one key.
+
+        Args:
+            key (int): Position of the key in "keys".
+
+        Returns:
+            List[Chord]: The chords in that key, like Progression.chords_in.
+        """
+
+        return [self.chord(key, index) for index in range(len(self._parts))]
+
+# Root position in the scale and accidental offset of each chord, which don't depend on the key
+def _roots(chords: List[RomanChord], relative_to: Mode):
+    degrees = np.empty(len(chords), dtype=np.int16)
+    offsets = np.empty(len(chords), dtype=np.int16)
+
+    for i, chord in enumerate(chords):
+        target = chord._target
+        degree = (chord._roman._degree + (0 if target is None else target._roman._degree - 1) - 1) % 7
+
+        degrees[i] = degree
+        offsets[i] = relative_to.value[degree] + chord._roman._accidental.value + (0 if target is None else target._roman._accidental.value)
+
+    return degrees, offsets
+
+def intervals(parts):
+    """
+    Get the letter and semitone offsets of chord tones above the root, from the bass up, by spelling each chord on C.
+
+    Args:
+        parts (Iterable[Tuple[Quality, ModifierSet, int]]): Quality, modifiers and inversion of each chord.
+
+    Returns:
+        Tuple[numpy.ndarray, numpy.ndarray, numpy.ndarray]: Letter offsets (padded with -1) and semitone offsets, shaped (chords, tones), and the number of tones in each chord.
+    """
+
+    shapes = [Chord._realize(_C, quality, modifiers, inversion)._notes for quality, modifiers, inversion in parts]
+    width = max((len(notes) for notes in shapes), default=0)
+
+    letters = np.full((len(shapes), width), -1, dtype=np.int16)
+    semitones = np.zeros((len(shapes), width), dtype=np.int16)
+    sizes = np.empty(len(shapes), dtype=np.int16)
+
+    for i, notes in enumerate(shapes):
+        sizes[i] = len(notes)
+        letters[i, :len(notes)] = [LETTER_INDEX[note._letter._value_] for note in notes]
+        semitones[i, :len(notes)] = [note._int for note in notes]
+
+    return letters, semitones, sizes
+
+def core_intervals(qualities):
+    """
+    Get the letter and semitone offsets of the core tones of qualities above the root. Chords spell every
+    core tone before modifiers change them (a no3 chord still spells its third), so chords are only spellable in keys where
+    their cores are too.
+
+    Args:
+        qualities (Iterable[Quality]): Quality of each chord.
+
+    Returns:
+        Tuple[numpy.ndarray, numpy.ndarray]: Letter offsets (padded with -1) and semitone offsets, shaped (chords, tones).
+    """
+
+    cores = [quality._get_integers() for quality in qualities]
+    width = max((len(integers) for integers in cores), default=0)
+
+    letters = np.full((len(cores), width), -1, dtype=np.int16)
+    semitones = np.zeros((len(cores), width), dtype=np.int16)
+
+    for i, integers in enumerate(cores):
+        letters[i, :len(integers)] = [2 * j % 7 for j in range(len(integers))]
+        semitones[i, :len(integers)] = [value % 12 for value in integers]
+
+    return letters, semitones
+
+def spell_roots(keys, degrees: np.ndarray, offsets: np.ndarray):
+    """
+    Spell chord roots in several keys, the same way as Progression.chords_in.
+
+    Args:
+        keys (Iterable[Note]): Keys to spell the roots in.
+        degrees (numpy.ndarray): Scale position of each root (0-6), after applying targets.
+        offsets (numpy.ndarray): Semitones of each root above the tonic, from the scale and the accidentals.
+
+    Returns:
+        Tuple[numpy.ndarray, numpy.ndarray]: Root letters and accidentals, shaped (keys, chords).
+
+    Raises:
+        ValueError: If a key has double accidentals, or a root can't be spelled in a key.
+    """
+
+    keys = tuple(keys)
+    if any(key._accidental.value < -1 or key._accidental.value > 1 for key in keys):
+        raise ValueError("cannot have double accidentals as key")
+
+    key_letters = np.array([LETTER_INDEX[key._letter._value_] for key in keys], dtype=np.int16)[:, None]
+    key_pitches = np.array([key._int for key in keys], dtype=np.int16)[:, None]
+
+    # Shift the key's letter by the degree, then make up the difference with an accidental
+    root_letters = (key_letters + degrees) % 7
+    root_accidentals = offsets - (LETTER_PITCHES[root_letters] - key_pitches)
+    root_accidentals = np.where(root_accidentals > 2, root_accidentals - 12, root_accidentals)
+
+    if np.any(np.abs(root_accidentals) > 2):
+        raise ValueError("chord roots need more than double accidentals in some keys")
+
+    return root_letters.astype(np.int8), root_accidentals.astype(np.int8)
+
+def spell_tones(root_letters: np.ndarray, root_accidentals: np.ndarray, letters: np.ndarray, semitones: np.ndarray):
+    """
+    Spell chord tones above roots.
+
+    Args:
+        root_letters (numpy.ndarray): Root letters, shaped (keys, chords).
+        root_accidentals (numpy.ndarray): Root accidentals, shaped (keys, chords).
+        letters (numpy.ndarray): Letter offset of each tone above its root, shaped (chords, tones) and padded with -1.
+        semitones (numpy.ndarray): Semitone offset of each tone above its root, shaped like "letters".
+
+    Returns:
+        Tuple[numpy.ndarray, numpy.ndarray]: Tone letters (padded with -1) and accidentals (padded with 0), shaped (keys, chords, tones).
+
+    Raises:
+        ValueError: If a tone can't be spelled.
+    """
+
+    root_letters = root_letters.astype(np.int16)
+    padding = letters < 0
+
+    tone_letters = (root_letters[:, :, None] + letters) % 7
+    root_pitches = (LETTER_PITCHES[root_letters] + root_accidentals) % 12
+    tone_accidentals = (root_pitches[:, :, None] + semitones - LETTER_PITCHES[tone_letters] + 6) % 12 - 6
+
+    tone_letters[:, padding] = -1
+    tone_accidentals[:, padding] = 0
+
+    if np.any(np.abs(tone_accidentals) > 2):
+        raise ValueError("chord tones need more than double accidentals in some keys")
+
+    return tone_letters.astype(np.int8), tone_accidentals.astype(np.int8)
+
+def realize_keys(chords: List[RomanChord], relative_to: Mode, keys) -> KeyedChords:
+    """
+    Realize Roman chords in several keys with one vectorized pass.
+
+    Args:
+        chords (List[RomanChord]): Roman chords to realize.
+        relative_to (Mode): Mode that the chords are read with respect to.
+        keys (Iterable[Note]): Keys to realize the chords in.
+
+    Returns:
+        KeyedChords: Roots and chord tones of every chord in every key.
+
+    Raises:
+        ValueError: If a key has double accidentals, or a chord can't be spelled in a key.
+    """
+
+    keys = tuple(keys)
+    degrees, offsets = _roots(chords, relative_to)
+    parts = [(chord._quality, chord._modifiers, chord._inversion) for chord in chords]
+    letters, semitones, sizes = intervals(parts)
+
+    root_letters, root_accidentals = spell_roots(keys, degrees, offsets)
+    spell_tones(root_letters, root_accidentals, *core_intervals(quality for quality, _, _ in parts))
+    tone_letters, tone_accidentals = spell_tones(root_letters, root_accidentals, letters, semitones)
+
+    return KeyedChords(keys, parts, root_letters, root_accidentals, tone_letters, tone_accidentals, sizes)
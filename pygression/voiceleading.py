@@ -0,0 +1,266 @@
+# Voice-leading distances between chords, and the inversions that move the voices least through a progression. Requires numpy.
+from collections import namedtuple
+from typing import List, Optional, Tuple
+import numpy as np
+from .chord import Chord
+
+VoiceLeading = namedtuple("VoiceLeading", ["chords", "voicings", "motion"])
+
+# Most elements of the (pairs, assignments, voices) array gathered at once
+_CHUNK = 1 << 22
+
+# Assignment tables keyed on (voices, tones), built the first time a size is needed
+_ASSIGNMENTS = {}
+
+# Every way of giving each voice one tone so that every tone has at least one voice, shaped (assignments, voices).
+# With as many voices as tones, these are the permutations.
+def _assignments(voices: int, tones: int) -> np.ndarray:
+    table = _ASSIGNMENTS.get((voices, tones))
+    if table is not None:
+        return table
+
+    rows = []
+    row = [0] * voices
+    counts = [0] * tones
+
+    def fill(voice: int, uncovered: int):
+        # Not enough voices left for the tones without one
+        if voices - voice < uncovered:
+            return
+
+        if voice == voices:
+            rows.append(tuple(row))
+            return
+
+        for tone in range(tones):
+            row[voice] = tone
+            counts[tone] += 1
+            fill(voice + 1, uncovered - (counts[tone] == 1))
+            counts[tone] -= 1
+
+    fill(0, tones)
+
+    table = _ASSIGNMENTS[(voices, tones)] = np.array(rows, dtype=np.intp).reshape(-1, voices)
+    return table
+
+def voicing(chord: Chord, octave: int=4) -> Tuple[int]:
+    """
+    Voice a chord in close position: the bass in an octave, then every other tone in order, each the nearest one above the last.
+
+    Args:
+        chord (Chord): Chord to voice.
+        octave (int): Octave of the bass, where middle C (60) starts octave 4.
+
+    Returns:
+        Tuple[int]: Pitches from the bass up, as MIDI note numbers.
+    """
+
+    pitch = 12 * (octave + 1) + chord._notes[0]._int
+    pitches = [pitch]
+
+    for note in chord._notes[1:]:
+        pitch += (note._int - pitch) % 12 or 12
+        pitches.append(pitch)
+
+    return tuple(pitches)
+
+def _pitches(item, octave: int) -> Tuple[int]:
+    return voicing(item, octave) if isinstance(item, Chord) else tuple(item)
+
+# Cheapest assignment of every pair of voicings of the same sizes, as the motion (inf if none is within "max_motion"),
+# the row of the assignment table, the table, and whether the target gives the voices
+def _best(sources: np.ndarray, targets: np.ndarray, max_motion: Optional[int], octaves: bool) -> tuple:
+    costs = np.abs(sources[:, :, None] - targets[:, None, :])
+    if octaves:
+        costs %= 12
+        np.minimum(costs, 12 - costs, out=costs)
+
+    # The chord with more tones gives the voices, and the tones of the other one are shared between them
+    flipped = sources.shape[1] < targets.shape[1]
+    if flipped:
+        costs = costs.transpose(0, 2, 1)
+
+    voices, tones = costs.shape[1:]
+    table = _assignments(voices, tones)
+    columns = np.arange(voices)
+
+    motion = np.empty(len(costs))
+    rows = np.empty(len(costs), dtype=np.intp)
+    step = max(1, _CHUNK // (len(table) * voices))
+
+    for start in range(0, len(costs), step):
+        chosen = costs[start:start + step][:, columns, table]
+        totals = chosen.sum(axis=2, dtype=np.float64)
+        if max_motion is not None:
+            totals[(chosen > max_motion).any(axis=2)] = np.inf
+
+        best = totals.argmin(axis=1)
+        rows[start:start + step] = best
+        motion[start:start + step] = totals[np.arange(len(totals)), best]
+
+    return motion, rows, table, flipped
+
+def distances(sources, targets, max_motion: int=None, octaves: bool=False, octave: int=4) -> np.ndarray:
+    """
+    Get the smallest voice-leading distance of many pairs of chords at once. The distance is the total number of
+    semitones the voices move, over every assignment of voices where each tone of both chords has at least one voice.
+    Pairs are grouped by size and every assignment of a group is scored in one vectorized pass.
+
+    Args:
+        sources (Iterable, numpy.ndarray): Chords, or voicings as MIDI note numbers, to move from. A 2D array holds voicings of one size.
+        targets (Iterable, numpy.ndarray): Chords or voicings to move to, one per source.
+        max_motion (int): Most semitones any one voice may move.
+        octaves (bool): Whether voices may move to any octave of their tone, so only pitch classes count.
+        octave (int): Octave of the bass of chords, which are voiced in close position.
+
+    Returns:
+        numpy.ndarray: Distance of each pair, shaped (pairs,); inf where no assignment keeps every voice within "max_motion".
+
+    Raises:
+        ValueError: If there aren't as many targets as sources.
+    """
+
+    if isinstance(sources, np.ndarray) and isinstance(targets, np.ndarray):
+        if len(sources) != len(targets):
+            raise ValueError("sources and targets must have the same length")
+
+        return _best(sources.astype(np.int64), targets.astype(np.int64), max_motion, octaves)[0]
+
+    sources = [_pitches(source, octave) for source in sources]
+    targets = [_pitches(target, octave) for target in targets]
+    if len(sources) != len(targets):
+        raise ValueError("sources and targets must have the same length")
+
+    groups = {}
+    for i, (source, target) in enumerate(zip(sources, targets)):
+        groups.setdefault((len(source), len(target)), []).append(i)
+
+    motion = np.empty(len(sources))
+    for pairs in groups.values():
+        found = _best(
+            np.array([sources[i] for i in pairs], dtype=np.int64),
+            np.array([targets[i] for i in pairs], dtype=np.int64),
+            max_motion, octaves,
+        )
+        motion[pairs] = found[0]
+
+    return motion
+
+def distance(source, target, max_motion: int=None, octaves: bool=False, octave: int=4) -> Optional[int]:
+    """
+    Get the smallest voice-leading distance between two chords.
+
+    Args:
+        source (Chord, Iterable[int]): Chord, or voicing as MIDI note numbers, to move from.
+        target (Chord, Iterable[int]): Chord or voicing to move to.
+        max_motion (int): Most semitones any one voice may move.
+        octaves (bool): Whether voices may move to any octave of their tone, so only pitch classes count.
+        octave (int): Octave of the bass of chords, which are voiced in close position.
+
+    Returns:
+        int: Total semitones the voices move, or None if no assignment keeps every voice within "max_motion".
+    """
+
+    motion = distances([source], [target], max_motion=max_motion, octaves=octaves, octave=octave)[0]
+    return None if motion == np.inf else int(motion)
+
+def assignment(source, target, max_motion: int=None, octaves: bool=False, octave: int=4) -> List[Tuple[int, int]]:
+    """
+    Get the voices of the smallest voice leading between two chords.
+
+    Args:
+        source (Chord, Iterable[int]): Chord, or voicing as MIDI note numbers, to move from.
+        target (Chord, Iterable[int]): Chord or voicing to move to.
+        max_motion (int): Most semitones any one voice may move.
+        octaves (bool): Whether voices may move to any octave of their tone; each voice then moves to the nearest one.
+        octave (int): Octave of the bass of chords, which are voiced in close position.
+
+    Returns:
+        List[Tuple[int, int]]: Pitch each voice moves from and to, ordered by the pitch it moves from.
+
+    Raises:
+        ValueError: If no assignment keeps every voice within "max_motion".
+    """
+
+    source = _pitches(source, octave)
+    target = _pitches(target, octave)
+
+    motion, rows, table, flipped = _best(np.array([source], dtype=np.int64), np.array([target], dtype=np.int64), max_motion, octaves)
+    if motion[0] == np.inf:
+        raise ValueError("no voice leading keeps every voice within max_motion")
+
+    row = table[rows[0]].tolist()
+    voices = [(source[tone], target[voice]) for voice, tone in enumerate(row)] if flipped else [(source[voice], target[tone]) for voice, tone in enumerate(row)]
+
+    if octaves:
+        voices = [(start, start + ((end - start + 5) % 12) - 5) for start, end in voices]
+
+    return sorted(voices)
+
+# Every inversion of a chord. A bass that isn't a chord tone stays where it is.
+def _inversions(chord: Chord) -> List[Chord]:
+    if chord._bass is not None:
+        return [chord._clone()]
+
+    return [Chord._realize(chord._root, chord._quality, chord._modifiers, inversion) for inversion in range(len(chord._notes))]
+
+def best_inversions(chords: List[Chord], octave: int=4, max_motion: int=None) -> VoiceLeading:
+    """
+    Pick the inversion of every chord, e.g. of a Progression.chords_in result, that moves the voices the least in total.
+    Chords are voiced in close position with the bass in the same octave, and the inversions are chosen by dynamic
+    programming over the distances of every pair of consecutive inversions, which are computed in one batch.
+
+    Args:
+        chords (List[Chord]): Chords to voice.
+        octave (int): Octave of the bass.
+        max_motion (int): Most semitones any one voice may move between consecutive chords.
+
+    Returns:
+        VoiceLeading: New chords in the chosen inversions, their voicings as MIDI note numbers, and the total motion.
+
+    Raises:
+        ValueError: If no choice of inversions keeps every voice within "max_motion".
+    """
+
+    candidates = [_inversions(chord) for chord in chords]
+    if not candidates:
+        return VoiceLeading([], [], 0)
+
+    voicings = [[voicing(chord, octave) for chord in options] for options in candidates]
+
+    sources = []
+    targets = []
+    for before, after in zip(voicings, voicings[1:]):
+        for source in before:
+            for target in after:
+                sources.append(source)
+                targets.append(target)
+
+    costs = distances(sources, targets, max_motion=max_motion)
+
+    # Least motion to reach each inversion of the current chord, and the inversion of the previous chord it came from
+    totals = np.zeros(len(voicings[0]))
+    pointers = []
+    position = 0
+
+    for before, after in zip(voicings, voicings[1:]):
+        step = totals[:, None] + costs[position:position + len(before) * len(after)].reshape(len(before), len(after))
+        position += len(before) * len(after)
+
+        pointers.append(step.argmin(axis=0))
+        totals = step.min(axis=0)
+
+    best = int(totals.argmin())
+    if totals[best] == np.inf:
+        raise ValueError("no inversions keep every voice within max_motion")
+
+    path = [best]
+    for previous in reversed(pointers):
+        path.append(int(previous[path[-1]]))
+    path.reverse()
+
+    return VoiceLeading(
+        [options[i] for options, i in zip(candidates, path)],
+        [options[i] for options, i in zip(voicings, path)],
+        int(totals[best]),
+    )